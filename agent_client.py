@@ -3,26 +3,132 @@
 from __future__ import annotations
 
 import json
+import time
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
 from urllib.parse import urljoin
 
+import deadline
+import ratelimit
 import requests
+import tracing
+from endpoints import EndpointPool, parse_urls
+
+
+CHUNK = 1 << 16
+
+
+def iter_json(payload: Any) -> Iterator[str]:
+    """Encode ``payload`` as JSON piece by piece.
+
+    Long strings (transcripts) are escaped in slices, so the full encoded
+    document never has to exist in memory at once.
+    """
+    if isinstance(payload, dict):
+        yield "{"
+        for i, (key, value) in enumerate(payload.items()):
+            yield (", " if i else "") + json.dumps(str(key)) + ": "
+            yield from iter_json(value)
+        yield "}"
+    elif isinstance(payload, str) and len(payload) > CHUNK:
+        yield '"'
+        for start in range(0, len(payload), CHUNK):
+            yield json.dumps(payload[start:start + CHUNK])[1:-1]
+        yield '"'
+    else:
+        yield json.dumps(payload)
+
+
+def gzip_stream(pieces: Iterable[str]) -> Iterator[bytes]:
+    """Gzip-compress text pieces into a stream of byte chunks."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for piece in pieces:
+        out = compressor.compress(piece.encode())
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _approx_size(payload: Any) -> int:
+    if isinstance(payload, str):
+        return len(payload)
+    if isinstance(payload, dict):
+        return sum(_approx_size(v) for v in payload.values())
+    if isinstance(payload, (list, tuple)):
+        return sum(_approx_size(v) for v in payload)
+    return 8
 
 
 class BaseAgentClient:
-    """Simple HTTP client with basic GET/POST helpers."""
-
-    def __init__(self, base_url: str, timeout: int = 5) -> None:
-        self.base_url = base_url.rstrip("/")
+    """Simple HTTP client with basic GET/POST helpers.
+
+    ``session`` may be any object exposing ``get``/``post`` like
+    ``requests.Session``; long-lived processes pass one to reuse connections.
+
+    ``base_url`` may also be a list (or comma-separated string) of replica
+    URLs or an :class:`~endpoints.EndpointPool`; each request then goes to
+    the replica chosen by the pool's ``balance`` policy.
+
+    With ``compress_threshold`` set, POST bodies of roughly that many bytes
+    or more are sent as a streamed, chunked ``Content-Encoding: gzip`` body
+    and gzip responses are requested.
+
+    Inside a :mod:`deadline` scope each request may use the whole remaining
+    budget as its timeout, capped by ``max_timeout`` when set; ``timeout``
+    only applies to calls made without a deadline.
+    """
+
+    def __init__(
+        self,
+        base_url: str | Sequence[str] | EndpointPool,
+        timeout: float = 5,
+        session=None,
+        compress_threshold: int | None = None,
+        balance: str = "least_outstanding",
+        max_timeout: float | None = None,
+    ) -> None:
+        if not isinstance(base_url, EndpointPool):
+            urls = parse_urls(base_url)
+            base_url = EndpointPool(urls, balance) if len(urls) > 1 else urls[0]
+        self.pool = base_url if isinstance(base_url, EndpointPool) else None
+        self.base_url = self.pool.endpoints[0].url if self.pool else base_url.rstrip("/")
         self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.session = session
+        self.compress_threshold = compress_threshold
 
     # --------------------------------------------------------------
     def _request(self, method: str, path: str, **kwargs) -> requests.Response:
-        url = urljoin(self.base_url + "/", path.lstrip("/"))
-        kwargs.setdefault("timeout", self.timeout)
+        kwargs["timeout"] = deadline.timeout(self.timeout, kwargs.get("timeout", self.max_timeout))
+        parent = tracing.traceparent()
+        if parent:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "traceparent": parent}
+        if self.pool is None:
+            return self._send(self.base_url, method, path, **kwargs)
+        endpoint = self.pool.acquire()
+        start = time.monotonic()
+        ok = False
+        try:
+            resp = self._send(endpoint.url, method, path, **kwargs)
+            ok = True
+            return resp
+        except Exception as e:
+            # client errors (4xx) say nothing about the replica's health
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            ok = status is not None and status < 500
+            raise
+        finally:
+            self.pool.release(endpoint, time.monotonic() - start, ok)
+
+    def _send(self, base_url: str, method: str, path: str, **kwargs) -> requests.Response:
+        url = urljoin(base_url + "/", path.lstrip("/"))
+        ratelimit.acquire(url)
+        http = self.session or requests
         if method == "GET":
-            resp = requests.get(url, **kwargs)
+            resp = http.get(url, **kwargs)
         elif method == "POST":
-            resp = requests.post(url, **kwargs)
+            resp = http.post(url, **kwargs)
         else:
             raise ValueError(f"Unsupported method: {method}")
         resp.raise_for_status()
@@ -34,6 +140,15 @@ class BaseAgentClient:
 
     # --------------------------------------------------------------
     def post(self, path: str, json_data: dict | None = None, **kwargs) -> str:
+        threshold = self.compress_threshold
+        if threshold is not None and json_data is not None and _approx_size(json_data) >= threshold:
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+                "Accept-Encoding": "gzip",
+            }
+            return self._request("POST", path, data=gzip_stream(iter_json(json_data)), **kwargs).text
         return self._request("POST", path, json=json_data, **kwargs).text
 
 
@@ -55,8 +170,16 @@ class IngestAgentClient(BaseAgentClient):
 class StrategyAgentClient(BaseAgentClient):
     """Client for the strategy agent."""
 
-    def analyze(self, text: str) -> str:
-        return self.post("/analyze", {"text": text})
+    def analyze(self, text: str, goal: str | None = None) -> str:
+        payload = {"text": text}
+        if goal is not None:
+            payload["goal"] = goal
+        return self.post("/analyze", payload)
+
+    def analyze_goals(self, text: str, goals: Sequence[str]) -> dict[str, str]:
+        """Analyze ``text`` against every goal in one request."""
+        resp = self.post("/analyze_batch", {"text": text, "goals": list(goals)})
+        return json.loads(resp)["results"]
 
     def score(self, text: str) -> int:
         resp = self.post("/score", {"text": text})
@@ -0,0 +1,177 @@
+"""Local disk cache for episode audio with background prefetching."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+from rss_parser import canonical_url
+
+CHUNK = 1 << 16
+# A download that has not written for this long was interrupted.
+STALE_PART = 600.0
+
+
+def http_fetch(url: str, dest: BinaryIO) -> None:
+    """Stream ``url`` into ``dest`` in fixed-size chunks."""
+    with urllib.request.urlopen(url, timeout=60) as resp:
+        shutil.copyfileobj(resp, dest, CHUNK)
+
+
+class AudioCache:
+    """Byte-budgeted LRU cache of downloaded audio files.
+
+    Files are named after a hash of the canonical URL, so tracking query
+    strings share one entry.  Downloads go to a temporary file and are
+    renamed into place, so a crash never leaves a truncated cache entry;
+    temporary files left by interrupted downloads are swept on startup.
+    Pinned entries (prefetched but not yet consumed) are never evicted.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = 2 << 30,
+        fetch: Callable[[str, BinaryIO], None] = http_fetch,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.fetch_fn = fetch
+        self._lock = threading.Lock()
+        self._pins: dict[Path, int] = {}
+        self._inflight: dict[Path, threading.Event] = {}
+        self._sweep_parts()
+        self._entries: OrderedDict[Path, int] = OrderedDict(
+            (p, p.stat().st_size)
+            for p in sorted(self.directory.glob("*.audio"), key=lambda p: p.stat().st_mtime)
+        )
+        self.size = sum(self._entries.values())
+
+    def _sweep_parts(self) -> None:
+        # another process sharing the directory may still be writing recent ones
+        cutoff = time.time() - STALE_PART
+        for part in self.directory.glob("*.part"):
+            try:
+                if part.stat().st_mtime < cutoff:
+                    part.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ----------------------------------------------------------
+    def path_for(self, url: str) -> Path:
+        digest = hashlib.sha1(canonical_url(url).encode()).hexdigest()
+        return self.directory / f"{digest}.audio"
+
+    def __contains__(self, url: str) -> bool:
+        return self.path_for(url) in self._entries
+
+    def pin(self, url: str) -> None:
+        path = self.path_for(url)
+        with self._lock:
+            self._pins[path] = self._pins.get(path, 0) + 1
+
+    def unpin(self, url: str) -> None:
+        path = self.path_for(url)
+        with self._lock:
+            if self._pins.get(path, 0) <= 1:
+                self._pins.pop(path, None)
+            else:
+                self._pins[path] -= 1
+            self._evict()
+
+    # ----------------------------------------------------------
+    def get(self, url: str) -> Path:
+        """Return the local file for ``url``, downloading it if needed."""
+        path = self.path_for(url)
+        while True:
+            with self._lock:
+                if path in self._entries:
+                    self._entries.move_to_end(path)
+                    os.utime(path)
+                    return path
+                waiter = self._inflight.get(path)
+                if waiter is None:
+                    self._inflight[path] = threading.Event()
+                    break
+            waiter.wait()
+        tmp = path.with_suffix(f".{threading.get_ident()}.part")
+        try:
+            try:
+                with open(tmp, "wb") as fh:
+                    self.fetch_fn(url, fh)
+                tmp.replace(path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            with self._lock:
+                self._entries[path] = path.stat().st_size
+                self.size += self._entries[path]
+                self._evict()
+            return path
+        finally:
+            with self._lock:
+                self._inflight.pop(path).set()
+
+    def _evict(self) -> None:
+        for path in list(self._entries):
+            if self.size <= self.max_bytes:
+                return
+            if self._pins.get(path):
+                continue
+            self.size -= self._entries.pop(path)
+            path.unlink(missing_ok=True)
+
+
+class Prefetcher:
+    """Keep the next ``lookahead`` episodes downloading in the background."""
+
+    def __init__(self, cache: AudioCache, lookahead: int = 3, workers: int = 2) -> None:
+        self.cache = cache
+        self.lookahead = lookahead
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    def iterate(self, urls: Iterable[str]) -> Iterator[tuple[str, Optional[Path]]]:
+        """Yield ``(url, local_path)`` in order; ``local_path`` is ``None`` if the download failed.
+
+        The yielded file stays pinned until the caller asks for the next one.
+        """
+        queue: deque[tuple[str, Future]] = deque()
+        it = iter(urls)
+
+        def schedule() -> None:
+            while len(queue) < self.lookahead + 1:
+                url = next(it, None)
+                if url is None:
+                    return
+                self.cache.pin(url)
+                queue.append((url, self._pool.submit(self.cache.get, url)))
+
+        schedule()
+        try:
+            while queue:
+                url, fut = queue.popleft()
+                schedule()
+                try:
+                    path: Optional[Path] = fut.result()
+                except Exception:
+                    path = None
+                try:
+                    yield url, path
+                finally:
+                    self.cache.unpin(url)
+        finally:
+            for url, fut in queue:
+                fut.cancel()
+                self.cache.unpin(url)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
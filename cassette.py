@@ -0,0 +1,235 @@
+"""Record/replay transport for deterministic offline runs.
+
+A cassette is a gzip-compressed JSON-lines file of request/response pairs
+with the latency each one originally took.  :class:`CassetteSession` plugs
+into the ``session`` hook of :class:`~agent_client.BaseAgentClient`;
+:class:`CassetteProxy` wraps SDK-style clients such as
+:class:`~runpod_client.RunPodClient` method by method.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded interaction for a request."""
+
+
+class CassetteResponse:
+    """The parts of a ``requests.Response`` the agent clients use."""
+
+    def __init__(self, text: str, status_code: int) -> None:
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            err = Exception(f"HTTP {self.status_code}")
+            err.response = self
+            raise err
+
+
+class Cassette:
+    """Recorded interactions keyed by request.
+
+    In ``replay`` mode repeated identical requests are served in recorded
+    order, the last one repeating once exhausted.  Latencies are replayed
+    multiplied by ``speed`` (0 replays instantly).
+    """
+
+    def __init__(self, path: str | Path, mode: str = "replay", speed: float = 1.0) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown cassette mode {mode!r}; expected one of {MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._entries: list[dict[str, Any]] = []
+        self._replay: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._served: dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            with gzip.open(self.path, "rt") as fh:
+                for line in fh:
+                    entry = json.loads(line)
+                    self._replay[entry["key"]].append(entry)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        raw = json.dumps(parts, sort_keys=True, default=repr).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def record(self, key: str, latency: float, **data: Any) -> None:
+        with self._lock:
+            self._entries.append({"key": key, "latency": round(latency, 6), **data})
+
+    def replay(self, key: str) -> dict[str, Any]:
+        with self._lock:
+            entries = self._replay.get(key)
+            if not entries:
+                raise CassetteMiss(key)
+            entry = entries[min(self._served[key], len(entries) - 1)]
+            self._served[key] += 1
+        if self.speed:
+            time.sleep(entry["latency"] * self.speed)
+        return entry
+
+    def rewind(self) -> None:
+        """Serve repeated requests from their first recording again."""
+        with self._lock:
+            self._served.clear()
+
+    def save(self) -> None:
+        """Write recorded interactions (record mode only)."""
+        if self.mode != "record":
+            return
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock, gzip.open(tmp, "wt") as fh:
+            for entry in self._entries:
+                fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        tmp.replace(self.path)
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.save()
+
+
+def _body(kwargs: dict[str, Any]) -> tuple[Any, dict[str, Any]]:
+    """The request body as a key part, with streamed ``data`` materialized."""
+    if "json" in kwargs:
+        return kwargs["json"], kwargs
+    data = kwargs.get("data")
+    if data is None or isinstance(data, (bytes, str)):
+        body = data
+    else:
+        data = b"".join(data)
+        kwargs = {**kwargs, "data": data}
+        body = data
+    if isinstance(body, bytes):
+        body = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return body, kwargs
+
+
+class CassetteSession:
+    """``requests``-style session that records to or replays from a cassette.
+
+    Requests are matched on method, URL path and body, so a replay is not
+    tied to the hosts (or replicas) of the recorded run.  ``inner`` is the
+    real transport used while recording (the ``requests`` module by default).
+    """
+
+    def __init__(self, cassette: Cassette, inner: Any = None) -> None:
+        self.cassette = cassette
+        self.inner = inner
+
+    def _call(self, method: str, url: str, **kwargs: Any) -> Any:
+        body, kwargs = _body(kwargs)
+        key = Cassette.key(method, urlsplit(url).path, body)
+        if self.cassette.mode == "replay":
+            entry = self.cassette.replay(key)
+            return CassetteResponse(entry["text"], entry["status"])
+        if self.inner is None:
+            import requests
+
+            self.inner = requests
+        start = time.perf_counter()
+        resp = getattr(self.inner, method.lower())(url, **kwargs)
+        self.cassette.record(
+            key,
+            time.perf_counter() - start,
+            method=method,
+            path=urlsplit(url).path,
+            status=getattr(resp, "status_code", 200),
+            text=resp.text,
+        )
+        return resp
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self._call("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        return self._call("POST", url, **kwargs)
+
+
+class CassetteProxy:
+    """Record or replay every method call made on ``target``.
+
+    Calls are matched on ``prefix``, method name and arguments; results
+    must be JSON-serializable.  In replay mode ``target`` is never called
+    (pass the same ``prefix`` used when recording if it is ``None``).
+    """
+
+    def __init__(self, target: Any, cassette: Cassette, prefix: str = "") -> None:
+        self._target = target
+        self._cassette = cassette
+        self._prefix = prefix or type(target).__name__
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        attr = getattr(self._target, name) if self._cassette.mode == "record" else None
+        if attr is not None and not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            key = Cassette.key(self._prefix, name, args, kwargs)
+            if self._cassette.mode == "replay":
+                entry = self._cassette.replay(key)
+                if "error" in entry:
+                    raise RuntimeError(entry["error"])
+                return entry["result"]
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self._cassette.record(key, time.perf_counter() - start, call=name, error=repr(e))
+                raise
+            self._cassette.record(key, time.perf_counter() - start, call=name, result=result)
+            return result
+
+        call.__name__ = name
+        return call
+
+
+def from_config(cfg: dict) -> Optional[Cassette]:
+    """Open the cassette named by the ``cassette``/``cassette_mode``/``replay_speed`` keys."""
+    path = cfg.get("cassette")
+    if not path:
+        return None
+    return Cassette(path, cfg.get("cassette_mode", "replay"), float(cfg.get("replay_speed", 1.0)))
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py replay``: benchmark a run against a cassette."""
+    from run_workflow import _load, build_orchestrator
+
+    parser = argparse.ArgumentParser(prog="cli.py replay", description="Replay a recorded run offline")
+    parser.add_argument("cassette")
+    parser.add_argument("--config", default="demo.yml")
+    parser.add_argument("--speed", type=float, default=1.0, help="latency multiplier (0 = no delay)")
+    parser.add_argument("--parallel", action="store_true")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    cfg = _load(Path(args.config))
+    session = CassetteSession(Cassette(args.cassette, "replay", args.speed))
+    orch = build_orchestrator(cfg, session=session)
+    for i in range(args.repeat):
+        session.cassette.rewind()
+        start = time.perf_counter()
+        results = asyncio.run(
+            orch.run(cfg.get("feed_url", "https://example.com/feed"), cfg.get("limit", 10), args.parallel)
+        )
+        print(f"run {i + 1}: {len(results)} results in {time.perf_counter() - start:.3f}s")
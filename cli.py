@@ -2,35 +2,91 @@
 # pragma: no cover
 
 import argparse
+import contextlib
+import importlib
+import json
 import sys
+from pathlib import Path
 import builtins
-import multiprocessing as mp
-from runpod_client import RunPodClient
-from analyzer import StrategicAnalyzer
-from workflow import WorkflowManager
+
+# Heavy dependencies are resolved on first use through ``__getattr__`` so that
+# argument parsing (and ``--help``) does not pay for them.
+_LAZY = {
+    "mp": ("multiprocessing", None),
+    "RunPodClient": ("runpod_client", "RunPodClient"),
+    "StrategicAnalyzer": ("analyzer", "StrategicAnalyzer"),
+    "WorkflowManager": ("workflow", "WorkflowManager"),
+    "workflow_from_config": ("workflow", "from_config"),
+    "CassetteProxy": ("cassette", "CassetteProxy"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = importlib.import_module(module_name)
+    if attr:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+# Subcommands are dispatched before argparse runs so that each module
+# owns its parser (and only its own imports are paid for).
+_SUBCOMMANDS = {
+    "serve": ("daemon", "run the scheduler and orchestrator as a daemon"),
+    "ctl": ("daemon", "talk to a running daemon"),
+    "queue": ("workqueue", "shared episode work queue"),
+    "backfill": ("backfill", "reprocess a whole feed archive"),
+    "loadtest": ("loadtest", "load-test the pipeline against fake agents"),
+    "traces": ("tracing", "show the slowest recorded traces"),
+    "search": ("transcript_index", "search written transcripts"),
+    "replay": ("cassette", "replay a recorded run offline"),
+    "results": ("results_store", "query stored pipeline results"),
+}
+
+
+class _HelpFormatter(argparse.ArgumentDefaultsHelpFormatter, argparse.RawDescriptionHelpFormatter):
+    pass
+
+
+def _load_config(path: str | None) -> dict:
+    if not path:
+        return {}
+    return importlib.import_module("run_workflow")._load(Path(path))
+
+
+def _cassette(cfg: dict):
+    """The cassette named by ``cfg`` (saved on exit), or a null context."""
+    tape = importlib.import_module("cassette").from_config(cfg)
+    return tape if tape is not None else contextlib.nullcontext()
 
 
 def _transcribe_proc(audio_url: str) -> None:
     """Process target to transcribe audio and print the result."""
-    print(RunPodClient().transcribe(audio_url))
+    print(cli.RunPodClient().transcribe(audio_url))
 
 
 def _analyze_proc(text: str) -> None:
     """Process target to analyze text and print the result."""
-    print(StrategicAnalyzer().analyze(text))
+    print(cli.StrategicAnalyzer().analyze(text))
 
 
-def _workflow_proc(feed_url: str) -> None:
+def _workflow_proc(feed_url: str, config: str | None = None) -> None:
     """Process target to execute the workflow."""
-    WorkflowManager(feed_url).run()
+    cfg = _load_config(config)
+    with _cassette(cfg) as tape:
+        cli.workflow_from_config(feed_url, cfg, tape).run()
 
 
-def _run_multi(audio_url: str, text: str, feed_url: str) -> None:
+def _run_multi(audio_url: str, text: str, feed_url: str, config: str | None = None) -> None:
     """Run transcription, analysis and workflow concurrently."""
+    mp = cli.mp
     procs = [
         mp.Process(target=_transcribe_proc, args=(audio_url,)),
         mp.Process(target=_analyze_proc, args=(text,)),
-        mp.Process(target=_workflow_proc, args=(feed_url,)),
+        mp.Process(target=_workflow_proc, args=(feed_url, config)),
     ]
     for p in procs:
         p.start()
@@ -40,9 +96,18 @@ def _run_multi(audio_url: str, text: str, feed_url: str) -> None:
 
 def main(argv=None):
     """Entry point for the CLI."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in _SUBCOMMANDS:
+        module, _ = _SUBCOMMANDS[argv[0]]
+        # the daemon parses its own serve/ctl subcommand
+        importlib.import_module(module).main(argv if module == "daemon" else argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Transcribe audio using RunPod",
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        formatter_class=_HelpFormatter,
+        epilog="subcommands (run 'cli.py <subcommand> --help' for options):\n"
+        + "\n".join(f"  {name:<10}{text}" for name, (_, text) in _SUBCOMMANDS.items()),
     )
     parser.add_argument("audio_url", help="URL of the audio file to transcribe")
     parser.add_argument(
@@ -52,19 +117,57 @@ def main(argv=None):
     )
     parser.add_argument("--text", default="Test text")
     parser.add_argument("--feed-url", default="https://example.com/feed")
+    parser.add_argument(
+        "--config", help="Config file for the workflow and single-URL runs (cassette, state files, caches)"
+    )
+    parser.add_argument(
+        "--daemon",
+        metavar="HOST:PORT",
+        help="Queue the episode on a running daemon's interactive lane instead of transcribing here",
+    )
+    parser.add_argument("--profile", metavar="DIR", help="Write cProfile and collapsed stacks under DIR")
+    parser.add_argument("--trace-malloc", type=int, default=0, metavar="N", help="Report the top N allocation sites")
+    parser.add_argument("--profile-rate", type=float, default=1.0, help="Fraction of runs to profile")
     args = parser.parse_args(argv)
 
-    if args.multi:
-        _run_multi(args.audio_url, args.text, args.feed_url)
-        return
-
-    if not args.audio_url:
+    if not args.multi and not args.audio_url:
         parser.error("audio_url is required")
 
-    client = RunPodClient()
-    print("Transcribing...", file=sys.stderr)
-    result = client.transcribe(args.audio_url)
-    print(result)
+    if args.daemon:
+        # the daemon schedules it ahead of its bulk runs on the shared agents
+        host, _, port = args.daemon.rpartition(":")
+        daemon = importlib.import_module("daemon")
+        reply = daemon.send_command({"cmd": "episode", "url": args.audio_url}, host or daemon.DEFAULT_HOST, int(port))
+        print(json.dumps(reply))
+        return
+
+    bus = None
+    if args.profile or args.trace_malloc:
+        # stage events let the profiler attribute samples to transcription
+        bus = importlib.import_module("orchestrator").EventBus()
+        profiler = importlib.import_module("profiling").profile_run(
+            args.profile, args.trace_malloc, args.profile_rate, bus=bus
+        )
+    else:
+        profiler = contextlib.nullcontext()
+    # the workflow process of --multi opens its own cassette
+    cfg = {} if args.multi else _load_config(args.config)
+    with profiler, _cassette(cfg) as tape:
+        if args.multi:
+            _run_multi(args.audio_url, args.text, args.feed_url, args.config)
+            return
+
+        client = cli.RunPodClient()
+        if tape is not None:
+            client = cli.CassetteProxy(client, tape, "RunPodClient")
+        print("Transcribing...", file=sys.stderr)
+        if bus is not None:
+            bus.emit("discovered", urls=[args.audio_url])
+        result = client.transcribe(args.audio_url)
+        if bus is not None:
+            bus.emit("transcribed", url=args.audio_url, text=result)
+            bus.emit("completed", results=[result])
+        print(result)
 
 
 # allow tests referencing `cli.main`
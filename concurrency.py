@@ -0,0 +1,138 @@
+"""Adaptive (AIMD) concurrency limits for agent calls."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+
+def default_max_limit() -> int:
+    """Worker count of the default executor used by ``asyncio.to_thread``."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class AIMDLimiter:
+    """In-flight limit adjusted by additive increase / multiplicative decrease.
+
+    A call counts as congested if it failed or if its latency exceeded
+    ``tolerance`` times the ``quantile`` latency of the last ``window``
+    calls of the same ``kind``.  A low quantile rather than the minimum keeps
+    one unusually short call (say, a tiny episode) from making normal calls
+    look slow, and keeping a window per kind stops quick calls (``score``)
+    from making slow ones (``analyze``) on the same agent look congested.
+    Congestion multiplies the limit by ``decrease``; every healthy call
+    adds ``increase / limit``, i.e. roughly ``increase`` per full window of
+    in-flight calls.  Only calls started after the last decrease can trigger
+    another one, so a burst of failures shrinks the limit once.
+
+    ``max_limit`` defaults to the size of asyncio's default thread pool,
+    which runs the blocking agent calls; a higher limit would only queue
+    calls inside the executor.
+
+    Whenever the integer limit changes a ``concurrency`` event is emitted on
+    ``bus`` (an ``orchestrator.EventBus``) with ``agent`` and ``limit``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+        window: int = 100,
+        quantile: float = 0.1,
+        bus: Any = None,
+    ) -> None:
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else default_max_limit()
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.quantile = quantile
+        self.bus = bus
+        self._limit = float(max(min_limit, min(initial, self.max_limit)))
+        self.window = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._inflight = 0
+        self._decreased_at = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    # ----------------------------------------------------------
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+        return self._cond
+
+    async def acquire(self) -> None:
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._inflight < self.limit)
+            self._inflight += 1
+
+    async def release(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self._inflight -= 1
+            cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, wait: bool = True, kind: str = "") -> AsyncIterator[dict]:
+        """Hold one slot; set ``outcome["ok"] = False`` to report a failure.
+
+        With ``wait=False`` the call is admitted at once and only measured,
+        for callers that enforce :attr:`limit` themselves.
+        """
+        if wait:
+            await self.acquire()
+        else:
+            self._inflight += 1
+        outcome = {"ok": True}
+        start = time.monotonic()
+        try:
+            yield outcome
+        except BaseException:
+            outcome["ok"] = False
+            raise
+        finally:
+            self.record(time.monotonic() - start, outcome["ok"], started=start, kind=kind)
+            await self.release()
+
+    # ----------------------------------------------------------
+    def _baseline(self, latencies: deque[float]) -> float:
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))]
+
+    def record(self, latency: float, ok: bool, started: float | None = None, kind: str = "") -> None:
+        """Feed one observation of a ``kind`` of call into the controller."""
+        before = self.limit
+        latencies = self._latencies.setdefault(kind, deque(maxlen=self.window))
+        baseline = self._baseline(latencies) if latencies else latency
+        latencies.append(latency)
+        congested = not ok or latency > self.tolerance * baseline
+        if congested:
+            if started is None or started >= self._decreased_at:
+                self._limit = max(self.min_limit, self._limit * self.decrease)
+                self._decreased_at = time.monotonic()
+        else:
+            self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+        if self.limit != before and self.bus is not None:
+            self.bus.emit("concurrency", agent=self.name, limit=self.limit)
@@ -6,7 +6,7 @@ try:
 except ModuleNotFoundError:  # fallback simple parser
     yaml = None
 
-@dataclass
+@dataclass(slots=True)
 class Feed:
     name: str
     url: str
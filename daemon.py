@@ -0,0 +1,326 @@
+"""Long-running pipeline daemon hosting the scheduler and orchestrator."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import signal
+import socket
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, MutableMapping
+
+import lanes
+from orchestrator import EventBus, PipelineOrchestrator
+from results_store import DAY, ResultsStore
+from run_workflow import _load, build_orchestrator
+from scheduler import Scheduler, Task
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class LRUCache(MutableMapping):
+    """Bounded mapping evicting the least recently used entry."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Any, Any] = OrderedDict()
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __delitem__(self, key: Any) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PipelineDaemon:
+    """Serve scheduled and ad-hoc pipeline runs from one event loop.
+
+    Clients, the result cache and the parsed config are built once and
+    reused for every tick.  A JSON-lines control socket on ``host:port``
+    accepts ``submit``, ``status`` and ``shutdown`` commands.  At most
+    ``max_jobs`` jobs are kept for ``status``; the oldest finished ones
+    are dropped first.
+    """
+
+    def __init__(
+        self,
+        cfg: dict[str, Any],
+        orchestrator: PipelineOrchestrator | None = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        tick: float = 1.0,
+        drain_timeout: float = 30.0,
+        max_jobs: int = 1000,
+    ) -> None:
+        self.cfg = cfg
+        self.host = host
+        self.port = port
+        self.tick = tick
+        self.drain_timeout = drain_timeout
+        self.max_jobs = max_jobs
+        self.bus = EventBus()
+        self.orchestrator = orchestrator or build_orchestrator(
+            cfg, bus=self.bus, cache=LRUCache(int(cfg.get("cache_size", 1024)))
+        )
+        self.results = ResultsStore(cfg["results_db"]) if cfg.get("results_db") else None
+        self.scheduler = Scheduler(
+            self._scheduled_tasks(), Path(cfg.get("state_file", "scheduler_state.json"))
+        )
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._inflight: set[asyncio.Task] = set()
+        self._stopping: asyncio.Event | None = None
+        self._server: asyncio.AbstractServer | None = None
+
+    # ----------------------------------------------------------
+    def _scheduled_tasks(self) -> list[Task]:
+        feeds = self.cfg.get("feeds") or [{"url": self.cfg.get("feed_url", "https://example.com/feed")}]
+        interval = int(self.cfg.get("interval", 3600))
+        limit = int(self.cfg.get("limit", 10))
+        return [
+            Task(
+                f"feed:{f['url']}",
+                lambda u=f["url"], n=int(f.get("limit", limit)): self._submit_feed(u, n, lanes.BULK)[1],
+                int(f.get("interval", interval)),
+            )
+            for f in feeds
+        ]
+
+    # ----------------------------------------------------------
+    def submit(self, feed_url: str, limit: int = 10, lane: str = lanes.BULK) -> str:
+        """Queue a pipeline run on the running loop and return its job id."""
+        return self._submit_feed(feed_url, limit, lane)[0]
+
+    def _submit_feed(self, feed_url: str, limit: int, lane: str) -> tuple[str, asyncio.Task]:
+        # scheduled runs hand the task to the Scheduler so it records the outcome
+        sink = self.results.for_feed(feed_url) if self.results is not None else None
+        return self._start(
+            {"feed_url": feed_url}, lane, lambda: self.orchestrator.run(feed_url, limit, parallel=True, sink=sink)
+        )
+
+    def submit_episode(self, url: str, lane: str = lanes.INTERACTIVE) -> str:
+        """Queue a single episode, by default ahead of bulk feed runs."""
+        return self._start({"url": url}, lane, lambda: self._one(url))[0]
+
+    async def _one(self, url: str) -> list[dict[str, Any]]:
+        result = await self.orchestrator.process(url, lane=lanes.current())
+        if not result:
+            return []
+        if self.results is not None:
+            self.results.write(result)
+        return [result]
+
+    def _start(
+        self, info: dict[str, Any], lane: str, work: Callable[[], Awaitable[list]]
+    ) -> tuple[str, asyncio.Task]:
+        if self._stopping is None or self._stopping.is_set():
+            raise RuntimeError("daemon is not accepting jobs")
+        self._prune_jobs()
+        job_id = f"job-{next(self._ids)}"
+        self.jobs[job_id] = {**info, "lane": lane, "state": "running", "results": 0}
+        task = asyncio.get_running_loop().create_task(self._run_job(job_id, lane, work))
+        self._inflight.add(task)
+        task.add_done_callback(self._reap)
+        return job_id, task
+
+    def _reap(self, task: asyncio.Task) -> None:
+        self._inflight.discard(task)
+        if not task.cancelled():
+            task.exception()  # recorded in the job state; mark it retrieved
+
+    def _prune_jobs(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job["state"] != "running"]
+        for job_id in finished[: max(0, len(self.jobs) - self.max_jobs + 1)]:
+            del self.jobs[job_id]
+
+    async def _run_job(self, job_id: str, lane: str, work: Callable[[], Awaitable[list]]) -> None:
+        job = self.jobs[job_id]
+        try:
+            with lanes.use(lane):
+                results = await work()
+        except asyncio.CancelledError:
+            job["state"] = "cancelled"
+            raise
+        except Exception as e:
+            job["state"] = f"fail:{e}"
+            raise
+        job["results"] = len(results)
+        if self.results is not None:
+            # a job reported done has its results committed for queries
+            await asyncio.to_thread(self.results.flush)
+        job["state"] = "done"
+
+    def top(self, feed_url: str | None = None, days: float | None = None, limit: int = 10) -> list[dict[str, Any]]:
+        """Best-scored stored results, e.g. this week's top episodes of a feed."""
+        if self.results is None:
+            raise RuntimeError("no results_db configured")
+        since = time.time() - days * DAY if days else None
+        return self.results.top(feed_url, since, limit=limit)
+
+    def status(self, job_id: str | None = None) -> dict[str, Any]:
+        if job_id is not None:
+            return {"job": job_id, **self.jobs.get(job_id, {"state": "unknown"})}
+        status: dict[str, Any] = {"inflight": len(self._inflight), "jobs": self.jobs}
+        if self.orchestrator.dispatchers:
+            status["lanes"] = {agent: d.stats() for agent, d in self.orchestrator.dispatchers.items()}
+        return status
+
+    # ----------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                reply = self._dispatch(line)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _dispatch(self, line: bytes) -> dict[str, Any]:
+        try:
+            msg = json.loads(line)
+            cmd = msg.get("cmd")
+            if cmd == "submit":
+                job = self.submit(msg["feed_url"], int(msg.get("limit", 10)), msg.get("lane", lanes.BULK))
+                return {"ok": True, "job": job}
+            if cmd == "episode":
+                return {"ok": True, "job": self.submit_episode(msg["url"], msg.get("lane", lanes.INTERACTIVE))}
+            if cmd == "status":
+                return {"ok": True, **self.status(msg.get("job"))}
+            if cmd == "top":
+                rows = self.top(msg.get("feed_url"), msg.get("days"), int(msg.get("limit", 10)))
+                return {"ok": True, "results": rows}
+            if cmd == "shutdown":
+                self.stop()
+                return {"ok": True}
+            return {"ok": False, "error": f"unknown command: {cmd}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    # ----------------------------------------------------------
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def serve(self) -> None:
+        """Run until :meth:`stop` is called, then drain in-flight jobs."""
+        self._stopping = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.bus.emit("serving", host=self.host, port=self.port)
+        try:
+            while not self._stopping.is_set():
+                self.scheduler.run_pending()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.tick)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            await self._drain()
+            if self.results is not None:
+                await asyncio.to_thread(self.results.flush)
+
+    async def _drain(self) -> None:
+        if not self._inflight:
+            return
+        _, pending = await asyncio.wait(set(self._inflight), timeout=self.drain_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def run(self) -> None:
+        async def main() -> None:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, self.stop)
+                except (NotImplementedError, RuntimeError):  # pragma: no cover - non-POSIX
+                    pass
+            await self.serve()
+
+        asyncio.run(main())
+
+
+def send_command(payload: dict[str, Any], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> dict[str, Any]:
+    """Send one command to a running daemon and return its reply."""
+    with socket.create_connection((host, port), timeout=5) as sock:
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        return json.loads(sock.makefile("rb").readline())
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py serve`` and ``cli.py ctl``."""
+    parser = argparse.ArgumentParser(prog="cli.py", description="Pipeline daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run the scheduler and orchestrator as a daemon")
+    serve.add_argument("--config", default="demo.yml")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--tick", type=float, default=1.0)
+    serve.add_argument("--drain-timeout", type=float, default=30.0)
+    ctl = sub.add_parser("ctl", help="Talk to a running daemon")
+    ctl.add_argument("cmd", choices=["submit", "episode", "status", "top", "shutdown"])
+    ctl.add_argument(
+        "arg", nargs="?", help="feed URL for submit/top, audio URL for episode, job id for status"
+    )
+    ctl.add_argument("--days", type=float, default=None, help="top: only results from the last N days")
+    ctl.add_argument("--limit", type=int, default=10)
+    ctl.add_argument("--lane", choices=[lanes.INTERACTIVE, lanes.BULK], default=None)
+    ctl.add_argument("--host", default=DEFAULT_HOST)
+    ctl.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    if args.command == "ctl" and args.cmd in ("submit", "episode") and not args.arg:
+        ctl.error(f"{args.cmd} needs a URL")
+
+    if args.command == "serve":
+        daemon = PipelineDaemon(
+            _load(Path(args.config)),
+            host=args.host,
+            port=args.port,
+            tick=args.tick,
+            drain_timeout=args.drain_timeout,
+        )
+        daemon.bus.on("serving", lambda host, port: print(f"Serving on {host}:{port}", file=sys.stderr))
+        daemon.run()
+        return
+
+    payload: dict[str, Any] = {"cmd": args.cmd}
+    if args.lane:
+        payload["lane"] = args.lane
+    if args.cmd == "submit":
+        payload.update(feed_url=args.arg, limit=args.limit)
+    elif args.cmd == "top":
+        payload.update(feed_url=args.arg, limit=args.limit, days=args.days)
+    elif args.cmd == "episode":
+        payload["url"] = args.arg
+    elif args.arg:
+        payload["job"] = args.arg
+    print(json.dumps(send_command(payload, args.host, args.port)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Deadline budgets carried through a run in a context variable.
+
+The active deadline is an absolute :func:`time.monotonic` value.  Tasks and
+``asyncio.to_thread`` calls copy the current context, so agent clients see
+the deadline of the run or episode that issued them without it being passed
+through every signature.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A call was attempted after its deadline had passed."""
+
+
+def after(seconds: float | None) -> Optional[float]:
+    """Absolute deadline ``seconds`` from now, never later than the current one."""
+    current = _deadline.get()
+    if seconds is None:
+        return current
+    until = time.monotonic() + seconds
+    return until if current is None else min(current, until)
+
+
+def earliest(*untils: float | None) -> Optional[float]:
+    """The soonest of several absolute deadlines, ignoring ``None``."""
+    return min((u for u in untils if u is not None), default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or ``None`` when unbounded."""
+    until = _deadline.get()
+    return None if until is None else until - time.monotonic()
+
+
+def timeout(default: float, cap: float | None = None) -> float:
+    """HTTP timeout for a call made now; raise if the budget is spent.
+
+    Outside a deadline the call gets ``cap`` (or ``default``).  Inside one
+    it may use the whole remaining budget, at most ``cap``: a fixed default
+    would give up on slow calls that could still finish in time.
+    """
+    left = remaining()
+    if left is None:
+        return default if cap is None else cap
+    if left <= 0:
+        raise DeadlineExceeded("deadline exceeded")
+    return left if cap is None else min(cap, left)
+
+
+@contextlib.asynccontextmanager
+async def scope(until: float | None) -> AsyncIterator[None]:
+    """Run the block under deadline ``until`` and cancel it when that passes.
+
+    Expiry surfaces as :class:`DeadlineExceeded` (a :class:`TimeoutError`).
+    Blocking calls already in a worker thread cannot be interrupted, but
+    their HTTP timeouts were bounded by the same budget (see :func:`timeout`).
+    """
+    until = earliest(until, _deadline.get())
+    token = _deadline.set(until)
+    try:
+        if until is None:
+            yield
+            return
+        # asyncio.timeout() is 3.11+; cancel the task ourselves and report
+        # the cancellation as a timeout if it was ours
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        expired = False
+
+        def expire() -> None:
+            nonlocal expired
+            expired = True
+            task.cancel()
+
+        handle = loop.call_at(loop.time() + (until - time.monotonic()), expire)
+        try:
+            yield
+        except asyncio.CancelledError as e:
+            if not expired:
+                raise
+            if hasattr(task, "uncancel"):
+                task.uncancel()
+            raise DeadlineExceeded("deadline exceeded") from e
+        finally:
+            handle.cancel()
+    finally:
+        _deadline.reset(token)
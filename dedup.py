@@ -0,0 +1,204 @@
+"""Near-duplicate transcript detection with MinHash and LSH banding."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import sqlite3
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+from transcript_index import tokenize
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dep
+    np = None
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    key TEXT PRIMARY KEY,
+    sig BLOB NOT NULL,
+    summary TEXT,
+    goals TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS buckets_key ON buckets (key);
+"""
+
+
+def _goals(goals: Iterable[str]) -> str:
+    """Column value identifying a goal set (empty for a plain analysis)."""
+    goals = sorted(set(goals))
+    return json.dumps(goals) if goals else ""
+
+
+def _summary(stored: str) -> Any:
+    try:
+        return json.loads(stored)
+    except ValueError:
+        # indexes written before summaries were JSON-encoded hold plain text
+        return stored
+
+
+class MinHasher:
+    """MinHash signatures over word ``shingle``-grams.
+
+    Shingles are hashed to 32 bits and permuted with ``(a*x + b) mod p``.
+    The seed is fixed, so signatures are comparable across processes.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle: int = 5, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.a = [rng.randrange(1, 1 << 32) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, 1 << 32) for _ in range(num_perm)]
+
+    def _shingles(self, text: str) -> set[int]:
+        words = tokenize(text)
+        n = self.shingle
+        grams = (" ".join(words[i:i + n]) for i in range(max(1, len(words) - n + 1)))
+        return {
+            int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "little") for g in grams
+        }
+
+    def signature(self, text: str) -> list[int]:
+        hashes = self._shingles(text)
+        if np is not None:
+            h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            a = np.asarray(self.a, dtype=np.uint64)[:, None]
+            b = np.asarray(self.b, dtype=np.uint64)[:, None]
+            return (((a * h + b) % np.uint64(_PRIME)) & np.uint64(_MASK)).min(axis=1).tolist()
+        return [min(((a * x + b) % _PRIME) & _MASK for x in hashes) for a, b in zip(self.a, self.b)]
+
+
+def similarity(sig1: Sequence[int], sig2: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig1, sig2)) / len(sig1)
+
+
+class DuplicateIndex:
+    """Persistent LSH index of transcript signatures.
+
+    Signatures are split into ``bands`` bands; each band is hashed into a
+    bucket and only transcripts sharing a bucket are compared, so a lookup
+    reads a few index rows instead of scanning the corpus.  With 128
+    permutations in 16 bands, pairs above ~0.7 similarity almost always
+    share a bucket; ``threshold`` then filters on the estimated similarity.
+
+    Each entry may carry the summary produced for it (any JSON value), so
+    duplicates can reuse it instead of being analyzed again.  Entries are
+    tagged with the analysis goals their summary answers, and a lookup
+    only matches entries for the same goal set.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle: int = 5,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(signatures)")}
+        if "goals" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE signatures ADD COLUMN goals TEXT NOT NULL DEFAULT ''")
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    # ----------------------------------------------------------
+    def signature(self, text: str) -> list[int]:
+        return self.hasher.signature(text)
+
+    def _buckets(self, sig: Sequence[int]) -> list[tuple[int, int]]:
+        out = []
+        for band in range(self.bands):
+            chunk = struct.pack(f"<{self.rows}I", *sig[band * self.rows:(band + 1) * self.rows])
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            out.append((band, int.from_bytes(digest, "little", signed=True)))
+        return out
+
+    def find(self, sig: Sequence[int], goals: Iterable[str] = ()) -> Optional[tuple[str, float, Any]]:
+        """Best stored match ``(key, similarity, summary)`` at or above the threshold.
+
+        Entries without a summary, or summarized for other ``goals``, are
+        skipped, so they cannot hide a usable, slightly less similar match.
+        """
+        goal_set = _goals(goals)
+        best = None
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._buckets(sig):
+                rows = self._conn.execute("SELECT key FROM buckets WHERE band = ? AND bucket = ?", (band, bucket))
+                candidates.update(key for (key,) in rows)
+            for key in candidates:
+                row = self._conn.execute(
+                    "SELECT sig, summary FROM signatures WHERE key = ? AND summary IS NOT NULL AND goals = ?",
+                    (key, goal_set),
+                ).fetchone()
+                if row is None:
+                    continue
+                blob, summary = row
+                score = similarity(sig, array("Q", blob))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score, summary)
+        if best is not None and best[2] is not None:
+            best = (best[0], best[1], _summary(best[2]))
+        return best
+
+    def add(self, key: str, sig: Sequence[int], summary: Any = None, goals: Iterable[str] = ()) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM buckets WHERE key = ?", (key,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (key, sig, summary, goals) VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    array("Q", sig).tobytes(),
+                    None if summary is None else json.dumps(summary),
+                    _goals(goals),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO buckets (band, bucket, key) VALUES (?, ?, ?)",
+                ((band, bucket, key) for band, bucket in self._buckets(sig)),
+            )
+
+    def set_summary(self, key: str, summary: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE signatures SET summary = ? WHERE key = ?", (json.dumps(summary), key))
+
+
+def from_config(cfg: dict) -> Optional[DuplicateIndex]:
+    """Open the index named by the ``dedup_db``/``dedup_threshold`` config keys."""
+    path = cfg.get("dedup_db")
+    if not path:
+        return None
+    return DuplicateIndex(path, threshold=float(cfg.get("dedup_threshold", 0.8)))
@@ -0,0 +1,105 @@
+"""Client-side load balancing across agent replicas."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+POLICIES = ("least_outstanding", "ewma")
+
+
+@dataclass(slots=True)
+class Endpoint:
+    """One replica and its passive health/latency state."""
+
+    url: str
+    outstanding: int = 0
+    ewma: float = 0.0
+    failures: int = 0
+    ejected_until: float = 0.0
+
+
+class EndpointPool:
+    """Route requests across replicas with passive health checks.
+
+    ``least_outstanding`` picks the replica with the fewest requests in
+    flight; ``ewma`` weighs that by each replica's smoothed latency, so a
+    slow replica receives proportionally less traffic.  A replica that has
+    not completed a request yet is assumed to be as fast as the pool's
+    measured average (or all are weighed equally while none has), so it
+    is not flooded during warm-up.  Ties are broken at random.  After
+    ``eject_after`` consecutive failures a replica is ejected for
+    ``eject_for`` seconds; if every replica is ejected the pool fails open
+    and keeps using all of them.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        policy: str = "least_outstanding",
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        decay: float = 0.3,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}; expected one of {POLICIES}")
+        self.endpoints = [Endpoint(url.rstrip("/")) for url in urls]
+        if not self.endpoints:
+            raise ValueError("endpoint pool needs at least one URL")
+        self.policy = policy
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self.decay = decay
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def _cost(self, ep: Endpoint, seed: float) -> float:
+        if self.policy == "ewma":
+            return (ep.outstanding + 1) * (ep.ewma or seed)
+        return ep.outstanding
+
+    def _seed(self) -> float:
+        measured = [ep.ewma for ep in self.endpoints if ep.ewma]
+        return sum(measured) / len(measured) if measured else 1.0
+
+    def acquire(self) -> Endpoint:
+        """Choose a replica and count the request against it."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [ep for ep in self.endpoints if ep.ejected_until <= now] or self.endpoints
+            seed = self._seed() if self.policy == "ewma" else 0.0
+            costs = [self._cost(ep, seed) for ep in healthy]
+            best = min(costs)
+            ep = random.choice([ep for ep, cost in zip(healthy, costs) if cost == best])
+            ep.outstanding += 1
+            return ep
+
+    def release(self, ep: Endpoint, latency: float, ok: bool) -> None:
+        """Record the outcome of a request sent to ``ep``."""
+        with self._lock:
+            ep.outstanding -= 1
+            ep.ewma = latency if not ep.ewma else self.decay * latency + (1 - self.decay) * ep.ewma
+            if ok:
+                ep.failures = 0
+                return
+            ep.failures += 1
+            if ep.failures >= self.eject_after:
+                ep.ejected_until = time.monotonic() + self.eject_for
+                ep.failures = 0
+
+    def healthy(self) -> list[str]:
+        now = time.monotonic()
+        with self._lock:
+            return [ep.url for ep in self.endpoints if ep.ejected_until <= now]
+
+
+def parse_urls(value: str | Sequence[str]) -> list[str]:
+    """Accept one URL, a comma-separated string or a list of URLs."""
+    if isinstance(value, str):
+        return [u.strip() for u in value.split(",") if u.strip()]
+    return list(value)
@@ -0,0 +1,156 @@
+"""Priority lanes so interactive requests are not queued behind bulk work."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Iterator, Mapping, Optional
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+_lane: ContextVar[str] = ContextVar("lane", default=BULK)
+
+
+def current() -> str:
+    """Lane of the running task (``bulk`` unless set with :func:`use`)."""
+    return _lane.get()
+
+
+@contextlib.contextmanager
+def use(lane: str) -> Iterator[None]:
+    """Issue agent calls made inside the block (and tasks it starts) on ``lane``."""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+class LaneDispatcher:
+    """Share ``capacity`` concurrent agent calls between weighted lanes.
+
+    ``reserved`` slots of a lane are never lent to other lanes, so an
+    interactive call finds a free slot even while bulk work saturates the
+    rest.  When slots free up, waiting lanes are served by smooth weighted
+    round-robin on ``weights``, so bulk work keeps a fair share instead of
+    starving.  In-flight calls are not preempted.
+
+    :meth:`limit_by` caps the slots in use at a changing limit, such as an
+    :class:`~concurrency.AIMDLimiter`'s, so that calls held back by it also
+    wait here by lane rather than in a single FIFO queue.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 8,
+        weights: Mapping[str, int] | None = None,
+        reserved: Mapping[str, int] | None = None,
+    ) -> None:
+        self.capacity = capacity
+        self.weights = dict(weights if weights is not None else {INTERACTIVE: 4, BULK: 1})
+        self.reserved = dict(reserved if reserved is not None else {INTERACTIVE: 1})
+        self.weights.setdefault(BULK, 1)
+        if sum(self.reserved.values()) > capacity:
+            raise ValueError("reserved slots exceed capacity")
+        lanes = set(self.weights) | set(self.reserved)
+        self.inflight = {lane: 0 for lane in lanes}
+        self._waiters: dict[str, deque[asyncio.Future]] = {lane: deque() for lane in lanes}
+        self._credit = {lane: 0 for lane in lanes}
+        self._limit: Optional[Callable[[], int]] = None
+
+    def limit_by(self, limit: Callable[[], int]) -> None:
+        """Admit at most ``limit()`` calls at a time (and never more than ``capacity``)."""
+        self._limit = limit
+
+    def _check(self, lane: str) -> None:
+        if lane not in self.inflight:
+            raise ValueError(f"unknown lane {lane!r}")
+
+    def _can_run(self, lane: str) -> bool:
+        capacity = self.capacity if self._limit is None else max(1, min(self.capacity, self._limit()))
+        busy = sum(self.inflight.values())
+        if busy >= capacity:
+            return False
+        if self.inflight[lane] < self.reserved.get(lane, 0):
+            return True
+        # unused reservations of the other lanes are held back
+        held = sum(
+            max(0, slots - self.inflight[other]) for other, slots in self.reserved.items() if other != lane
+        )
+        if capacity < self.capacity:
+            # a lowered limit can only grow back if some call gets through
+            held = min(held, capacity - 1)
+        return busy < capacity - held
+
+    def _pick(self) -> Optional[str]:
+        ready = [lane for lane, q in self._waiters.items() if q and self._can_run(lane)]
+        if not ready:
+            return None
+        total = 0
+        for lane in ready:
+            weight = self.weights.get(lane, 1)
+            self._credit[lane] += weight
+            total += weight
+        lane = max(ready, key=self._credit.__getitem__)
+        self._credit[lane] -= total
+        return lane
+
+    def _dispatch(self) -> None:
+        while (lane := self._pick()) is not None:
+            fut = self._waiters[lane].popleft()
+            if not fut.done():
+                self.inflight[lane] += 1
+                fut.set_result(None)
+
+    # ----------------------------------------------------------
+    async def acquire(self, lane: str) -> None:
+        self._check(lane)
+        if not self._waiters[lane] and self._can_run(lane):
+            self.inflight[lane] += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(lane)
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters[lane].remove(fut)
+            raise
+
+    def release(self, lane: str) -> None:
+        self.inflight[lane] -= 1
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, lane: str | None = None) -> AsyncIterator[None]:
+        """Hold one slot on ``lane`` (default: the task's current lane)."""
+        lane = lane or current()
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {lane: {"inflight": n, "waiting": len(self._waiters[lane])} for lane, n in self.inflight.items()}
+
+
+def from_config(cfg: dict) -> dict[str, LaneDispatcher]:
+    """One dispatcher per agent from the ``lanes`` config section, if present."""
+    section = cfg.get("lanes")
+    if not section:
+        return {}
+    return {
+        agent: LaneDispatcher(
+            int(section.get("capacity", 8)),
+            weights=section.get("weights"),
+            reserved=section.get("reserved"),
+        )
+        for agent in ("ingest", "strategy")
+    }
@@ -0,0 +1,331 @@
+"""Load-test harness driving PipelineOrchestrator against local fake agents."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from agent_client import IngestAgentClient, StrategyAgentClient
+from endpoints import POLICIES
+from orchestrator import EventBus, PipelineOrchestrator
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Build a latency sampler (seconds) from ``kind:params``.
+
+    Supported kinds: ``const:S``, ``uniform:LO,HI``, ``exp:MEAN`` and
+    ``lognormal:MEDIAN,SIGMA``.
+    """
+    kind, _, params = spec.partition(":")
+    args = [float(p) for p in params.split(",") if p]
+    if kind == "const":
+        return lambda: args[0]
+    if kind == "uniform":
+        return lambda: random.uniform(args[0], args[1])
+    if kind == "exp":
+        return lambda: random.expovariate(1 / args[0]) if args[0] else 0.0
+    if kind == "lognormal":
+        mu = math.log(args[0])
+        return lambda: random.lognormvariate(mu, args[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; ``0.0`` for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+@dataclass
+class AgentProfile:
+    """Behaviour of one fake agent route."""
+
+    latency: Callable[[], float] = lambda: 0.0
+    error_rate: float = 0.0
+    payload_bytes: int = 0
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class FakeAgentServer:
+    """Threaded HTTP server standing in for the ingest or strategy agent."""
+
+    def __init__(self, routes: dict[str, AgentProfile], episodes_per_feed: int = 10) -> None:
+        self.routes = routes
+        self.episodes_per_feed = episodes_per_feed
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _read_body(self) -> bytes:
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    parts = []
+                    while size := int(self.rfile.readline().split(b";")[0], 16):
+                        parts.append(self.rfile.read(size))
+                        self.rfile.readline()
+                    self.rfile.readline()
+                    raw = b"".join(parts)
+                else:
+                    raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    raw = gzip.decompress(raw)
+                return raw
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                body = json.loads(self._read_body() or b"{}")
+                status, payload = server.respond(self.path, body)
+                data = payload.encode()
+                self.send_response(status)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    data = gzip.compress(data)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.httpd = _Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def respond(self, path: str, body: dict[str, Any]) -> tuple[int, str]:
+        route = path.strip("/")
+        profile = self.routes.get(route)
+        if profile is None:
+            return 404, ""
+        time.sleep(profile.latency())
+        if random.random() < profile.error_rate:
+            return 500, "injected error"
+        if route == "discover":
+            feed = body.get("feed_url", "feed")
+            urls = [f"{feed}/ep{i}.mp3" for i in range(self.episodes_per_feed)]
+            return 200, json.dumps({"audio_urls": urls})
+        if route == "score":
+            return 200, json.dumps({"score": random.randint(0, 10)})
+        return 200, "x" * max(1, profile.payload_bytes)
+
+    def __enter__(self) -> "FakeAgentServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload).encode()
+
+
+class UrllibResponse:
+    def __init__(self, text: str, status_code: int) -> None:
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class UrllibSession:
+    """Minimal ``requests``-style session over :mod:`urllib`.
+
+    The repo-root ``requests`` module is a stub, so the harness brings its
+    own transport to exercise real sockets.
+    """
+
+    def _send(self, req: urllib.request.Request, timeout: float) -> UrllibResponse:
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                raw = resp.read()
+                if resp.headers.get("Content-Encoding") == "gzip":
+                    raw = gzip.decompress(raw)
+                return UrllibResponse(raw.decode(), resp.status)
+        except urllib.error.HTTPError as e:
+            return UrllibResponse(e.read().decode(), e.code)
+
+    def get(self, url: str, timeout: float = 5, **kwargs: Any) -> UrllibResponse:
+        return self._send(urllib.request.Request(url, headers=kwargs.get("headers") or {}), timeout)
+
+    def post(self, url: str, json: Any = None, timeout: float = 5, **kwargs: Any) -> UrllibResponse:
+        headers = {"Content-Type": "application/json", **(kwargs.get("headers") or {})}
+        data = kwargs.get("data")
+        if data is None:
+            data = _encode(json)
+        req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+        return self._send(req, timeout)
+
+
+class _TimedClient:
+    """Proxy recording the wall time of every method call per stage."""
+
+    def __init__(self, client: Any, stages: dict[str, list[float]]) -> None:
+        self._client = client
+        self._stages = stages
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._stages.setdefault(name, []).append(time.perf_counter() - start)
+
+        return timed
+
+
+@dataclass
+class LoadReport:
+    episodes: int
+    completed: int
+    wall: float
+    latencies: list[float] = field(default_factory=list)
+    stages: dict[str, list[float]] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "episodes": self.episodes,
+            "completed": self.completed,
+            "failed": self.episodes - self.completed,
+            "wall_s": round(self.wall, 3),
+            "throughput_eps": round(self.completed / self.wall, 2) if self.wall else 0.0,
+            "latency_s": {
+                f"p{p}": round(percentile(self.latencies, p), 4) for p in (50, 95, 99)
+            },
+            "stages": {
+                name: {
+                    "calls": len(times),
+                    "total_s": round(sum(times), 3),
+                    "p50_s": round(percentile(times, 50), 4),
+                    "p95_s": round(percentile(times, 95), 4),
+                }
+                for name, times in sorted(self.stages.items())
+            },
+        }
+
+
+async def drive(
+    ingest_url: str | list[str],
+    strategy_url: str | list[str],
+    episodes: int,
+    rate: float,
+    per_feed: int,
+    adaptive: bool = False,
+    compress_threshold: int | None = None,
+    balance: str = "least_outstanding",
+) -> LoadReport:
+    """Start one synthetic feed every ``per_feed / rate`` seconds."""
+    stages: dict[str, list[float]] = {}
+    session = UrllibSession()
+    ingest = _TimedClient(IngestAgentClient(ingest_url, session=session, balance=balance), stages)
+    strategy = _TimedClient(
+        StrategyAgentClient(
+            strategy_url, session=session, compress_threshold=compress_threshold, balance=balance
+        ),
+        stages,
+    )
+    bus = EventBus()
+    started: dict[str, float] = {}
+    latencies: list[float] = []
+    bus.on("analyzed", lambda url, summary: latencies.append(time.perf_counter() - started[url.rsplit("/", 1)[0]]))
+    orch = PipelineOrchestrator(ingest, strategy, bus=bus, adaptive=adaptive)
+
+    feeds = max(1, -(-episodes // per_feed))
+    interval = per_feed / rate if rate else 0.0
+    begin = time.perf_counter()
+    runs = []
+    for i in range(feeds):
+        feed = f"loadtest://feed{i}"
+        started[feed] = time.perf_counter()
+        limit = min(per_feed, episodes - i * per_feed)
+        runs.append(asyncio.create_task(orch.run(feed, limit=limit, parallel=True)))
+        if i < feeds - 1:
+            await asyncio.sleep(max(0.0, begin + (i + 1) * interval - time.perf_counter()))
+    results = await asyncio.gather(*runs)
+    wall = time.perf_counter() - begin
+    completed = sum(len(r) for r in results)
+    return LoadReport(episodes, completed, wall, latencies, stages)
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py loadtest``."""
+    parser = argparse.ArgumentParser(
+        prog="cli.py loadtest",
+        description="Drive the orchestrator against local fake agents",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=20.0, help="episodes per second")
+    parser.add_argument("--per-feed", type=int, default=10, help="episodes per synthetic feed")
+    parser.add_argument("--discover-latency", default="const:0.01")
+    parser.add_argument("--transcribe-latency", default="lognormal:0.2,0.5")
+    parser.add_argument("--analyze-latency", default="lognormal:0.1,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--transcript-bytes", type=int, default=50_000)
+    parser.add_argument("--summary-bytes", type=int, default=2_000)
+    parser.add_argument("--adaptive", action="store_true", help="enable AIMD concurrency limits")
+    parser.add_argument(
+        "--compress-threshold", type=int, default=None, help="gzip strategy request bodies of at least N bytes"
+    )
+    parser.add_argument("--replicas", type=int, default=1, help="fake replicas per agent (load balanced)")
+    parser.add_argument("--balance", choices=POLICIES, default="least_outstanding")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    ingest_routes = {
+        "discover": AgentProfile(parse_latency(args.discover_latency)),
+        "transcribe": AgentProfile(
+            parse_latency(args.transcribe_latency), args.error_rate, args.transcript_bytes
+        ),
+    }
+    strategy_routes = {
+        "analyze": AgentProfile(parse_latency(args.analyze_latency), args.error_rate, args.summary_bytes),
+        "score": AgentProfile(parse_latency(args.analyze_latency), args.error_rate),
+    }
+    with contextlib.ExitStack() as stack:
+        ingest = [
+            stack.enter_context(FakeAgentServer(ingest_routes, args.per_feed)).url for _ in range(args.replicas)
+        ]
+        strategy = [stack.enter_context(FakeAgentServer(strategy_routes)).url for _ in range(args.replicas)]
+        report = asyncio.run(
+            drive(
+                ingest,
+                strategy,
+                args.episodes,
+                args.rate,
+                args.per_feed,
+                args.adaptive,
+                args.compress_threshold,
+                args.balance,
+            )
+        )
+    print(json.dumps(report.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
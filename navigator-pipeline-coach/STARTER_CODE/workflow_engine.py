@@ -5,8 +5,9 @@ Demonstrates advanced workflow orchestration with parallel execution.
 """
 
 import asyncio
+import time
 import uuid
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -24,6 +25,15 @@ class Task:
     inputs: Dict[str, Any]
     status: TaskStatus = TaskStatus.PENDING
     outputs: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
 
 @dataclass
 class WorkflowStage:
@@ -38,6 +48,7 @@ class Pipeline:
     name: str
     stages: List[WorkflowStage] = field(default_factory=list)
     status: TaskStatus = TaskStatus.PENDING
+    tasks: Dict[str, Task] = field(default_factory=dict)  # DAG tasks by id
 
 class AgentSimulator:
     """Simulates agent calls for demonstration."""
@@ -112,6 +123,108 @@ class WorkflowEngine:
         stage.tasks.append(task)
         return task
     
+    def add_dag_task(self, pipeline: Pipeline, task_name: str, agent: str,
+                     inputs: Dict[str, Any], depends_on: Optional[List[Task]] = None) -> Task:
+        """Add a DAG task that runs once every task in ``depends_on`` is done."""
+        if agent not in self.agents:
+            raise ValueError(f"Unknown agent: {agent}")
+        deps = [t.id for t in (depends_on or [])]
+        missing = [d for d in deps if d not in pipeline.tasks]
+        if missing:
+            raise ValueError(f"Unknown dependencies for {task_name}: {missing}")
+        task = Task(id=str(uuid.uuid4()), name=task_name, agent=agent,
+                    inputs=inputs, depends_on=deps)
+        pipeline.tasks[task.id] = task
+        return task
+    
+    @staticmethod
+    def critical_path(pipeline: Pipeline) -> List[Task]:
+        """Longest chain of dependent tasks by measured duration."""
+        finish: Dict[str, float] = {}
+        prev: Dict[str, Optional[str]] = {}
+        
+        def visit(task_id: str) -> float:
+            if task_id not in finish:
+                task = pipeline.tasks[task_id]
+                best = max(task.depends_on, key=visit, default=None)
+                prev[task_id] = best
+                finish[task_id] = (visit(best) if best else 0.0) + task.duration
+            return finish[task_id]
+        
+        if not pipeline.tasks:
+            return []
+        node: Optional[str] = max(pipeline.tasks, key=visit)
+        path = []
+        while node:
+            path.append(pipeline.tasks[node])
+            node = prev[node]
+        return list(reversed(path))
+    
+    async def execute_dag(self, pipeline: Pipeline, inputs: Dict[str, Any],
+                          concurrency: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Execute ``pipeline.tasks``, starting each task as soon as its inputs are ready.
+        
+        ``concurrency`` caps in-flight calls per agent (unlimited if absent).
+        Each task receives the outputs of its dependencies under
+        ``"upstream"`` keyed by task name.  When a task fails, everything
+        downstream of it is marked failed without running.
+        """
+        print(f"🚀 Starting DAG pipeline: {pipeline.name}")
+        pipeline.status = TaskStatus.RUNNING
+        tasks = pipeline.tasks
+        limits = {
+            agent: asyncio.Semaphore(n) for agent, n in (concurrency or {}).items()
+        }
+        done: Dict[str, asyncio.Event] = {tid: asyncio.Event() for tid in tasks}
+        
+        async def run(task: Task) -> None:
+            try:
+                for dep in task.depends_on:
+                    await done[dep].wait()
+                if any(tasks[d].status != TaskStatus.COMPLETED for d in task.depends_on):
+                    task.status = TaskStatus.FAILED
+                    return
+                upstream = {tasks[d].name: tasks[d].outputs for d in task.depends_on}
+                limit = limits.get(task.agent)
+                if limit:
+                    await limit.acquire()
+                try:
+                    print(f"  🔄 Executing task: {task.name}")
+                    task.status = TaskStatus.RUNNING
+                    task.started = time.monotonic()
+                    task.outputs = await self.agents[task.agent].call(
+                        task.name, {**inputs, **task.inputs, "upstream": upstream})
+                    task.status = TaskStatus.COMPLETED
+                except Exception as e:
+                    task.status = TaskStatus.FAILED
+                    task.outputs = {"error": str(e)}
+                finally:
+                    task.finished = time.monotonic()
+                    if limit:
+                        limit.release()
+            finally:
+                done[task.id].set()
+        
+        start = time.monotonic()
+        await asyncio.gather(*(run(t) for t in tasks.values()))
+        wall = time.monotonic() - start
+        
+        failed = [t.name for t in tasks.values() if t.status == TaskStatus.FAILED]
+        pipeline.status = TaskStatus.FAILED if failed else TaskStatus.COMPLETED
+        path = self.critical_path(pipeline)
+        print(f"🎉 DAG pipeline finished: {pipeline.name} ({wall:.2f}s, "
+              f"critical path {sum(t.duration for t in path):.2f}s)")
+        
+        return {
+            "pipeline_id": pipeline.id,
+            "status": "failed" if failed else "success",
+            "task_results": {t.name: t.outputs for t in tasks.values()},
+            "failed": failed,
+            "critical_path": [t.name for t in path],
+            "critical_path_seconds": sum(t.duration for t in path),
+            "wall_seconds": wall,
+        }
+    
     async def execute(self, pipeline: Pipeline, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a pipeline with parallel and sequential stages."""
         print(f"🚀 Starting pipeline: {pipeline.name}")
@@ -232,9 +345,29 @@ async def demo_advanced_workflow():
     except Exception as e:
         print(f"❌ Pipeline failed: {e}")
 
+async def demo_dag_workflow():
+    """Demonstrate dependency-driven execution with per-agent limits."""
+    print("\\n🎯 DAG Workflow Demo")
+    print("=" * 30)
+    
+    engine = WorkflowEngine()
+    pipeline = engine.create_pipeline("dag_analysis")
+    
+    discovery = engine.add_dag_task(pipeline, "rss_discovery", "ingest", {"sources": 5})
+    trends = engine.add_dag_task(pipeline, "trend_monitoring", "strategy", {"timeframe": "7d"})
+    transcripts = engine.add_dag_task(pipeline, "transcription", "ingest", {}, depends_on=[discovery])
+    alignment = engine.add_dag_task(pipeline, "goal_alignment", "strategy", {}, depends_on=[transcripts, trends])
+    insights = engine.add_dag_task(pipeline, "insight_extraction", "strategy", {}, depends_on=[transcripts])
+    engine.add_dag_task(pipeline, "dashboard_update", "ui", {}, depends_on=[alignment, insights])
+    
+    results = await engine.execute_dag(pipeline, {"user_goal": "AI trends"}, concurrency={"strategy": 2})
+    print(f"\\n🧭 Critical path: {' → '.join(results['critical_path'])}")
+    print(f"⏱️  {results['wall_seconds']:.2f}s wall vs {results['critical_path_seconds']:.2f}s critical path")
+
 if __name__ == "__main__":
     async def main():
         await demo_basic_workflow()
         await demo_advanced_workflow()
+        await demo_dag_workflow()
     
     asyncio.run(main()) 
\ No newline at end of file
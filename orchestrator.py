@@ -1,8 +1,26 @@
 import asyncio
-from collections.abc import Awaitable, Callable
-from typing import Any, Optional
+import contextlib
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Optional
 
+import deadline
+import lanes
+import tracing
 from agent_client import IngestAgentClient, StrategyAgentClient
+from backfill import resume_after, windows
+from concurrency import AIMDLimiter
+from ranking import TopK
+from rss_parser import Episode
+
+if TYPE_CHECKING:
+    from backfill import Checkpoint
+    from dedup import DuplicateIndex
+    from lanes import LaneDispatcher
+    from relevance import RelevanceFilter
+    from sinks import Sink
+    from workqueue import Lease, WorkQueue
 
 
 class EventBus:
@@ -29,8 +47,70 @@ async def run_parallel(tasks: list[Callable[[], Awaitable[None]]]) -> None:
     await asyncio.gather(*(run_task(t) for t in tasks))
 
 
+class _PrefilterBatch:
+    """Episodes of one prefilter batch, which are selected together.
+
+    Each episode reports its transcript (or ``None`` if it has none) with
+    :meth:`arrive`, then waits on ``selected`` for the URLs the prefilter
+    kept.  In sequential runs an episode starts transcribing only once the
+    previous one has arrived, and analyses take turns on ``analyzing``.
+    """
+
+    def __init__(self, urls: list[str], sequential: bool) -> None:
+        self.urls = urls
+        self.sequential = sequential
+        self.texts: dict[str, Optional[str]] = {}
+        self._arrived = {url: asyncio.Event() for url in urls}
+        self.selected: asyncio.Future[set[str]] = asyncio.get_running_loop().create_future()
+        self.analyzing: Any = asyncio.Lock() if sequential else contextlib.nullcontext()
+        self.selecting: Optional[asyncio.Task[None]] = None
+
+    async def turn(self, url: str) -> None:
+        i = self.urls.index(url)
+        if self.sequential and i:
+            await self._arrived[self.urls[i - 1]].wait()
+
+    def arrive(self, url: str, text: Optional[str]) -> bool:
+        """Record ``url``'s transcript; ``True`` once every episode arrived."""
+        if url in self.texts:
+            return False
+        self.texts[url] = text
+        self._arrived[url].set()
+        return len(self.texts) == len(self.urls)
+
+
 class PipelineOrchestrator:
-    """Coordinate ingest and strategy agents for end-to-end execution."""
+    """Coordinate ingest and strategy agents for end-to-end execution.
+
+    ``run_deadline`` and ``episode_deadline`` (seconds) bound a whole run
+    and each episode.  Every agent call's HTTP timeout is bounded by the
+    budget left, and episodes still running when it expires are cancelled
+    and reported with a ``deadline_exceeded`` event.
+
+    ``prefilter`` (a :class:`~relevance.RelevanceFilter`) scores transcripts
+    locally so irrelevant ones never reach the strategy agent; episodes are
+    transcribed and filtered ``prefilter_batch`` at a time, each episode
+    still under one deadline from transcription to analysis.  ``dedup``
+    (a :class:`~dedup.DuplicateIndex`) links near-duplicate transcripts to
+    the summary of the one already analyzed, emitting ``duplicate``.
+
+    ``dispatchers`` maps an agent name to a :class:`~lanes.LaneDispatcher`;
+    calls then take a slot on the caller's lane (see :func:`lanes.use`),
+    so :meth:`process` stays responsive while bulk runs saturate an agent.
+    With ``adaptive=True`` the dispatcher also enforces the agent's AIMD
+    limit, so calls held back by it still queue by lane.
+
+    With ``goals`` each transcript is analyzed once per goal and a result's
+    ``summary`` is a ``{goal: summary}`` mapping.  The per-goal calls run
+    concurrently; ``batch_goals=True`` sends them as one ``analyze_goals``
+    request so the transcript crosses the network once.  Cached results
+    and dedup matches are only reused for the same goal set.
+
+    Results carry the episode ``key`` (see :attr:`rss_parser.Episode.key`).
+    With ``score_results=True`` every analyzed transcript is also scored by
+    the strategy agent and the result keeps the ``score``, so stored
+    results can be ranked (see :meth:`results_store.ResultsStore.top`).
+    """
 
     def __init__(
         self,
@@ -38,49 +118,474 @@ class PipelineOrchestrator:
         strategy: StrategyAgentClient,
         retries: int = 1,
         bus: EventBus | None = None,
+        cache: MutableMapping[str, dict[str, Any]] | None = None,
+        adaptive: bool = False,
+        run_deadline: float | None = None,
+        episode_deadline: float | None = None,
+        prefilter: "RelevanceFilter | None" = None,
+        prefilter_batch: int = 16,
+        dedup: "DuplicateIndex | None" = None,
+        dispatchers: "Mapping[str, LaneDispatcher] | None" = None,
+        goals: Iterable[str] | None = None,
+        batch_goals: bool = False,
+        score_results: bool = False,
     ) -> None:
         self.ingest = ingest
         self.strategy = strategy
         self.retries = retries
         self.bus = bus or EventBus()
+        self.cache = cache
+        self.run_deadline = None if run_deadline is None else float(run_deadline)
+        self.episode_deadline = None if episode_deadline is None else float(episode_deadline)
+        self.prefilter = prefilter
+        self.prefilter_batch = prefilter_batch
+        self.dedup = dedup
+        self.dispatchers = dict(dispatchers or {})
+        self.goals = list(dict.fromkeys([goals] if isinstance(goals, str) else goals or ()))
+        self.batch_goals = batch_goals
+        self.score_results = score_results
+        self.limiters: dict[str, AIMDLimiter] = {}
+        if adaptive:
+            self.limiters = {
+                agent: AIMDLimiter(agent, bus=self.bus) for agent in ("ingest", "strategy")
+            }
+        for agent, limiter in self.limiters.items():
+            if agent in self.dispatchers:
+                self.dispatchers[agent].limit_by(lambda limiter=limiter: limiter.limit)
 
     # ----------------------------------------------------------
-    def _call_with_retry(self, func: Callable[..., Any], *args: Any) -> Optional[Any]:
-        for attempt in range(self.retries + 1):
-            try:
-                return func(*args)
-            except Exception:  # pragma: no cover - external call failure
-                if attempt >= self.retries:
-                    return None
+    def _attempt(self, func: Callable[..., Any], attempt: int, *args: Any) -> tuple[bool, Optional[Any]]:
+        try:
+            with tracing.span("attempt", attempt=attempt + 1):
+                return True, func(*args)
+        except Exception:  # pragma: no cover - external call failure
+            return False, None
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, agent: str, kind: str = "") -> AsyncIterator[dict]:
+        """Hold ``agent``'s lane slot and AIMD slot for one attempt."""
+        dispatcher = self.dispatchers.get(agent)
+        limiter = self.limiters.get(agent)
+        async with dispatcher.slot() if dispatcher else contextlib.nullcontext():
+            if limiter is None:
+                yield {"ok": True}
+                return
+            # a dispatcher already admitted the call under the limiter's limit
+            async with limiter.slot(wait=dispatcher is None, kind=kind) as outcome:
+                yield outcome
+
+    async def _call(self, agent: str, func: Callable[..., Any], *args: Any) -> Optional[Any]:
+        """Run a blocking agent call off the event loop.
+
+        Each attempt waits for a slot on the current lane (with a lane
+        dispatcher for ``agent``) and for the agent's :class:`AIMDLimiter`
+        (with ``adaptive=True``), and gives both back before a retry.  The
+        limiter judges latency against earlier calls of the same function.
+        A ``None`` result counts as a failure.
+        """
+        name = getattr(func, "__name__", "call")
+        with tracing.span(f"{agent}.{name}", lane=lanes.current()) as sp:
+            for attempt in range(self.retries + 1):
+                async with self._slot(agent, name) as outcome:
+                    ok, result = await asyncio.to_thread(self._attempt, func, attempt, *args)
+                    outcome["ok"] = result is not None
+                left = deadline.remaining()
+                if ok or (left is not None and left <= 0):
+                    break
+            if sp is not None and result is None:
+                sp.status = "failed"
+            return result
 
     # ----------------------------------------------------------
-    async def _process_url(self, url: str) -> Optional[dict[str, Any]]:
-        transcript = self._call_with_retry(self.ingest.transcribe, url)
+    async def _process_url(
+        self,
+        url: str,
+        until: float | None = None,
+        gate: Callable[[str, str], Awaitable[Optional[float]]] | None = None,
+    ) -> Optional[dict[str, Any]]:
+        """Process one episode, giving up at ``until`` or the episode deadline.
+
+        ``gate(url, transcript)`` runs between transcription and analysis;
+        it returns the episode's score, or ``None`` to skip the analysis.
+        The score is kept in the result (and so in the cache).
+        """
+        if self.cache is not None and self._cache_key(url) in self.cache:
+            cached = self.cache[self._cache_key(url)]
+            if (gate is None and not self.score_results) or cached.get("score") is not None:
+                return cached
+        return await self._episode(url, until, self._process_episode, url, gate)
+
+    async def _episode(
+        self, url: str, until: float | None, step: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Any:
+        """Run ``step`` as a traced episode under its deadline; ``None`` on failure."""
+        with tracing.span("episode", root=True, url=url) as sp:
+            try:
+                async with deadline.scope(deadline.earliest(until, deadline.after(self.episode_deadline))):
+                    result = await step(*args)
+            except (TimeoutError, asyncio.TimeoutError):
+                if sp is not None:
+                    sp.status = "deadline"
+                self.bus.emit("deadline_exceeded", url=url)
+                return None
+            if sp is not None and result is None:
+                sp.status = "failed"
+            return result
+
+    async def _discover(self, feed_url: str, until: float | None) -> Optional[list[str]]:
+        """Discover ``feed_url`` under ``until``; ``None`` if the deadline passed."""
+        try:
+            with tracing.span("discover", root=True, feed_url=feed_url):
+                async with deadline.scope(until):
+                    urls = await self._call("ingest", self.ingest.discover, feed_url) or []
+        except (TimeoutError, asyncio.TimeoutError):
+            self.bus.emit("deadline_exceeded", url=feed_url)
+            return None
+        self.bus.emit("discovered", urls=urls)
+        return urls
+
+    async def _process_episode(
+        self, url: str, gate: Callable[[str, str], Awaitable[Optional[float]]] | None = None
+    ) -> Optional[dict[str, Any]]:
+        transcript = await self._transcribe(url)
         if not transcript:
             return None
-        self.bus.emit("transcribed", url=url, text=transcript)
-        summary = self._call_with_retry(self.strategy.analyze, transcript)
+        score = None
+        if gate is not None:
+            score = await gate(url, transcript)
+            if score is None:
+                return None
+        return await self._analyze(url, transcript, score)
+
+    async def _transcribe(self, url: str) -> Optional[str]:
+        transcript = await self._call("ingest", self.ingest.transcribe, url)
+        if transcript:
+            self.bus.emit("transcribed", url=url, text=transcript)
+        return transcript
+
+    async def _analyze(
+        self, url: str, transcript: str, score: float | None = None
+    ) -> Optional[dict[str, Any]]:
+        if score is None and self.score_results:
+            score = await self._call("strategy", self.strategy.score, transcript)
+            if score is not None:
+                self.bus.emit("scored", url=url, score=score)
+        result: dict[str, Any] = {"url": url, "key": Episode(url).key}
+        if score is not None:
+            result["score"] = score
+        sig = None
+        if self.dedup is not None:
+            sig = await asyncio.to_thread(self.dedup.signature, transcript)
+            match = await asyncio.to_thread(self.dedup.find, sig, self.goals)
+            if match is not None and match[0] != url:
+                key, similarity, summary = match
+                self.bus.emit("duplicate", url=url, of=key, similarity=similarity)
+                return {**result, "summary": summary, "duplicate_of": key}
+        summary = await self._summarize(transcript)
         if summary is None:
             return None
         self.bus.emit("analyzed", url=url, summary=summary)
-        return {"url": url, "summary": summary}
+        if sig is not None:
+            # only analyzed transcripts are indexed, so matches always carry a summary
+            await asyncio.to_thread(self.dedup.add, url, sig, summary, self.goals)
+        result["summary"] = summary
+        if self.cache is not None:
+            self.cache[self._cache_key(url)] = result
+        return result
+
+    def _cache_key(self, url: str) -> str:
+        # a summary only answers the goals it was produced for
+        return f"{url}#goals={json.dumps(sorted(self.goals))}" if self.goals else url
+
+    async def _summarize(self, transcript: str) -> Any:
+        if not self.goals:
+            return await self._call("strategy", self.strategy.analyze, transcript)
+        if self.batch_goals:
+            return await self._call("strategy", self.strategy.analyze_goals, transcript, self.goals) or None
+        summaries = await asyncio.gather(
+            *(self._call("strategy", self.strategy.analyze, transcript, goal) for goal in self.goals)
+        )
+        done = {goal: summary for goal, summary in zip(self.goals, summaries) if summary is not None}
+        return done or None
+
+    async def _prefiltered(
+        self, url: str, until: float | None, batch: _PrefilterBatch
+    ) -> Optional[dict[str, Any]]:
+        """Process ``url`` as one episode of ``batch``, gated by the prefilter."""
+        try:
+            await batch.turn(url)
+            return await self._episode(url, until, self._prefiltered_episode, url, batch)
+        finally:
+            # episodes that failed or ran out of time must not hold up the batch
+            self._arrive(batch, url, None)
+
+    async def _prefiltered_episode(self, url: str, batch: _PrefilterBatch) -> Optional[dict[str, Any]]:
+        transcript = await self._transcribe(url)
+        self._arrive(batch, url, transcript)
+        # shielded: an episode giving up must not cancel the batch's selection
+        if not transcript or url not in await asyncio.shield(batch.selected):
+            return None
+        async with batch.analyzing:
+            return await self._analyze(url, transcript)
+
+    def _arrive(self, batch: _PrefilterBatch, url: str, text: Optional[str]) -> None:
+        if batch.arrive(url, text):
+            batch.selecting = asyncio.ensure_future(self._select(batch))
+
+    async def _select(self, batch: _PrefilterBatch) -> None:
+        """Run the prefilter over ``batch``'s transcripts and publish the kept URLs."""
+        transcribed = [(url, batch.texts[url]) for url in batch.urls if batch.texts[url]]
+        try:
+            keep, scores = await asyncio.to_thread(self.prefilter.select, [text for _, text in transcribed])
+        except Exception as e:
+            batch.selected.set_exception(e)
+            return
+        kept = set(keep)
+        for i, (url, _) in enumerate(transcribed):
+            if i not in kept:
+                self.bus.emit("filtered", url=url, score=scores[i])
+        batch.selected.set_result({transcribed[i][0] for i in keep})
+
+    async def process(self, url: str, lane: str = lanes.INTERACTIVE) -> Optional[dict[str, Any]]:
+        """Transcribe and analyze a single episode on ``lane``."""
+        with lanes.use(lane):
+            return await self._process_url(url, deadline.after(self.run_deadline))
 
     # ----------------------------------------------------------
-    async def run(self, feed_url: str, limit: int = 10, parallel: bool = False) -> list[dict[str, Any]]:
-        urls = self._call_with_retry(self.ingest.discover, feed_url) or []
-        self.bus.emit("discovered", urls=urls)
-        results: list[dict[str, Any]] = []
+    async def run_iter(
+        self,
+        feed_url: str,
+        limit: int = 10,
+        parallel: bool = False,
+        sink: "Sink | None" = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield each result as soon as it is ready (completion order).
 
-        async def handler(url: str) -> None:
-            res = await self._process_url(url)
-            if res:
-                results.append(res)
+        Results are also written to ``sink`` when given.  Closing the
+        generator early cancels episodes that are still in flight.
 
-        tasks = [lambda u=u: handler(u) for u in urls[:limit]]
-        if parallel:
-            await run_parallel(tasks)
-        else:
-            await run_sequential(tasks)
+        With a ``prefilter`` episodes are transcribed ``prefilter_batch``
+        at a time and only the transcripts it selects are sent for
+        analysis; the rest are reported with a ``filtered`` event.  Results
+        of a batch are yielded before the next batch is transcribed, so at
+        most one batch of transcripts is held.
+        """
+        until = deadline.after(self.run_deadline)
+        urls = await self._discover(feed_url, until)
+        if urls is None:
+            return
+        urls = urls[:limit]
+        async for jobs in self._job_batches(urls, until, parallel):
+            # a prefilter batch's episodes wait on each other, so they run
+            # together; _PrefilterBatch keeps sequential runs in turn
+            async for res in self._drain(jobs, parallel or self.prefilter is not None):
+                if sink is not None:
+                    sink.write(res)
+                yield res
 
+    async def _job_batches(
+        self, urls: list[str], until: float | None, parallel: bool
+    ) -> AsyncIterator[list[Callable[[], Awaitable[Optional[dict[str, Any]]]]]]:
+        if self.prefilter is None:
+            yield [lambda u=url: self._process_url(u, until) for url in urls]
+            return
+        for start in range(0, len(urls), self.prefilter_batch):
+            chunk = urls[start:start + self.prefilter_batch]
+            cached = [url for url in chunk if self.cache is not None and self._cache_key(url) in self.cache]
+            fresh = [url for url in chunk if url not in cached]
+            batch = _PrefilterBatch(fresh, sequential=not parallel)
+            yield [lambda u=url: self._process_url(u, until) for url in cached] + [
+                lambda u=url: self._prefiltered(u, until, batch) for url in fresh
+            ]
+
+    async def _drain(
+        self, jobs: list[Callable[[], Awaitable[Optional[dict[str, Any]]]]], parallel: bool
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Run ``jobs`` and yield their results; closing early cancels the rest."""
+        if not parallel:
+            for job in jobs:
+                res = await job()
+                if res:
+                    yield res
+            return
+        pending = [asyncio.ensure_future(job()) for job in jobs]
+        try:
+            for fut in asyncio.as_completed(pending):
+                res = await fut
+                if res:
+                    yield res
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    # ----------------------------------------------------------
+    async def run(
+        self,
+        feed_url: str,
+        limit: int = 10,
+        parallel: bool = False,
+        sink: "Sink | None" = None,
+    ) -> list[dict[str, Any]]:
+        results = [res async for res in self.run_iter(feed_url, limit, parallel, sink)]
         self.bus.emit("completed", results=results)
         return results
+
+    # ----------------------------------------------------------
+    async def rank(
+        self,
+        feed_urls: Iterable[str],
+        k: int = 10,
+        limit: int = 10,
+        parallel: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Return the ``k`` best-scoring episodes across ``feed_urls``.
+
+        Each transcript is scored first and only analyzed if it can still
+        enter the top K; everything else is dropped as soon as it is scored.
+        Episodes go through the same path as :meth:`run` (cache, deadlines,
+        dedup, tracing); ``run_deadline`` bounds the whole ranking.
+        """
+        top = TopK(k)
+        until = deadline.after(self.run_deadline)
+
+        async def gate(url: str, transcript: str) -> Optional[float]:
+            score = await self._call("strategy", self.strategy.score, transcript)
+            if score is None:
+                return None
+            self.bus.emit("scored", url=url, score=score)
+            return score if top.would_accept(score) else None
+
+        async def handler(feed_url: str, url: str) -> None:
+            res = await self._process_url(url, until, gate=gate)
+            if res and res.get("score") is not None:
+                top.push(res["score"], {"feed": feed_url, **res})
+
+        for feed_url in feed_urls:
+            urls = await self._discover(feed_url, until)
+            if urls is None:
+                break
+            tasks = [lambda f=feed_url, u=u: handler(f, u) for u in urls[:limit]]
+            if parallel:
+                await run_parallel(tasks)
+            else:
+                await run_sequential(tasks)
+
+        results = top.items()
+        self.bus.emit("ranked", results=results)
+        return results
+
+    # ----------------------------------------------------------
+    async def enqueue(self, feed_url: str, queue: "WorkQueue", limit: int = 10) -> int:
+        """Discover ``feed_url`` and put its episodes on a shared queue."""
+        urls = await self._discover(feed_url, deadline.after(self.run_deadline))
+        if urls is None:
+            return 0
+        return await asyncio.to_thread(queue.put, feed_url, urls[:limit])
+
+    async def _heartbeat(self, queue: "WorkQueue", lease: "Lease") -> None:
+        while True:
+            await asyncio.sleep(queue.visibility / 3)
+            if not await asyncio.to_thread(queue.heartbeat, lease):
+                self.bus.emit("lease_lost", url=lease.url)
+                return
+
+    async def work(
+        self,
+        queue: "WorkQueue",
+        worker_id: str,
+        concurrency: int = 1,
+        idle_exit: bool = True,
+        poll: float = 1.0,
+        retry_delay: float = 30.0,
+    ) -> int:
+        """Claim and process queued episodes; return how many were acked.
+
+        The lease is renewed while an episode is processed; failed
+        episodes are handed back after ``retry_delay``.  With
+        ``idle_exit=False`` the worker polls until ``run_deadline`` (if any)
+        has passed; episodes are processed under that deadline too.
+        """
+        done = 0
+        until = deadline.after(self.run_deadline)
+
+        async def worker() -> None:
+            nonlocal done
+            while until is None or time.monotonic() < until:
+                lease = await asyncio.to_thread(queue.claim, worker_id)
+                if lease is None:
+                    if idle_exit:
+                        return
+                    await asyncio.sleep(poll)
+                    continue
+                beat = asyncio.create_task(self._heartbeat(queue, lease))
+                try:
+                    result = await self._process_url(lease.url, until)
+                finally:
+                    beat.cancel()
+                if result and await asyncio.to_thread(queue.ack, lease):
+                    done += 1
+                elif not result:
+                    await asyncio.to_thread(queue.nack, lease, retry_delay)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return done
+
+    # ----------------------------------------------------------
+    async def backfill(
+        self,
+        feed_url: str,
+        episodes: Iterable["Episode"],
+        checkpoint: "Checkpoint",
+        window: int = 50,
+        sink: "Sink | None" = None,
+    ) -> int:
+        """Stream an archive through the pipeline ``window`` episodes at a time.
+
+        ``episodes`` should be lazy (e.g. ``RSSParser.iter_episodes``); at
+        most one window of episodes and results is alive at once.  Progress
+        is checkpointed after every window and a rerun resumes after the
+        last completed window.  Failed episodes are kept in the checkpoint
+        and retried first on the next run.  Once ``run_deadline`` has
+        passed no further window is started.  Returns the total number of
+        episodes done successfully.
+        """
+        state = checkpoint.get(feed_url)
+        done, last, failed = state["done"], state["last"], dict(state["failed"])
+        until = deadline.after(self.run_deadline)
+        for batch in windows(list(failed.items()), window):
+            if until is not None and time.monotonic() >= until:
+                return done
+            done += await self._backfill_window(feed_url, batch, failed, sink, until)
+            checkpoint.save(feed_url, done, last, failed)
+        for batch in windows(resume_after(episodes, last), window):
+            if until is not None and time.monotonic() >= until:
+                break
+            done += await self._backfill_window(
+                feed_url, [(ep.key, ep.url) for ep in batch], failed, sink, until
+            )
+            last = batch[-1].key
+            checkpoint.save(feed_url, done, last, failed)
+            self.bus.emit("backfill_window", feed_url=feed_url, done=done)
+        return done
+
+    async def _backfill_window(
+        self,
+        feed_url: str,
+        batch: list[tuple[str, str]],
+        failed: dict[str, str],
+        sink: "Sink | None",
+        until: float | None,
+    ) -> int:
+        results = await asyncio.gather(*(self._process_url(url, until) for _, url in batch))
+        ok = 0
+        for (key, url), res in zip(batch, results):
+            if not res:
+                failed[key] = url
+                self.bus.emit("backfill_failed", url=url)
+                continue
+            failed.pop(key, None)
+            ok += 1
+            if sink is not None:
+                sink.write({"feed": feed_url, "url": url, "key": key, "summary": res["summary"]})
+        return ok
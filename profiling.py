@@ -0,0 +1,173 @@
+"""Opt-in profiling for pipeline runs (cProfile, stack sampling, tracemalloc)."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+# Stage entered after each orchestrator event.
+_NEXT_STAGE = {
+    "discovered": "transcribe",
+    "transcribed": "analyze",
+    "analyzed": "transcribe",
+    "completed": "done",
+}
+_ENDED_STAGE = {
+    "discovered": "discover",
+    "transcribed": "transcribe",
+    "analyzed": "analyze",
+    "completed": "transcribe",
+}
+
+
+class RunProfiler:
+    """Profile one pipeline run and write the reports to ``out_dir``.
+
+    * ``profile.prof`` -- cProfile stats of the event-loop thread
+      (load with ``pstats`` or snakeviz).
+    * ``stacks.collapsed`` -- stacks of every thread sampled each
+      ``interval`` seconds, one ``frame;frame;... count`` line per stack,
+      ready for ``flamegraph.pl`` or speedscope.  The first frame is the
+      pipeline stage the sample was taken in.
+    * ``tracemalloc.txt`` -- top ``trace_malloc`` allocation sites overall
+      and per stage (only when ``trace_malloc`` > 0).
+
+    Stages follow the ``discovered``/``transcribed``/``analyzed`` events of
+    the :class:`~orchestrator.EventBus` passed to :meth:`attach`.  With
+    parallel runs stages overlap, so attribution is approximate.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path,
+        cprofile: bool = True,
+        trace_malloc: int = 0,
+        interval: float = 0.005,
+    ) -> None:
+        self.out_dir = Path(out_dir)
+        self.trace_malloc = trace_malloc
+        self.interval = interval
+        self.stage = "discover"
+        self.samples: Counter[str] = Counter()
+        self.stage_allocs: dict[str, Counter[str]] = {}
+        self._profiler = cProfile.Profile() if cprofile else None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    # ----------------------------------------------------------
+    def attach(self, bus: Any) -> "RunProfiler":
+        for event in _NEXT_STAGE:
+            bus.on(event, lambda _event=event, **_: self._on_event(_event))
+        return self
+
+    def _on_event(self, event: str) -> None:
+        if self.trace_malloc:
+            self._attribute_allocations(_ENDED_STAGE[event])
+        self.stage = _NEXT_STAGE[event]
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        # keep the profiler's own bookkeeping out of the report
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, mod.__file__) for mod in (tracemalloc, cProfile, sys.modules[__name__])]
+        )
+
+    def _attribute_allocations(self, stage: str) -> None:
+        snapshot = self._take_snapshot()
+        if self._snapshot is not None:
+            counts = self.stage_allocs.setdefault(stage, Counter())
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[: self.trace_malloc]:
+                if stat.size_diff > 0:
+                    counts[str(stat.traceback)] += stat.size_diff
+        self._snapshot = snapshot
+
+    # ----------------------------------------------------------
+    def _sample(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(self.stage)
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self.trace_malloc:
+            tracemalloc.start()
+            self._snapshot = self._take_snapshot()
+        self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+        if self._profiler:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self._profiler:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.out_dir / "profile.prof")
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        with open(self.out_dir / "stacks.collapsed", "w") as fh:
+            for stack, count in self.samples.most_common():
+                fh.write(f"{stack} {count}\n")
+        if self.trace_malloc:
+            self._write_malloc_report()
+            tracemalloc.stop()
+
+    def _write_malloc_report(self) -> None:
+        n = self.trace_malloc
+        top = self._take_snapshot().statistics("lineno")[:n]
+        lines = [f"Top {n} allocation sites", ""]
+        lines += [str(stat) for stat in top]
+        for stage, counts in sorted(self.stage_allocs.items()):
+            lines += ["", f"Stage {stage}: top {n} growth"]
+            lines += [f"{site}: +{size / 1024:.1f} KiB" for site, size in counts.most_common(n)]
+        (self.out_dir / "tracemalloc.txt").write_text("\n".join(lines) + "\n")
+
+    def __enter__(self) -> "RunProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+@contextlib.contextmanager
+def profile_run(
+    out_dir: str | Path | None,
+    trace_malloc: int = 0,
+    rate: float = 1.0,
+    bus: Any = None,
+) -> Iterator[Optional[RunProfiler]]:
+    """Profile the enclosed run into a fresh ``out_dir/run-*`` directory.
+
+    Nothing is profiled when ``out_dir`` is ``None`` and ``trace_malloc``
+    is 0, or for the ``1 - rate`` fraction of runs that are not sampled, so
+    the hook can stay enabled in production.
+    """
+    if (out_dir is None and not trace_malloc) or random.random() >= rate:
+        yield None
+        return
+    run_dir = Path(out_dir or "profiles") / f"run-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    profiler = RunProfiler(run_dir, cprofile=out_dir is not None, trace_malloc=trace_malloc)
+    if bus is not None:
+        profiler.attach(bus)
+    with profiler:
+        yield profiler
+    print(f"Profile written to {run_dir}", file=sys.stderr)
@@ -0,0 +1,43 @@
+"""Bounded top-K ranking of scored pipeline results."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any
+
+
+class TopK:
+    """Keep the ``k`` highest-scoring items using a min-heap.
+
+    Memory is O(k) no matter how many items are offered; an item that
+    cannot make the cut is rejected without being stored.
+    """
+
+    def __init__(self, k: int) -> None:
+        if k < 1:
+            raise ValueError("k must be positive")
+        self.k = k
+        self._heap: list[tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def would_accept(self, score: float) -> bool:
+        return len(self._heap) < self.k or score > self._heap[0][0]
+
+    def push(self, score: float, item: Any) -> bool:
+        """Offer ``item``; return ``True`` if it is now in the top K."""
+        if not self.would_accept(score):
+            return False
+        entry = (score, next(self._seq), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+        return True
+
+    def items(self) -> list[Any]:
+        """Return the retained items, highest score first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
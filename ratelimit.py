@@ -0,0 +1,118 @@
+"""Process-wide token-bucket rate limits keyed by host."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import lanes
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    Callers reserve tokens up front and then sleep for the deficit, so
+    concurrent threads and tasks are admitted in arrival order at exactly
+    ``rate`` once the ``burst`` allowance is spent.  Blocking callers with
+    ``priority`` queue ahead of the others, so an interactive request is
+    not paced behind a backlog of bulk ones.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+        self._turn = threading.Condition(self._lock)
+        self._waiting: tuple[deque, deque] = (deque(), deque())
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take ``tokens`` and return how long the caller must wait."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1, priority: bool = False) -> None:
+        ticket = object()
+        queue = self._waiting[0 if priority else 1]
+        with self._turn:
+            queue.append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    head = self._waiting[0] or self._waiting[1]
+                    if head[0] is not ticket:
+                        self._turn.wait()
+                    elif self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return
+                    else:
+                        self._turn.wait((tokens - self._tokens) / self.rate)
+            finally:
+                queue.remove(ticket)
+                self._turn.notify_all()
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def _host(url_or_host: str) -> str:
+    return urlparse(url_or_host).netloc or url_or_host
+
+
+def configure(url_or_host: str, rate: float, burst: float | None = None) -> TokenBucket:
+    """Install (or replace) the bucket shared by every client of a host."""
+    bucket = TokenBucket(rate, burst)
+    with _lock:
+        _buckets[_host(url_or_host)] = bucket
+    return bucket
+
+
+def configure_from(limits: dict[str, Any]) -> None:
+    """Configure buckets from ``{host: {"rate": r, "burst": b}}`` config."""
+    for host, spec in (limits or {}).items():
+        configure(host, float(spec["rate"]), spec.get("burst"))
+
+
+def reset() -> None:
+    with _lock:
+        _buckets.clear()
+
+
+def bucket_for(url: str) -> Optional[TokenBucket]:
+    return _buckets.get(_host(url))
+
+
+def acquire(url: str) -> None:
+    """Block until a request to ``url``'s host is allowed (no-op if unlimited).
+
+    Requests made on the interactive lane (see :func:`lanes.use`) go first.
+    """
+    bucket = bucket_for(url)
+    if bucket is not None:
+        bucket.acquire(priority=lanes.current() == lanes.INTERACTIVE)
+
+
+async def acquire_async(url: str) -> None:
+    bucket = bucket_for(url)
+    if bucket is not None:
+        await bucket.acquire_async()
@@ -0,0 +1,123 @@
+"""Local BM25 relevance prefilter run before remote strategy analysis."""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Optional, Sequence
+
+from transcript_index import tokenize
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dep
+    np = None
+
+
+class RelevanceFilter:
+    """Score transcripts against ``goal`` with BM25 and keep the relevant ones.
+
+    Document frequencies and the average length come from every
+    transcript passed to :meth:`select` so far plus the batch being
+    scored, so a fixed ``threshold`` means the same thing from one batch
+    to the next instead of depending on which transcripts share a batch.
+    With NumPy installed the scoring is vectorized over the batch;
+    otherwise a pure-Python loop computes the same numbers.
+
+    Transcripts scoring above ``threshold`` are kept (the default 0 drops
+    those sharing no term with the goal); ``top_n`` further keeps only the
+    best N of those in each batch.
+    """
+
+    def __init__(
+        self,
+        goal: str,
+        threshold: float = 0.0,
+        top_n: int | None = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.terms = list(dict.fromkeys(tokenize(goal)))
+        if not self.terms:
+            raise ValueError("goal has no searchable terms")
+        self.threshold = threshold
+        self.top_n = top_n
+        self.k1 = k1
+        self.b = b
+        self.docs = 0
+        self.total_length = 0
+        self.df = [0] * len(self.terms)
+
+    # ----------------------------------------------------------
+    def _term_counts(self, texts: Sequence[str]) -> tuple[list[list[int]], list[int]]:
+        rows, lengths = [], []
+        for text in texts:
+            tokens = tokenize(text)
+            counts = Counter(tokens)
+            rows.append([counts[t] for t in self.terms])
+            lengths.append(len(tokens))
+        return rows, lengths
+
+    def scores(self, texts: Sequence[str]) -> list[float]:
+        """BM25 score of each text against the goal (the corpus is not updated)."""
+        if not texts:
+            return []
+        return self._score_rows(*self._term_counts(texts))
+
+    def _score_rows(self, rows: list[list[int]], lengths: list[int]) -> list[float]:
+        n = self.docs + len(rows)
+        avg = max((self.total_length + sum(lengths)) / n, 1.0)
+        idf = [
+            math.log((n - df + 0.5) / (df + 0.5) + 1.0)
+            for df in (self.df[j] + sum(1 for row in rows if row[j]) for j in range(len(self.terms)))
+        ]
+        if np is not None:
+            return self._scores_numpy(rows, lengths, idf, avg)
+        return self._scores_python(rows, lengths, idf, avg)
+
+    def _scores_numpy(self, rows: list[list[int]], lengths: list[int], idf: list[float], avg: float) -> list[float]:
+        tf = np.asarray(rows, dtype=np.float64)
+        length = np.asarray(lengths, dtype=np.float64)
+        norm = self.k1 * (1 - self.b + self.b * length / avg)
+        scores = (np.asarray(idf) * tf * (self.k1 + 1) / (tf + norm[:, None])).sum(axis=1)
+        return scores.tolist()
+
+    def _scores_python(self, rows: list[list[int]], lengths: list[int], idf: list[float], avg: float) -> list[float]:
+        scores = []
+        for row, length in zip(rows, lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / avg)
+            scores.append(sum(w * tf * (self.k1 + 1) / (tf + norm) for w, tf in zip(idf, row)))
+        return scores
+
+    # ----------------------------------------------------------
+    def select(self, texts: Sequence[str]) -> tuple[list[int], list[float]]:
+        """Indices of the texts to keep (in input order) and every score.
+
+        The texts are then added to the corpus statistics.
+        """
+        if not texts:
+            return [], []
+        rows, lengths = self._term_counts(texts)
+        scores = self._score_rows(rows, lengths)
+        self.docs += len(rows)
+        self.total_length += sum(lengths)
+        for j in range(len(self.terms)):
+            self.df[j] += sum(1 for row in rows if row[j])
+        keep = [i for i, s in enumerate(scores) if s > self.threshold]
+        if self.top_n is not None and len(keep) > self.top_n:
+            best = sorted(keep, key=lambda i: scores[i], reverse=True)[: self.top_n]
+            keep = sorted(best)
+        return keep, scores
+
+
+def from_config(cfg: dict) -> Optional[RelevanceFilter]:
+    """Build a filter from the ``goal``/``min_relevance``/``top_n`` config keys."""
+    goal = cfg.get("goal")
+    if not goal:
+        return None
+    top_n = cfg.get("top_n")
+    return RelevanceFilter(
+        goal,
+        threshold=float(cfg.get("min_relevance", 0.0)),
+        top_n=None if top_n is None else int(top_n),
+    )
@@ -0,0 +1,248 @@
+"""Indexed SQLite store of pipeline results for history queries."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    feed TEXT,
+    url TEXT NOT NULL,
+    episode TEXT NOT NULL,
+    score REAL,
+    created REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_feed_created ON results (feed, created);
+CREATE INDEX IF NOT EXISTS results_feed_score ON results (feed, score DESC);
+CREATE INDEX IF NOT EXISTS results_score ON results (score DESC);
+CREATE INDEX IF NOT EXISTS results_created ON results (created);
+CREATE INDEX IF NOT EXISTS results_episode ON results (episode, created);
+"""
+
+# ``results`` tables written by the old ``sinks.SqliteSink`` (url, created,
+# data only) are converted in place; score and episode key come from data.
+_MIGRATE = """
+ALTER TABLE results RENAME TO results_old;
+{schema}
+INSERT INTO results (id, feed, url, episode, score, created, data)
+SELECT id, NULL, COALESCE(url, ''), COALESCE(json_extract(data, '$.key'), url, ''),
+       json_extract(data, '$.score'), COALESCE(created, 0), data
+FROM results_old;
+DROP TABLE results_old;
+"""
+
+DAY = 86400.0
+
+
+class ResultsStore:
+    """Append-only result history in a WAL-mode SQLite database.
+
+    Implements the :class:`~sinks.Sink` interface.  Writes are committed in
+    transactions of ``batch`` results, or at most ``flush_interval`` seconds
+    after a result was buffered, even if nothing else is written, so
+    readers such as the UI agent see results promptly without a commit per
+    row.  Commits run on a writer thread, so
+    :meth:`write` does not block the daemon's event loop; :meth:`flush`
+    waits for them.  WAL mode lets other processes query while a run is
+    writing.
+
+    Results without a ``feed`` key are attributed to the store's ``feed``;
+    use :meth:`for_feed` to get a sink bound to one feed.  ``score`` and
+    the episode ``key`` are taken from the result when present.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        feed: str | None = None,
+        batch: int = 50,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = Path(path)
+        self.feed = feed
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self._rows: list[tuple] = []
+        self._flushed = time.monotonic()
+        self._last: Optional[Future] = None
+        self._timer: Optional[threading.Timer] = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="results-store")
+        self._lock = threading.Lock()  # the connection
+        self._buffer = threading.Lock()  # _rows, _timer; the flush timer runs on its own thread
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if columns and "feed" not in columns:
+            with self._conn:
+                self._conn.executescript(_MIGRATE.format(schema=_SCHEMA))
+        self._conn.executescript(_SCHEMA)
+
+    # ----------------------------------------------------------
+    def write(self, result: dict[str, Any], feed: str | None = None) -> None:
+        url = result.get("url", "")
+        score = result.get("score")
+        row = (
+            result.get("feed") or feed or self.feed,
+            url,
+            result.get("key") or url,
+            None if score is None else float(score),
+            float(result.get("created", time.time())),
+            json.dumps(result),
+        )
+        with self._buffer:
+            self._rows.append(row)
+            if len(self._rows) >= self.batch or time.monotonic() - self._flushed >= self.flush_interval:
+                self._submit()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def for_feed(self, feed: str) -> "FeedSink":
+        return FeedSink(self, feed)
+
+    def _submit(self) -> Future:
+        # callers hold _buffer
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        rows, self._rows = self._rows, []
+        self._flushed = time.monotonic()
+        self._last = self._writer.submit(self._commit, rows)
+        return self._last
+
+    def _flush_due(self) -> None:
+        with self._buffer:
+            # a batch may have been submitted (and the timer cancelled) meanwhile
+            if self._timer is threading.current_thread():
+                self._submit()
+
+    def _commit(self, rows: list[tuple]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO results (feed, url, episode, score, created, data) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def flush(self) -> None:
+        """Commit buffered results and wait until every commit is done."""
+        with self._buffer:
+            last = self._submit()
+        last.result()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.shutdown()
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ----------------------------------------------------------
+    def _query(self, where: list[str], params: list[Any], order: str, limit: int) -> list[dict[str, Any]]:
+        sql = "SELECT feed, score, created, data FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [
+            {**json.loads(data), "feed": feed, "score": score, "created": created}
+            for feed, score, created, data in rows
+        ]
+
+    @staticmethod
+    def _filters(feed: Optional[str], since: Optional[float], until: Optional[float]) -> tuple[list[str], list]:
+        where, params = [], []
+        if feed is not None:
+            where.append("feed = ?")
+            params.append(feed)
+        if since is not None:
+            where.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("created < ?")
+            params.append(until)
+        return where, params
+
+    def top(
+        self,
+        feed: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 10,
+    ) -> list[dict[str, Any]]:
+        """Highest-scored results, optionally for one feed and time range.
+
+        ``top(feed, since=time.time() - 7 * DAY)`` is "this week's best
+        episodes of ``feed``"; unscored results are left out.
+        """
+        where, params = self._filters(feed, since, until)
+        where.append("score IS NOT NULL")
+        return self._query(where, params, "score DESC", limit)
+
+    def recent(
+        self,
+        feed: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Newest results first."""
+        where, params = self._filters(feed, since, until)
+        return self._query(where, params, "created DESC", limit)
+
+    def episode(self, key: str, limit: int = 50) -> list[dict[str, Any]]:
+        """Every stored result for one episode (key or URL), newest first."""
+        return self._query(["episode = ?"], [key], "created DESC", limit)
+
+
+class FeedSink:
+    """A :class:`ResultsStore` sink that attributes results to ``feed``."""
+
+    def __init__(self, store: ResultsStore, feed: str) -> None:
+        self.store = store
+        self.feed = feed
+
+    def write(self, result: dict[str, Any]) -> None:
+        self.store.write(result, self.feed)
+
+    def close(self) -> None:
+        self.store.flush()
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py results``."""
+    parser = argparse.ArgumentParser(prog="cli.py results", description="Query stored pipeline results")
+    parser.add_argument("command", choices=["top", "recent", "episode"])
+    parser.add_argument("key", nargs="?", help="episode key or URL for 'episode'")
+    parser.add_argument("--db", default="results.db")
+    parser.add_argument("--feed", default=None)
+    parser.add_argument("--days", type=float, default=None, help="only the last N days")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.days * DAY if args.days else None
+    with ResultsStore(args.db) as store:
+        if args.command == "top":
+            rows = store.top(args.feed, since, limit=args.limit)
+        elif args.command == "recent":
+            rows = store.recent(args.feed, since, limit=args.limit)
+        else:
+            if not args.key:
+                parser.error("episode needs a key or URL")
+            rows = store.episode(args.key, args.limit)
+    for row in rows:
+        print(json.dumps(row))
@@ -1,5 +1,114 @@
+import io
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from xml.etree import ElementTree as ET
 
+# Analytics redirect prefixes wrapped around the real enclosure host/path.
+_TRACKING_PREFIX = re.compile(
+    r"^(?:"
+    r"(?:dts\.|www\.)?podtrac\.com/(?:pts/)?redirect\.[a-z0-9]+/"
+    r"|(?:chtbl\.com|chrt\.fm)/track/[^/]+/"
+    r"|pdst\.fm/e/"
+    r"|op3\.dev/e/(?:,[^/]*/)?"
+    r"|media\.blubrry\.com/[^/]+/"
+    r"|arttrk\.com/p/[^/]+/"
+    r"|pfx\.vpixl\.com/[^/]+/"
+    r"|verifi\.podscribe\.com/rss/p/"
+    r")",
+    re.IGNORECASE,
+)
+
+
+# Query parameters that only tag or authorize the request (analytics, cache
+# busters, signed-CDN tokens).  Anything else may identify the episode.
+_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "_ga",
+        "aid", "ref", "source", "updated",
+        "token", "expires", "signature", "key-pair-id", "policy", "hdnts", "hdnea",
+    }
+)
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith(("utm_", "x-amz-")) or name in _TRACKING_PARAMS
+
+
+def canonical_url(url: str) -> str:
+    """Strip scheme, fragment, tracking redirects and tracking parameters from ``url``.
+
+    Remaining query parameters are kept (sorted), since some hosts identify
+    the episode by one.
+    """
+    parts = urlsplit(url.strip())
+    rest = (parts.netloc.lower() + parts.path) if parts.netloc else parts.path
+    while True:
+        match = _TRACKING_PREFIX.match(rest)
+        if not match:
+            break
+        rest = rest[match.end():]
+        rest = re.sub(r"^https?://", "", rest, flags=re.IGNORECASE)
+    host, _, path = rest.partition("/")
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k)
+    )
+    canonical = f"{host.lower().removeprefix('www.')}/{path}"
+    return f"{canonical}?{urlencode(params)}" if params else canonical
+
+
+@dataclass(slots=True)
+class Episode:
+    """One ``<item>`` of a feed."""
+
+    url: str
+    guid: str | None = None
+    published: datetime | None = None
+    length: int | None = None
+    feed: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Canonical identity: the GUID if present, else the canonical URL.
+
+        GUIDs are only unique within a feed, so they are scoped by the
+        canonical ``feed`` URL when it is known.
+        """
+        if self.guid:
+            if self.feed:
+                return f"guid:{canonical_url(self.feed)}|{self.guid}"
+            return f"guid:{self.guid}"
+        return f"url:{canonical_url(self.url)}"
+
+
+def as_utc(value: datetime) -> datetime:
+    """``value`` as an aware UTC datetime; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_date(text: str | None) -> datetime | None:
+    # "-0000" (unknown zone) parses as naive; keep every pubDate comparable
+    if not text:
+        return None
+    try:
+        return as_utc(parsedate_to_datetime(text.strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_int(text: str | None) -> int | None:
+    try:
+        return int(text) if text else None
+    except ValueError:
+        return None
+
+
 class RSSParser:
     """Minimal RSS parser extracting enclosure URLs."""
 
@@ -11,3 +120,46 @@ class RSSParser:
             if url:
                 urls.append(url)
         return urls
+
+    def extract_episodes(self, xml_content: str, feed_url: str | None = None) -> list[Episode]:
+        """Return one :class:`Episode` per item that has an enclosure."""
+        root = ET.fromstring(xml_content)
+        episodes = []
+        for item in root.iter('item'):
+            episode = self._episode(item, feed_url)
+            if episode:
+                episodes.append(episode)
+        return episodes
+
+    def iter_episodes(self, source, feed_url: str | None = None) -> Iterator[Episode]:
+        """Stream episodes in document order without building the whole tree.
+
+        ``source`` is XML text/bytes or a binary file object.  Each item is
+        discarded once yielded, so stopping early skips the rest of the feed.
+        """
+        if isinstance(source, str):
+            source = io.BytesIO(source.encode())
+        elif isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if elem.tag != 'item':
+                continue
+            episode = self._episode(elem, feed_url)
+            elem.clear()
+            if episode:
+                yield episode
+
+    @staticmethod
+    def _episode(item: ET.Element, feed_url: str | None = None) -> Episode | None:
+        enclosure = item.find('enclosure')
+        url = enclosure.attrib.get('url') if enclosure is not None else None
+        if not url:
+            return None
+        guid = (item.findtext('guid') or '').strip() or None
+        return Episode(
+            url=url,
+            guid=guid,
+            published=_parse_date(item.findtext('pubDate')),
+            length=_parse_int(enclosure.attrib.get('length')),
+            feed=feed_url,
+        )
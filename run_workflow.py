@@ -1,8 +1,19 @@
+import argparse
 import asyncio
-import sys
+import contextlib
+import importlib
 from pathlib import Path
+from typing import Any, MutableMapping
+import cassette
+import dedup
+import lanes
+import ratelimit
+import relevance
+import requests
+import tracing
 from agent_client import IngestAgentClient, StrategyAgentClient
 from orchestrator import PipelineOrchestrator, EventBus
+from results_store import ResultsStore
 from scheduler import _fallback_parse
 try:
     import yaml
@@ -17,18 +28,98 @@ def _load(path: Path) -> dict:
     return _fallback_parse(text)
 
 
-def main(cfg_file: str = "demo.yml") -> None:
+def build_orchestrator(
+    cfg: dict,
+    bus: EventBus | None = None,
+    session: Any = None,
+    cache: MutableMapping[str, dict[str, Any]] | None = None,
+) -> PipelineOrchestrator:
+    """Agent clients and orchestrator as described by ``cfg``.
+
+    Every entry point builds its orchestrator here, so a config key means
+    the same thing for ``run_workflow``, the daemon, backfill, the work
+    queue and replay.  Also installs the process-wide ``rate_limits`` and
+    ``trace_file`` settings.  Without ``session`` both clients share one
+    ``requests.Session``.
+    """
+    ratelimit.configure_from(cfg.get("rate_limits", {}))
+    tracing.configure_from(cfg.get("trace_file"))
+    if session is None:
+        session_cls = getattr(requests, "Session", None)
+        session = session_cls() if session_cls else None
+    compress = cfg.get("compress_threshold")
+    max_timeout = cfg.get("max_timeout")
+    options = {
+        "session": session,
+        "balance": cfg.get("balance", "least_outstanding"),
+        "compress_threshold": None if compress is None else int(compress),
+        "max_timeout": None if max_timeout is None else float(max_timeout),
+    }
+    ingest = IngestAgentClient(cfg.get("ingest_urls") or cfg.get("ingest_url", "http://localhost:8001"), **options)
+    strategy = StrategyAgentClient(
+        cfg.get("strategy_urls") or cfg.get("strategy_url", "http://localhost:8002"), **options
+    )
+    return PipelineOrchestrator(
+        ingest,
+        strategy,
+        bus=bus,
+        cache=cache,
+        adaptive=bool(cfg.get("adaptive", False)),
+        run_deadline=cfg.get("run_deadline"),
+        episode_deadline=cfg.get("episode_deadline"),
+        prefilter=relevance.from_config(cfg),
+        prefilter_batch=int(cfg.get("prefilter_batch", 16)),
+        dedup=dedup.from_config(cfg),
+        goals=cfg.get("goals"),
+        batch_goals=bool(cfg.get("batch_goals", False)),
+        # stored results are scored so the results store can rank them
+        score_results=bool(cfg.get("score_results", cfg.get("results_db"))),
+        dispatchers=lanes.from_config(cfg),
+    )
+
+
+def main(
+    cfg_file: str = "demo.yml",
+    profile: str | None = None,
+    trace_malloc: int = 0,
+    profile_rate: float = 1.0,
+) -> None:
     cfg = _load(Path(cfg_file))
-    ingest = IngestAgentClient(cfg.get("ingest_url", "http://localhost:8001"))
-    strategy = StrategyAgentClient(cfg.get("strategy_url", "http://localhost:8002"))
+    tape = cassette.from_config(cfg)
+    session = cassette.CassetteSession(tape) if tape is not None else None
     bus = EventBus()
     bus.on("discovered", lambda urls: print(f"Discovered {len(urls)} URLs"))
     bus.on("transcribed", lambda url, text: print(f"Transcribed {url}"))
     bus.on("analyzed", lambda url, summary: print(f"Analyzed {url}"))
     bus.on("completed", lambda results: print(f"Completed with {len(results)} results"))
-    orchestrator = PipelineOrchestrator(ingest, strategy, bus=bus)
-    asyncio.run(orchestrator.run(cfg.get("feed_url", "https://example.com/feed"), cfg.get("limit", 10)))
+    bus.on("concurrency", lambda agent, limit: print(f"{agent} concurrency limit -> {limit}"))
+    bus.on("deadline_exceeded", lambda url: print(f"Deadline exceeded for {url}"))
+    bus.on("duplicate", lambda url, of, similarity: print(f"{url} duplicates {of} ({similarity:.0%})"))
+    bus.on("filtered", lambda url, score: print(f"Skipped {url} (relevance {score:.2f})"))
+    orchestrator = build_orchestrator(cfg, bus=bus, session=session)
+    adaptive = bool(cfg.get("adaptive", False))
+    feed_url = cfg.get("feed_url", "https://example.com/feed")
+    store = ResultsStore(cfg["results_db"], feed=feed_url) if cfg.get("results_db") else None
+    if profile or trace_malloc:
+        # cProfile/tracemalloc are only imported when a profile is requested
+        profiler = importlib.import_module("profiling").profile_run(profile, trace_malloc, profile_rate, bus=bus)
+    else:
+        profiler = contextlib.nullcontext()
+    try:
+        with profiler:
+            asyncio.run(orchestrator.run(feed_url, cfg.get("limit", 10), parallel=adaptive, sink=store))
+    finally:
+        if tape is not None:
+            tape.save()
+        if store is not None:
+            store.close()
 
 
 if __name__ == "__main__":
-    main(sys.argv[1] if len(sys.argv) > 1 else "demo.yml")
+    parser = argparse.ArgumentParser(description="Run the pipeline once for a config file")
+    parser.add_argument("config", nargs="?", default="demo.yml")
+    parser.add_argument("--profile", metavar="DIR", help="Write cProfile and collapsed stacks under DIR")
+    parser.add_argument("--trace-malloc", type=int, default=0, metavar="N", help="Report the top N allocation sites")
+    parser.add_argument("--profile-rate", type=float, default=1.0, help="Fraction of runs to profile")
+    args = parser.parse_args()
+    main(args.config, args.profile, args.trace_malloc, args.profile_rate)
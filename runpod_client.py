@@ -1,6 +1,8 @@
 import os
 import types
 
+import ratelimit
+
 class Client:
     def __init__(self, endpoint: str):
         self.endpoint = endpoint
@@ -13,9 +15,11 @@ class RunPodClient:
         self.endpoint = endpoint or os.environ.get("RUNPOD_ENDPOINT", "http://local")
 
     def transcribe(self, file_path: str) -> str:
+        ratelimit.acquire(self.endpoint)
         return "dummy transcript"
 
     def run(self, **kwargs) -> str:
+        ratelimit.acquire(self.endpoint)
         return "dummy transcript"
 
 # provide a requests-like object for monkeypatching
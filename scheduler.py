@@ -1,3 +1,4 @@
+import asyncio
 import time
 import json
 try:
@@ -34,7 +35,7 @@ def _fallback_parse(text: str) -> dict:
     return {"tasks": items}
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     name: str
     func: Callable[[], Any]
@@ -49,9 +50,13 @@ class Scheduler:
         self.history = self._load()
 
     def _load(self) -> dict[str, list[dict]]:
+        history: dict[str, list[dict]] = {t.name: [] for t in self.tasks}
         if self.state_file.exists():
-            return json.loads(self.state_file.read_text())
-        return {t.name: [] for t in self.tasks}
+            history.update(json.loads(self.state_file.read_text()))
+            for runs in history.values():
+                if runs and runs[-1]["status"] == "running":
+                    runs[-1]["status"] = "interrupted"
+        return history
 
     def _save(self) -> None:
         self.state_file.write_text(json.dumps(self.history))
@@ -73,16 +78,35 @@ class Scheduler:
     def run_pending(self) -> None:
         now = time.time()
         for t in self.tasks:
-            last = self.history[t.name][-1] if self.history[t.name] else None
+            runs = self.history.get(t.name)
+            last = runs[-1] if runs else None
+            if last and last["status"] == "running":
+                continue
             next_time = (last["time"] + t.interval) if last else 0
             if now >= next_time:
                 self._run(t)
 
+    def _finish(self, entry: dict, fut: asyncio.Future) -> None:
+        if fut.cancelled():
+            entry["status"] = "cancelled"
+        elif fut.exception() is not None:
+            entry["status"] = f"fail:{fut.exception()}"
+        else:
+            entry["status"] = "success"
+        self._save()
+
     def _run(self, t: Task) -> None:
+        """Run ``t``; a returned future is recorded as running until it completes."""
         attempt = 0
         while True:
             try:
-                t.func()
+                result = t.func()
+                if isinstance(result, asyncio.Future):
+                    entry = {"time": time.time(), "status": "running"}
+                    self.history.setdefault(t.name, []).append(entry)
+                    self._save()
+                    result.add_done_callback(lambda fut: self._finish(entry, fut))
+                    return
                 status = "success"
                 break
             except Exception as e:  # pragma: no cover - failure path
@@ -0,0 +1,42 @@
+"""Streaming result sinks for ``PipelineOrchestrator.run_iter``."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Protocol
+
+from results_store import ResultsStore
+
+
+class Sink(Protocol):
+    def write(self, result: dict[str, Any]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlSink:
+    """Append one JSON object per line, flushed after every result."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def write(self, result: dict[str, Any]) -> None:
+        self._fh.write(json.dumps(result) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# One SQLite results schema: the indexed store the daemon and ``cli.py
+# results`` query.  Databases from the old url/created/data sink are
+# migrated when opened.
+SqliteSink = ResultsStore
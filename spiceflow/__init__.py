@@ -1,6 +1,21 @@
+"""Spiceflow Navigator Pipeline package.
+
+Submodules are loaded on first attribute access so that ``import spiceflow``
+stays cheap for cron-driven invocations.
+"""
 import importlib, sys
 
-for mod in ("cli", "workflow", "orchestrator"):
-    module = importlib.import_module(mod)
-    sys.modules[__name__ + f".{mod}"] = module
-    setattr(sys.modules[__name__], mod, module)
+_SUBMODULES = ("cli", "workflow", "orchestrator")
+
+
+def __getattr__(name: str):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(name)
+    sys.modules[__name__ + f".{name}"] = module
+    setattr(sys.modules[__name__], name, module)
+    return module
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_SUBMODULES))
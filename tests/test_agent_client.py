@@ -48,3 +48,82 @@ def test_strategy_client(monkeypatch):
     client = StrategyAgentClient("http://strategy")
     assert client.analyze("hi") == "summary"
     assert client.score("hi") == 5
+
+
+def test_iter_json_matches_json_dumps():
+    from agent_client import CHUNK, iter_json
+
+    payload = {"text": 'a"b\\c\n' * (CHUNK // 2), "n": 3, "tags": ["x"]}
+    assert json.loads("".join(iter_json(payload))) == payload
+
+
+def test_large_payloads_are_gzipped(monkeypatch):
+    import gzip
+
+    seen = {}
+
+    def fake_post(url, *args, **kwargs):
+        seen.update(kwargs)
+        if "data" in kwargs:
+            seen["body"] = json.loads(gzip.decompress(b"".join(kwargs["data"])))
+        return DummyResponse("summary")
+
+    monkeypatch.setattr("agent_client.requests.post", fake_post)
+
+    client = StrategyAgentClient("http://strategy", compress_threshold=1000)
+    assert client.analyze("short") == "summary"
+    assert seen["json"] == {"text": "short"} and "data" not in seen
+
+    seen.clear()
+    transcript = "word " * 1000
+    assert client.analyze(transcript) == "summary"
+    assert seen["headers"]["Content-Encoding"] == "gzip"
+    assert seen["body"] == {"text": transcript}
+
+
+def test_strategy_client_goals(monkeypatch):
+    sent = []
+
+    def fake_post(url, *args, **kwargs):
+        sent.append((url, kwargs["json"]))
+        if url.endswith("/analyze_batch"):
+            return DummyResponse(json.dumps({"results": {"g1": "s1", "g2": "s2"}}))
+        return DummyResponse("summary")
+
+    monkeypatch.setattr("agent_client.requests.post", fake_post)
+    client = StrategyAgentClient("http://strategy")
+    assert client.analyze("hi", goal="g1") == "summary"
+    assert client.analyze_goals("hi", ["g1", "g2"]) == {"g1": "s1", "g2": "s2"}
+    assert sent == [
+        ("http://strategy/analyze", {"text": "hi", "goal": "g1"}),
+        ("http://strategy/analyze_batch", {"text": "hi", "goals": ["g1", "g2"]}),
+    ]
+
+
+def test_slow_call_uses_remaining_deadline_budget(monkeypatch):
+    import asyncio
+
+    import requests
+
+    import deadline
+
+    timeouts = []
+
+    def fake_post(url, *args, **kwargs):
+        # The agent needs 8s, more than the client's 5s default timeout.
+        timeouts.append(kwargs["timeout"])
+        if kwargs["timeout"] < 8:
+            raise requests.Timeout()
+        return DummyResponse(json.dumps({"audio_urls": ["a.mp3"]}))
+
+    monkeypatch.setattr("agent_client.requests.post", fake_post)
+
+    async def main(client):
+        async with deadline.scope(deadline.after(60)):
+            return client.discover("http://feed")
+
+    assert asyncio.run(main(IngestAgentClient("http://ingest"))) == ["a.mp3"]
+    assert timeouts[-1] > 5
+    capped = IngestAgentClient("http://ingest", max_timeout=10)
+    assert asyncio.run(main(capped)) == ["a.mp3"]
+    assert timeouts[-1] == 10
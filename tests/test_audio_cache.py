@@ -0,0 +1,116 @@
+import threading
+import time
+
+from audio_cache import AudioCache, Prefetcher
+from rss_parser import Episode
+from workflow import WorkflowManager
+
+
+class Fetcher:
+    def __init__(self, size=10, delay=0.0):
+        self.size = size
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, dest):
+        with self.lock:
+            self.calls.append(url)
+        time.sleep(self.delay)
+        dest.write(b"x" * self.size)
+
+
+def test_cache_hits_and_lru_eviction(tmp_path):
+    fetch = Fetcher(size=10)
+    cache = AudioCache(tmp_path, max_bytes=25, fetch=fetch)
+    a = cache.get("http://cdn/a.mp3?token=1")
+    assert cache.get("http://cdn/a.mp3?token=2") == a
+    cache.get("http://cdn/b.mp3")
+    cache.get("http://cdn/a.mp3")  # a is now most recently used
+    cache.get("http://cdn/c.mp3")
+    assert fetch.calls == ["http://cdn/a.mp3?token=1", "http://cdn/b.mp3", "http://cdn/c.mp3"]
+    assert "http://cdn/a.mp3" in cache and "http://cdn/b.mp3" not in cache
+    assert cache.size == 20
+    # the index is rebuilt from disk
+    assert AudioCache(tmp_path, max_bytes=25, fetch=fetch).size == 20
+
+
+def test_pinned_entries_survive_eviction(tmp_path):
+    cache = AudioCache(tmp_path, max_bytes=10, fetch=Fetcher(size=10))
+    cache.pin("http://cdn/a.mp3")
+    cache.get("http://cdn/a.mp3")
+    cache.pin("http://cdn/b.mp3")
+    cache.get("http://cdn/b.mp3")
+    assert "http://cdn/a.mp3" in cache and cache.size == 20
+    cache.unpin("http://cdn/a.mp3")
+    assert "http://cdn/a.mp3" not in cache and "http://cdn/b.mp3" in cache
+    assert cache.size == 10
+
+
+def test_concurrent_gets_download_once(tmp_path):
+    fetch = Fetcher(delay=0.05)
+    cache = AudioCache(tmp_path, fetch=fetch)
+    threads = [threading.Thread(target=cache.get, args=("http://cdn/a.mp3",)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert fetch.calls == ["http://cdn/a.mp3"]
+
+
+def test_prefetcher_runs_ahead(tmp_path):
+    fetch = Fetcher()
+    cache = AudioCache(tmp_path, fetch=fetch)
+    prefetcher = Prefetcher(cache, lookahead=2)
+    urls = [f"http://cdn/{i}.mp3" for i in range(5)]
+    it = prefetcher.iterate(urls)
+    url, path = next(it)
+    assert url == urls[0] and path.read_bytes() == b"x" * 10
+    time.sleep(0.05)
+    assert set(urls[:3]) <= set(fetch.calls)
+    assert [u for u, _ in it] == urls[1:]
+    prefetcher.close()
+
+
+class Client:
+    def __init__(self):
+        self.sources = []
+
+    def transcribe(self, source):
+        self.sources.append(source)
+        return "t"
+
+
+class Parser:
+    def extract_episodes(self, xml):
+        return [Episode("http://cdn/1.mp3"), Episode("http://cdn/2.mp3")]
+
+
+class Response:
+    text = "<rss/>"
+
+    def raise_for_status(self):
+        pass
+
+
+def test_workflow_transcribes_from_local_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("spiceflow.workflow.requests.get", lambda url: Response())
+    cache = AudioCache(tmp_path / "audio", fetch=Fetcher())
+    client = Client()
+    WorkflowManager(
+        "http://feed", transcripts_dir=tmp_path / "t", parser=Parser(), client=client, audio_cache=cache
+    ).run()
+    assert client.sources == [str(cache.path_for("http://cdn/1.mp3")), str(cache.path_for("http://cdn/2.mp3"))]
+    assert len(list((tmp_path / "t").glob("*.md"))) == 2
+
+
+def test_stale_partial_downloads_are_swept(tmp_path):
+    import os
+
+    stale = tmp_path / "abc.123.part"
+    stale.write_bytes(b"half")
+    os.utime(stale, (0, 0))
+    fresh = tmp_path / "def.456.part"
+    fresh.write_bytes(b"writing")
+    AudioCache(tmp_path, fetch=Fetcher())
+    assert not stale.exists() and fresh.exists()
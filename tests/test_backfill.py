@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from backfill import Checkpoint, CheckpointNotFound, resume_after, windows
+from orchestrator import PipelineOrchestrator
+from rss_parser import Episode
+
+
+class Ingest:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+
+    def transcribe(self, url):
+        self.calls.append(url)
+        if url in self.fail:
+            raise RuntimeError("boom")
+        return f"text-{url}"
+
+
+class Strategy:
+    def analyze(self, text):
+        return text.upper()
+
+
+class ListSink:
+    def __init__(self):
+        self.items = []
+
+    def write(self, result):
+        self.items.append(result)
+
+
+def _archive(n):
+    # generator: the archive is never materialized by the caller
+    return (Episode(f"http://cdn/{i}.mp3", guid=f"g{i}") for i in range(n))
+
+
+def test_episodes_are_slotted():
+    with pytest.raises(AttributeError):
+        Episode("u").extra = 1
+    assert not hasattr(Episode("u"), "__dict__")
+
+
+def test_windows_and_resume():
+    assert [len(w) for w in windows(range(7), 3)] == [3, 3, 1]
+    eps = list(_archive(4))
+    assert [e.guid for e in resume_after(eps, "guid:g1")] == ["g2", "g3"]
+    assert len(list(resume_after(eps, None))) == 4
+    with pytest.raises(CheckpointNotFound):
+        list(resume_after(eps, "guid:gone"))
+
+
+def test_backfill_checkpoints_and_resumes(tmp_path):
+    ckpt = Checkpoint(tmp_path / "ckpt.json")
+    sink = ListSink()
+    ingest = Ingest(fail={"http://cdn/3.mp3"})
+    orch = PipelineOrchestrator(ingest, Strategy(), retries=0)
+    done = asyncio.run(orch.backfill("feed", _archive(5), ckpt, window=2, sink=sink))
+    assert done == 4
+    assert len(sink.items) == 4
+    assert sink.items[0] == {"feed": "feed", "url": "http://cdn/0.mp3", "key": "guid:g0", "summary": "TEXT-HTTP://CDN/0.MP3"}
+    assert Checkpoint(tmp_path / "ckpt.json").get("feed") == {
+        "done": 4,
+        "last": "guid:g4",
+        "failed": {"guid:g3": "http://cdn/3.mp3"},
+    }
+
+    # the failed episode is retried first; an episode published since the
+    # checkpoint does not shift the resume point
+    ingest.calls.clear()
+    ingest.fail.clear()
+    archive = [Episode("http://cdn/new.mp3", guid="new")] + list(_archive(7))
+    done = asyncio.run(orch.backfill("feed", archive, Checkpoint(tmp_path / "ckpt.json"), window=2))
+    assert ingest.calls == ["http://cdn/3.mp3", "http://cdn/5.mp3", "http://cdn/6.mp3"]
+    assert done == 7
+    assert Checkpoint(tmp_path / "ckpt.json").get("feed")["failed"] == {}
@@ -0,0 +1,69 @@
+import asyncio
+import gzip
+import time
+
+import pytest
+
+from agent_client import IngestAgentClient, StrategyAgentClient
+from cassette import Cassette, CassetteMiss, CassetteProxy, CassetteSession
+from loadtest import AgentProfile, FakeAgentServer, UrllibSession, parse_latency
+from orchestrator import PipelineOrchestrator
+from runpod_client import RunPodClient
+
+
+def _run(ingest_url, strategy_url, session):
+    orch = PipelineOrchestrator(
+        IngestAgentClient(ingest_url, session=session),
+        StrategyAgentClient(strategy_url, session=session, compress_threshold=100),
+    )
+    return asyncio.run(orch.run("loadtest://feed0", limit=3, parallel=True))
+
+
+def test_record_then_replay_offline(tmp_path):
+    path = tmp_path / "run.cassette"
+    ingest_routes = {
+        "discover": AgentProfile(),
+        "transcribe": AgentProfile(parse_latency("const:0.05"), payload_bytes=500),
+    }
+    with FakeAgentServer(ingest_routes, 3) as ingest, FakeAgentServer({"analyze": AgentProfile()}) as strategy:
+        with Cassette(path, "record") as tape:
+            recorded = _run(ingest.url, strategy.url, CassetteSession(tape, UrllibSession()))
+    assert len(recorded) == 3
+    with gzip.open(path, "rt") as fh:
+        assert len(fh.readlines()) == 7  # discover + 3 transcribe + 3 analyze
+
+    # agents are gone; the replay is served entirely from the cassette
+    start = time.perf_counter()
+    replayed = _run("http://nowhere", "http://nowhere", CassetteSession(Cassette(path, "replay", speed=0)))
+    assert time.perf_counter() - start < 0.05 * 3
+    assert sorted(r["summary"] for r in replayed) == sorted(r["summary"] for r in recorded)
+
+
+def test_replay_uses_recorded_latency(tmp_path):
+    path = tmp_path / "c"
+    tape = Cassette(path, "record")
+    tape.record(Cassette.key("GET", "/x", None), 0.1, status=200, text="hi")
+    tape.save()
+    session = CassetteSession(Cassette(path, "replay", speed=0.5))
+    start = time.perf_counter()
+    assert session.get("http://any/x").text == "hi"
+    assert 0.05 <= time.perf_counter() - start < 0.1
+    with pytest.raises(CassetteMiss):
+        session.get("http://any/y")
+
+
+def test_proxy_records_runpod_calls(tmp_path):
+    path = tmp_path / "runpod.cassette"
+    with Cassette(path, "record") as tape:
+        client = CassetteProxy(RunPodClient(), tape)
+        assert client.transcribe("a.mp3") == "dummy transcript"
+        assert client.endpoint == RunPodClient().endpoint
+    replay = CassetteProxy(None, Cassette(path, "replay", speed=0), prefix="RunPodClient")
+    assert replay.transcribe("a.mp3") == "dummy transcript"
+    with pytest.raises(CassetteMiss):
+        replay.transcribe("b.mp3")
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "c", "rewind")
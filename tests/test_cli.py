@@ -28,3 +28,97 @@ def test_cli(monkeypatch, capsys):
 def test_cli_multi_runs(monkeypatch, capsys):
     monkeypatch.setattr("spiceflow.cli.WorkflowManager.run", lambda self: None)
     main(["--multi", "audio.wav", "--text", "hi", "--feed-url", "http://feed"])
+
+
+def test_cli_profile_attributes_transcription(tmp_path, capsys):
+    import time
+
+    with patch("spiceflow.cli.RunPodClient") as MockClient:
+        MockClient.return_value.transcribe.side_effect = lambda url: time.sleep(0.1) or "t"
+        cli.main(["http://example.com/a.wav", "--profile", str(tmp_path)])
+
+    (run_dir,) = tmp_path.glob("run-*")
+    stacks = (run_dir / "stacks.collapsed").read_text().splitlines()
+    assert any(line.startswith("transcribe;") for line in stacks)
+
+
+def test_cli_daemon_queues_episode(capsys):
+    with patch("daemon.send_command", return_value={"ok": True, "job": "job-1"}) as send:
+        cli.main(["http://example.com/a.wav", "--daemon", "127.0.0.1:9000"])
+    send.assert_called_once_with({"cmd": "episode", "url": "http://example.com/a.wav"}, "127.0.0.1", 9000)
+    assert '"job-1"' in capsys.readouterr().out
+
+
+def test_cli_records_and_replays_single_url(tmp_path, monkeypatch, capsys):
+    tape = str(tmp_path / "tape.jsonl.gz")
+    cfg = {"cassette": tape, "cassette_mode": "record"}
+    monkeypatch.setattr(cli, "_load_config", lambda path: cfg)
+    with patch("runpod_client.RunPodClient.transcribe", return_value="recorded") as transcribe:
+        cli.main(["http://example.com/a.wav", "--config", "cfg.yml"])
+    assert transcribe.call_count == 1
+
+    cfg.update(cassette_mode="replay", replay_speed=0)
+    with patch("runpod_client.RunPodClient.transcribe", side_effect=AssertionError("not replayed")):
+        cli.main(["http://example.com/a.wav", "--config", "cfg.yml"])
+    assert capsys.readouterr().out.split() == ["recorded", "recorded"]
+
+
+def test_cli_workflow_builds_state_from_config(tmp_path, monkeypatch):
+    from audio_cache import AudioCache
+    from seen import SeenIndex
+    from transcript_index import TranscriptIndex
+    from watermark import Watermarks
+
+    cfg = {
+        "transcripts_dir": str(tmp_path / "t"),
+        "watermarks_file": str(tmp_path / "marks.json"),
+        "seen_db": str(tmp_path / "seen.db"),
+        "audio_cache_dir": str(tmp_path / "audio"),
+        "prefetch": 1,
+        "transcript_index": str(tmp_path / "index.db"),
+    }
+    monkeypatch.setattr(cli, "_load_config", lambda path: cfg)
+    built = []
+    monkeypatch.setattr("workflow.WorkflowManager.run", lambda self: built.append(self))
+    cli._workflow_proc("http://feed", "cfg.yml")
+
+    (manager,) = built
+    assert isinstance(manager.watermarks, Watermarks)
+    assert isinstance(manager.seen, SeenIndex)
+    assert isinstance(manager.audio_cache, AudioCache) and manager.prefetch == 1
+    assert isinstance(manager.index, TranscriptIndex)
+
+
+def test_cli_workflow_only_transcribes_new_episodes(tmp_path, monkeypatch):
+    feed = "<rss><channel>{}</channel></rss>"
+    item = "<item><guid>{0}</guid><pubDate>{1}</pubDate><enclosure url='http://x/{0}.mp3'/></item>"
+    monkeypatch.setattr(cli, "_load_config", lambda path: {
+        "transcripts_dir": str(tmp_path / "t"), "watermarks_file": str(tmp_path / "marks.json")
+    })
+    items = [item.format("ep1", "Mon, 01 Jan 2024 00:00:00 GMT")]
+
+    class Resp:
+        def __init__(self, text):
+            self.text = text
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr("workflow.requests.get", lambda url: Resp(feed.format("".join(items))))
+    with patch("runpod_client.RunPodClient.transcribe", return_value="t") as transcribe:
+        cli._workflow_proc("http://feed", "cfg.yml")
+        (tmp_path / "t" / "ep1.md").unlink()
+        items.insert(0, item.format("ep2", "Tue, 02 Jan 2024 00:00:00 GMT"))
+        cli._workflow_proc("http://feed", "cfg.yml")
+    # ep1 is behind the watermark, so it is not redone though its file is gone
+    assert [c.args[0] for c in transcribe.call_args_list] == ["http://x/ep1.mp3", "http://x/ep2.mp3"]
+
+
+def test_cli_help_lists_subcommands(capsys):
+    import pytest
+
+    with pytest.raises(SystemExit):
+        cli.main(["--help"])
+    out = capsys.readouterr().out
+    for name in ("serve", "ctl", "queue", "backfill", "loadtest", "traces", "search", "replay", "results"):
+        assert f"\n  {name} " in out
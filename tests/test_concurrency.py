@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from concurrency import AIMDLimiter
+from orchestrator import EventBus, PipelineOrchestrator
+
+
+def test_additive_increase_multiplicative_decrease():
+    bus = EventBus()
+    limits = []
+    bus.on("concurrency", lambda agent, limit: limits.append((agent, limit)))
+    lim = AIMDLimiter("ingest", initial=4, bus=bus)
+    for _ in range(5):
+        lim.record(0.1, ok=True)
+    assert lim.limit == 5
+    lim.record(0.1, ok=False)
+    assert lim.limit == 2
+    assert limits == [("ingest", 5), ("ingest", 2)]
+
+
+def test_slow_calls_count_as_congestion():
+    lim = AIMDLimiter("strategy", initial=8, max_limit=64, tolerance=2.0)
+    lim.record(0.1, ok=True)
+    lim.record(0.5, ok=True)
+    assert lim.limit == 4
+
+
+def test_burst_of_failures_decreases_once():
+    lim = AIMDLimiter("ingest", initial=16, max_limit=64)
+    started = time.monotonic()
+    lim.record(0.1, ok=False, started=started)
+    lim.record(0.1, ok=False, started=started)
+    assert lim.limit == 8
+
+
+def test_limiter_bounds_inflight_calls():
+    lim = AIMDLimiter("ingest", initial=2, max_limit=2)
+    peak = {"now": 0, "max": 0}
+
+    async def call():
+        async with lim.slot():
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.01)
+            peak["now"] -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak["max"] == 2
+
+
+def test_one_fast_outlier_does_not_set_the_baseline():
+    lim = AIMDLimiter("ingest", initial=8, max_limit=64, tolerance=2.0, window=20)
+    lim.record(0.01, ok=True)
+    for _ in range(19):
+        lim.record(0.1, ok=True)
+    before = lim.limit
+    lim.record(0.15, ok=True)
+    assert lim.limit >= before
+
+
+def test_fast_and_slow_call_kinds_keep_separate_baselines():
+    shared = AIMDLimiter("strategy", initial=8, max_limit=32)
+    split = AIMDLimiter("strategy", initial=8, max_limit=32)
+    for _ in range(50):
+        shared.record(0.01, ok=True)
+        shared.record(0.2, ok=True)
+        split.record(0.01, ok=True, kind="score")
+        split.record(0.2, ok=True, kind="analyze")
+    assert shared.limit == 1
+    assert split.limit > 8
+
+
+def test_max_limit_defaults_to_executor_size():
+    from concurrency import default_max_limit
+
+    lim = AIMDLimiter("ingest", initial=1000)
+    assert lim.limit == lim.max_limit == default_max_limit() <= 32
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return ["a", "b", "c", "d", "e", "f"]
+
+    def transcribe(self, url):
+        return url
+
+
+class Strategy:
+    def analyze(self, text):
+        return text
+
+
+def test_orchestrator_adaptive_publishes_limits():
+    bus = EventBus()
+    events = []
+    bus.on("concurrency", lambda agent, limit: events.append((agent, limit)))
+    orch = PipelineOrchestrator(Ingest(), Strategy(), bus=bus, adaptive=True)
+    results = asyncio.run(orch.run("feed", parallel=True))
+    assert len(results) == 6
+    assert set(orch.limiters) == {"ingest", "strategy"}
+    assert all(l.inflight == 0 for l in orch.limiters.values())
+    # six healthy calls lift the limit past 5; any congestion halves it
+    assert {agent for agent, _ in events} == {"ingest", "strategy"}
+    for agent, limiter in orch.limiters.items():
+        assert [limit for a, limit in events if a == agent][-1] == limiter.limit
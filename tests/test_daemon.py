@@ -0,0 +1,177 @@
+import asyncio
+import json
+
+from daemon import LRUCache, PipelineDaemon
+from orchestrator import PipelineOrchestrator
+
+
+class DummyIngest:
+    def __init__(self):
+        self.transcribed = []
+
+    def discover(self, feed_url):
+        return ["a.mp3", "b.mp3"]
+
+    def transcribe(self, url):
+        self.transcribed.append(url)
+        return f"text-{url}"
+
+
+class DummyStrategy:
+    def analyze(self, text):
+        return f"summary-{text}"
+
+    def score(self, text):
+        return {"text-a.mp3": 3, "text-b.mp3": 7}[text]
+
+
+async def _ask(port, payload):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    writer.close()
+    return reply
+
+
+def test_lru_cache_evicts_oldest():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"]
+    cache["c"] = 3
+    assert list(cache) == ["a", "c"]
+
+
+def test_daemon_control_socket_and_warm_cache(tmp_path):
+    ingest = DummyIngest()
+    orch = PipelineOrchestrator(ingest, DummyStrategy(), cache={})
+    cfg = {"state_file": str(tmp_path / "state.json"), "interval": 3600}
+    daemon = PipelineDaemon(cfg, orchestrator=orch, port=0, tick=0.01)
+
+    async def scenario():
+        server = asyncio.create_task(daemon.serve())
+        while daemon.jobs.get("job-1", {}).get("state") != "done":
+            await asyncio.sleep(0.01)
+        reply = await _ask(daemon.port, {"cmd": "submit", "feed_url": "http://feed"})
+        assert reply["ok"]
+        await asyncio.sleep(0.1)
+        status = await _ask(daemon.port, {"cmd": "status", "job": reply["job"]})
+        assert status["state"] == "done" and status["results"] == 2
+        bad = await _ask(daemon.port, {"cmd": "nope"})
+        assert not bad["ok"]
+        await _ask(daemon.port, {"cmd": "shutdown"})
+        await server
+
+    asyncio.run(scenario())
+    # the scheduled run and the ad-hoc run share the cache: each URL once
+    assert sorted(ingest.transcribed) == ["a.mp3", "b.mp3"]
+
+
+def test_daemon_drains_inflight_on_stop(tmp_path):
+    class SlowIngest(DummyIngest):
+        def transcribe(self, url):
+            import time
+            time.sleep(0.05)
+            return super().transcribe(url)
+
+    orch = PipelineOrchestrator(SlowIngest(), DummyStrategy())
+    daemon = PipelineDaemon({"state_file": str(tmp_path / "s.json")}, orchestrator=orch, port=0, tick=0.01)
+
+    async def scenario():
+        server = asyncio.create_task(daemon.serve())
+        while daemon._server is None:
+            await asyncio.sleep(0.01)
+        daemon.stop()
+        await server
+
+    asyncio.run(scenario())
+    assert daemon.jobs
+    assert all(job["state"] == "done" for job in daemon.jobs.values())
+
+
+def test_daemon_episode_command_runs_on_interactive_lane(tmp_path):
+    orch = PipelineOrchestrator(DummyIngest(), DummyStrategy())
+    daemon = PipelineDaemon({"state_file": str(tmp_path / "s.json")}, orchestrator=orch, port=0, tick=0.01)
+
+    async def scenario():
+        server = asyncio.create_task(daemon.serve())
+        while not daemon._server:
+            await asyncio.sleep(0.01)
+        reply = await _ask(daemon.port, {"cmd": "episode", "url": "x.mp3"})
+        await asyncio.sleep(0.1)
+        status = await _ask(daemon.port, {"cmd": "status", "job": reply["job"]})
+        await _ask(daemon.port, {"cmd": "shutdown"})
+        await server
+        return status
+
+    status = asyncio.run(scenario())
+    assert status["lane"] == "interactive"
+    assert status["state"] == "done" and status["results"] == 1
+
+
+def test_daemon_stores_results_and_answers_top(tmp_path):
+    orch = PipelineOrchestrator(DummyIngest(), DummyStrategy(), score_results=True)
+    cfg = {"state_file": str(tmp_path / "s.json"), "results_db": str(tmp_path / "results.db")}
+    daemon = PipelineDaemon(cfg, orchestrator=orch, port=0, tick=0.01)
+
+    async def scenario():
+        server = asyncio.create_task(daemon.serve())
+        while daemon.jobs.get("job-1", {}).get("state") != "done":
+            await asyncio.sleep(0.01)
+        reply = await _ask(daemon.port, {"cmd": "submit", "feed_url": "http://feed"})
+        while daemon.jobs[reply["job"]]["state"] != "done":
+            await asyncio.sleep(0.01)
+        top = await _ask(daemon.port, {"cmd": "top", "feed_url": "http://feed", "days": 7})
+        await _ask(daemon.port, {"cmd": "shutdown"})
+        await server
+        return top
+
+    top = asyncio.run(scenario())
+    assert [(r["url"], r["score"]) for r in top["results"]] == [("b.mp3", 7), ("a.mp3", 3)]
+    assert {r["url"] for r in daemon.results.episode("url:a.mp3/")} == {"a.mp3"}
+
+
+def test_daemon_prunes_finished_jobs_and_records_scheduled_outcome(tmp_path):
+    orch = PipelineOrchestrator(DummyIngest(), DummyStrategy())
+    state = tmp_path / "s.json"
+    daemon = PipelineDaemon({"state_file": str(state)}, orchestrator=orch, port=0, tick=0.01, max_jobs=2)
+
+    async def scenario():
+        server = asyncio.create_task(daemon.serve())
+        while daemon.jobs.get("job-1", {}).get("state") != "done":
+            await asyncio.sleep(0.01)
+        for _ in range(3):
+            job = daemon.submit("http://feed")
+            while daemon.jobs[job]["state"] != "done":
+                await asyncio.sleep(0.01)
+        daemon.stop()
+        await server
+
+    asyncio.run(scenario())
+    assert list(daemon.jobs) == ["job-3", "job-4"]
+    history = json.loads(state.read_text())
+    assert [run["status"] for run in history["feed:https://example.com/feed"]] == ["success"]
+
+
+def test_ctl_submit_requires_a_feed_url(capsys):
+    import pytest
+
+    from daemon import main
+
+    with pytest.raises(SystemExit):
+        main(["ctl", "submit"])
+    assert "needs a URL" in capsys.readouterr().err
+
+
+def test_daemon_reads_adaptive_from_config(tmp_path):
+    cfg = {"state_file": str(tmp_path / "s.json"), "adaptive": True, "lanes": {"capacity": 4}}
+    orch = PipelineDaemon(cfg, port=0).orchestrator
+    assert set(orch.limiters) == {"ingest", "strategy"}
+    assert orch.dispatchers["strategy"]._limit() == orch.limiters["strategy"].limit
+
+
+def test_daemon_clients_compress_from_config(tmp_path):
+    cfg = {"state_file": str(tmp_path / "s.json"), "compress_threshold": 4096}
+    orch = PipelineDaemon(cfg, port=0).orchestrator
+    assert orch.ingest.compress_threshold == orch.strategy.compress_threshold == 4096
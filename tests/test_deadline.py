@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+import deadline
+
+
+def test_timeout_without_deadline_keeps_default():
+    assert deadline.remaining() is None
+    assert deadline.timeout(5) == 5
+    assert deadline.timeout(5, cap=30) == 30
+
+
+def test_scope_bounds_timeout_and_propagates_to_threads():
+    async def main():
+        async with deadline.scope(deadline.after(0.5)):
+            return await asyncio.to_thread(deadline.timeout, 5)
+
+    assert 0 < asyncio.run(main()) <= 0.5
+    assert deadline.remaining() is None
+
+
+def test_timeout_uses_whole_remaining_budget_up_to_cap():
+    async def main():
+        async with deadline.scope(deadline.after(60)):
+            return deadline.timeout(5), deadline.timeout(5, cap=20)
+
+    uncapped, capped = asyncio.run(main())
+    assert 50 < uncapped <= 60
+    assert capped == 20
+
+
+def test_nested_scope_cannot_extend_budget():
+    async def main():
+        async with deadline.scope(deadline.after(0.2)):
+            async with deadline.scope(deadline.after(10)):
+                return deadline.remaining()
+
+    assert asyncio.run(main()) <= 0.2
+
+
+def test_scope_cancels_on_expiry():
+    async def main():
+        async with deadline.scope(deadline.after(0.05)):
+            await asyncio.sleep(1)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
+    assert time.monotonic() - start < 0.5
+
+
+def test_timeout_raises_once_expired():
+    async def main():
+        async with deadline.scope(time.monotonic() - 1):
+            deadline.timeout(5)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
+
+
+def test_expired_scope_leaves_task_usable():
+    async def main():
+        with pytest.raises(TimeoutError):
+            async with deadline.scope(deadline.after(0.01)):
+                await asyncio.sleep(1)
+        await asyncio.sleep(0)  # no cancellation left pending
+        return "ok"
+
+    assert asyncio.run(main()) == "ok"
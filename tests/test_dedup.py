@@ -0,0 +1,115 @@
+import asyncio
+import random
+
+import pytest
+
+import dedup
+from dedup import DuplicateIndex, MinHasher, similarity
+from orchestrator import EventBus, PipelineOrchestrator
+
+rng = random.Random(7)
+WORDS = [f"w{i}" for i in range(500)]
+BASE = " ".join(rng.choice(WORDS) for _ in range(400))
+RERUN = "Welcome back to a best of episode. " + BASE + " Thanks for listening."
+OTHER = " ".join(rng.choice(WORDS) for _ in range(400))
+
+
+def test_signature_similarity_tracks_overlap():
+    hasher = MinHasher()
+    base = hasher.signature(BASE)
+    assert similarity(base, hasher.signature(BASE)) == 1.0
+    assert similarity(base, hasher.signature(RERUN)) > 0.85
+    assert similarity(base, hasher.signature(OTHER)) < 0.1
+
+
+def test_python_fallback_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    hasher = MinHasher()
+    vectorized = hasher.signature(BASE)
+    monkeypatch.setattr(dedup, "np", None)
+    assert hasher.signature(BASE) == vectorized
+
+
+def test_index_finds_near_duplicates(tmp_path):
+    index = DuplicateIndex(tmp_path / "dedup.db")
+    index.add("a", index.signature(BASE), "summary-a")
+    index.add("b", index.signature(OTHER))
+    key, score, summary = index.find(index.signature(RERUN))
+    assert (key, summary) == ("a", "summary-a") and score > 0.8
+    assert index.find(index.signature("completely unrelated words here today")) is None
+    index.close()
+
+    reopened = DuplicateIndex(tmp_path / "dedup.db")
+    assert len(reopened) == 2
+    assert reopened.find(reopened.signature(BASE))[0] == "a"
+
+
+def test_entries_without_summary_do_not_hide_matches(tmp_path):
+    index = DuplicateIndex(tmp_path / "dedup.db")
+    index.add("exact", index.signature(RERUN))  # analysis never finished
+    index.add("close", index.signature(BASE), "summary-close")
+    assert index.find(index.signature(RERUN))[::2] == ("close", "summary-close")
+    plan = index._conn.execute("EXPLAIN QUERY PLAN DELETE FROM buckets WHERE key = ?", ("a",)).fetchall()
+    assert any("buckets_key" in row[-1] for row in plan)
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return ["orig.mp3", "rerun.mp3", "other.mp3"]
+
+    def transcribe(self, url):
+        return {"orig.mp3": BASE, "rerun.mp3": RERUN, "other.mp3": OTHER}[url]
+
+
+class Strategy:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, text):
+        self.calls += 1
+        return f"summary-{self.calls}"
+
+
+def test_orchestrator_links_duplicates(tmp_path):
+    bus = EventBus()
+    dupes = []
+    bus.on("duplicate", lambda url, of, similarity: dupes.append((url, of)))
+    strategy = Strategy()
+    orch = PipelineOrchestrator(Ingest(), strategy, bus=bus, dedup=DuplicateIndex(tmp_path / "d.db"))
+    results = asyncio.run(orch.run("http://feed"))
+    assert strategy.calls == 2
+    assert dupes == [("rerun.mp3", "orig.mp3")]
+    assert results[1] == {
+        "url": "rerun.mp3", "key": "url:rerun.mp3/", "summary": "summary-1", "duplicate_of": "orig.mp3"
+    }
+
+
+def test_matches_are_scoped_to_goal_set(tmp_path):
+    index = DuplicateIndex(tmp_path / "dedup.db")
+    index.add("plain", index.signature(BASE), "summary-plain")
+    index.add("goals", index.signature(BASE), {"risk": "r", "growth": "g"}, goals=["risk", "growth"])
+    assert index.find(index.signature(RERUN))[::2] == ("plain", "summary-plain")
+    assert index.find(index.signature(RERUN), ["growth", "risk"])[::2] == ("goals", {"risk": "r", "growth": "g"})
+    assert index.find(index.signature(RERUN), ["risk"]) is None
+
+
+def test_reads_index_with_plain_text_summaries(tmp_path):
+    import sqlite3
+    from array import array
+
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE signatures (key TEXT PRIMARY KEY, sig BLOB NOT NULL, summary TEXT);"
+        "CREATE TABLE buckets (band INTEGER NOT NULL, bucket INTEGER NOT NULL, key TEXT NOT NULL);"
+    )
+    index = DuplicateIndex(path)
+    sig = index.signature(BASE)
+    conn.execute("INSERT INTO signatures (key, sig, summary) VALUES (?, ?, ?)", ("old", array("Q", sig).tobytes(), "plain summary"))
+    conn.executemany("INSERT INTO buckets VALUES (?, ?, ?)", [(b, h, "old") for b, h in index._buckets(sig)])
+    conn.commit()
+    conn.close()
+    index.close()
+
+    reopened = DuplicateIndex(path)
+    assert reopened.find(reopened.signature(RERUN))[::2] == ("old", "plain summary")
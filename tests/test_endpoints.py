@@ -0,0 +1,102 @@
+import json
+from collections import Counter
+
+import pytest
+
+from agent_client import IngestAgentClient
+from endpoints import EndpointPool, parse_urls
+
+
+def test_parse_urls():
+    assert parse_urls("http://a, http://b") == ["http://a", "http://b"]
+    assert parse_urls(["http://a"]) == ["http://a"]
+
+
+def test_least_outstanding_spreads_concurrent_requests():
+    pool = EndpointPool(["http://a", "http://b", "http://c"])
+    held = [pool.acquire() for _ in range(6)]
+    assert Counter(ep.url for ep in held) == {"http://a": 2, "http://b": 2, "http://c": 2}
+
+
+def test_ewma_prefers_fast_replica():
+    pool = EndpointPool(["http://fast", "http://slow"], policy="ewma")
+    for url, latency in (("http://fast", 0.01), ("http://slow", 0.5)):
+        ep = next(e for e in pool.endpoints if e.url == url)
+        ep.outstanding += 1
+        pool.release(ep, latency, ok=True)
+    picks = Counter()
+    for _ in range(10):
+        ep = pool.acquire()
+        picks[ep.url] += 1
+    # the fast replica absorbs many concurrent requests before the slow one is worth it
+    assert picks == {"http://fast": 10}
+
+
+def test_ewma_spreads_load_before_latencies_are_known():
+    pool = EndpointPool(["http://a", "http://b", "http://c"], policy="ewma")
+    held = [pool.acquire() for _ in range(6)]
+    assert Counter(ep.url for ep in held) == {"http://a": 2, "http://b": 2, "http://c": 2}
+    # an unmeasured replica counts as average, not free
+    fast = pool.endpoints[0]
+    pool.release(fast, 0.1, ok=True)
+    hanging = pool.endpoints[1]
+    assert pool._cost(hanging, pool._seed()) > pool._cost(fast, pool._seed())
+
+
+def test_failing_replica_is_ejected_then_restored(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("endpoints.time.monotonic", lambda: now[0])
+    pool = EndpointPool(["http://a", "http://b"], eject_after=2, eject_for=10)
+    bad = pool.endpoints[0]
+    for _ in range(2):
+        bad.outstanding += 1
+        pool.release(bad, 0.1, ok=False)
+    assert pool.healthy() == ["http://b"]
+    assert {pool.acquire().url for _ in range(5)} == {"http://b"}
+    now[0] += 11
+    assert pool.healthy() == ["http://a", "http://b"]
+
+
+def test_all_ejected_fails_open():
+    pool = EndpointPool(["http://a"], eject_after=1)
+    ep = pool.acquire()
+    pool.release(ep, 0.1, ok=False)
+    assert pool.acquire().url == "http://a"
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        EndpointPool(["http://a"], policy="random")
+
+
+class Resp:
+    def __init__(self, status):
+        self.status_code = status
+        self.text = json.dumps({"audio_urls": []})
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            err = Exception(f"HTTP {self.status_code}")
+            err.response = self
+            raise err
+
+
+def test_client_routes_and_tracks_health(monkeypatch):
+    hits = Counter()
+
+    def fake_post(url, **kwargs):
+        host = url.split("/")[2]
+        hits[host] += 1
+        return Resp(503 if host == "down" else 200)
+
+    monkeypatch.setattr("agent_client.requests.post", fake_post)
+    monkeypatch.setattr("endpoints.random.choice", lambda eps: eps[0])
+    client = IngestAgentClient("http://down,http://up")
+    assert client.pool is not None
+    for _ in range(10):
+        try:
+            client.discover("http://feed")
+        except Exception:
+            pass
+    assert hits["down"] == 3  # ejected after three consecutive 5xx
+    assert hits["up"] == 7
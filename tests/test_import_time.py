@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import budgets in microseconds, measured with ``-X importtime``.
+# Raise deliberately (and explain why in the commit) rather than to silence
+# a regression.  ``IMPORT_BUDGET_SCALE`` loosens them on slow CI runners.
+BUDGETS_US = {"spiceflow": 50_000, "cli": 150_000}
+SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+# Modules that must never be imported just to load the package or parse args.
+HEAVY = ("multiprocessing", "runpod_client", "analyzer", "workflow", "orchestrator", "requests")
+
+
+def _importtime(module: str) -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    return cumulative
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_US))
+def test_import_budget(module):
+    timings = _importtime(module)
+    assert module in timings
+    assert timings[module] <= BUDGETS_US[module] * SCALE, (
+        f"import {module} took {timings[module]}us (budget {BUDGETS_US[module]}us)"
+    )
+    assert not [m for m in HEAVY if m in timings]
+
+
+def test_run_workflow_defers_profiling():
+    timings = _importtime("run_workflow")
+    assert not [m for m in ("profiling", "cProfile", "tracemalloc") if m in timings]
@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+import lanes
+from lanes import BULK, INTERACTIVE, LaneDispatcher
+from orchestrator import PipelineOrchestrator
+
+
+def test_reserved_slot_stays_free_for_interactive():
+    async def scenario():
+        d = LaneDispatcher(capacity=3, reserved={INTERACTIVE: 1})
+        await d.acquire(BULK)
+        await d.acquire(BULK)
+        blocked = asyncio.create_task(d.acquire(BULK))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        await asyncio.wait_for(d.acquire(INTERACTIVE), 0.1)
+        assert d.stats()[BULK] == {"inflight": 2, "waiting": 1}
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions=True)
+        assert d.stats()[BULK]["waiting"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_weighted_fair_share_when_saturated():
+    async def scenario():
+        d = LaneDispatcher(capacity=1, weights={INTERACTIVE: 3, BULK: 1}, reserved={})
+        order = []
+        await d.acquire(BULK)
+
+        async def worker(lane):
+            async with d.slot(lane):
+                order.append(lane)
+
+        tasks = [asyncio.create_task(worker(lane)) for lane in [BULK] * 4 + [INTERACTIVE] * 4]
+        await asyncio.sleep(0)
+        d.release(BULK)
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    # interactive gets three slots for every bulk one, but bulk is not starved
+    assert order[:4].count(INTERACTIVE) == 3 and BULK in order[:4]
+
+
+def test_unknown_lane_and_overcommitted_reservation():
+    with pytest.raises(ValueError):
+        LaneDispatcher(capacity=1, reserved={INTERACTIVE: 2})
+    with pytest.raises(ValueError):
+        asyncio.run(LaneDispatcher().acquire("urgent"))
+
+
+class SlowIngest:
+    def discover(self, feed_url):
+        return [f"bulk{i}.mp3" for i in range(20)]
+
+    def transcribe(self, url):
+        time.sleep(0.05)
+        return url
+
+
+class Strategy:
+    def analyze(self, text):
+        return text
+
+
+def test_interactive_episode_skips_bulk_queue():
+    dispatchers = lanes.from_config({"lanes": {"capacity": 3, "reserved": {INTERACTIVE: 1}}})
+    orch = PipelineOrchestrator(SlowIngest(), Strategy(), dispatchers=dispatchers)
+
+    async def scenario():
+        bulk = asyncio.create_task(orch.run("http://feed", limit=20, parallel=True))
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        result = await orch.process("urgent.mp3")
+        waited = time.perf_counter() - start
+        await bulk
+        return result, waited
+
+    result, waited = asyncio.run(scenario())
+    assert result == {"url": "urgent.mp3", "key": "url:urgent.mp3/", "summary": "urgent.mp3"}
+    # one transcription, not a share of the 20-episode bulk queue
+    assert waited < 0.2
+
+
+def test_lowered_limit_still_queues_by_lane():
+    async def scenario():
+        limit = 3
+        d = LaneDispatcher(capacity=4, weights={INTERACTIVE: 4, BULK: 1}, reserved={INTERACTIVE: 1})
+        d.limit_by(lambda: limit)
+        await d.acquire(BULK)
+        await d.acquire(BULK)
+        bulk = [asyncio.create_task(d.acquire(BULK)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert not any(t.done() for t in bulk)
+        await asyncio.wait_for(d.acquire(INTERACTIVE), 0.1)
+        limit = 1
+        d.release(INTERACTIVE)
+        d.release(BULK)
+        urgent = asyncio.create_task(d.acquire(INTERACTIVE))
+        await asyncio.sleep(0)
+        d.release(BULK)
+        await asyncio.sleep(0)
+        # the single remaining slot goes to the interactive call, not the bulk queue
+        assert urgent.done() and not any(t.done() for t in bulk)
+        for t in bulk:
+            t.cancel()
+        await asyncio.gather(*bulk, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+class FlakyStrategy:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, text):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("transient")
+        return text
+
+
+def test_slot_is_released_between_retries():
+    dispatchers = lanes.from_config({"lanes": {"capacity": 1, "reserved": {}}})
+    strategy = FlakyStrategy()
+    orch = PipelineOrchestrator(SlowIngest(), strategy, dispatchers=dispatchers, adaptive=True)
+    seen = []
+    strategy_lane = dispatchers["strategy"]
+    original = strategy_lane.acquire
+
+    async def acquire(lane):
+        seen.append(strategy_lane.stats()[lane]["inflight"])
+        await original(lane)
+
+    strategy_lane.acquire = acquire
+    result = asyncio.run(orch.process("ep.mp3"))
+    assert result["summary"] == "ep.mp3"
+    assert strategy.calls == 2 and seen == [0, 0]
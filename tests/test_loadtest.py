@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from loadtest import AgentProfile, FakeAgentServer, drive, parse_latency, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_parse_latency():
+    assert parse_latency("const:0.5")() == 0.5
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")() <= 0.2
+    with pytest.raises(ValueError):
+        parse_latency("bogus:1")
+
+
+def test_drive_against_fake_agents():
+    ingest_routes = {"discover": AgentProfile(), "transcribe": AgentProfile(payload_bytes=100)}
+    strategy_routes = {"analyze": AgentProfile(payload_bytes=10)}
+    with FakeAgentServer(ingest_routes, episodes_per_feed=3) as ingest, FakeAgentServer(strategy_routes) as strategy:
+        report = asyncio.run(drive(ingest.url, strategy.url, episodes=5, rate=100, per_feed=3))
+    summary = report.summary()
+    assert summary["completed"] == 5
+    assert len(report.latencies) == 5
+    assert summary["stages"]["transcribe"]["calls"] == 5
+    assert summary["stages"]["discover"]["calls"] == 2
+    assert set(summary["latency_s"]) == {"p50", "p95", "p99"}
+
+
+def test_drive_with_compressed_strategy_requests():
+    ingest_routes = {"discover": AgentProfile(), "transcribe": AgentProfile(payload_bytes=5000)}
+    with FakeAgentServer(ingest_routes) as ingest, FakeAgentServer({"analyze": AgentProfile()}) as strategy:
+        report = asyncio.run(drive(ingest.url, strategy.url, episodes=3, rate=100, per_feed=3, compress_threshold=1000))
+    assert report.summary()["completed"] == 3
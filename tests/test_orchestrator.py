@@ -1,4 +1,5 @@
 import asyncio
+import time
 from orchestrator import PipelineOrchestrator, EventBus
 
 
@@ -69,3 +70,138 @@ def test_event_bus():
     assert events[0] == "discovered"
     assert events[-1] == "completed"
 
+
+class SlowFirstIngest(DummyIngest):
+    def transcribe(self, url: str):
+        import time
+        if url == "a.mp3":
+            time.sleep(0.05)
+        return super().transcribe(url)
+
+
+def test_run_iter_yields_in_completion_order():
+    orch = PipelineOrchestrator(SlowFirstIngest(), DummyStrategy())
+
+    async def collect():
+        return [res["url"] async for res in orch.run_iter("http://feed", parallel=True)]
+
+    assert asyncio.run(collect()) == ["b.mp3", "a.mp3"]
+
+
+def test_run_iter_writes_to_sink():
+    class ListSink:
+        def __init__(self):
+            self.items = []
+
+        def write(self, result):
+            self.items.append(result)
+
+    sink = ListSink()
+    orch = PipelineOrchestrator(DummyIngest(), DummyStrategy())
+
+    async def first_only():
+        async for res in orch.run_iter("http://feed", sink=sink):
+            return res
+
+    assert asyncio.run(first_only())["url"] == "a.mp3"
+    assert [r["url"] for r in sink.items] == ["a.mp3"]
+
+
+class SlowIngest(DummyIngest):
+    def transcribe(self, url: str):
+        if url == "b.mp3":
+            time.sleep(0.3)
+        return super().transcribe(url)
+
+
+def test_episode_deadline_cancels_slow_episode():
+    bus = EventBus()
+    missed = []
+    bus.on("deadline_exceeded", lambda url: missed.append(url))
+    orchestrator = PipelineOrchestrator(SlowIngest(), DummyStrategy(), bus=bus, episode_deadline=0.1)
+    result = asyncio.run(orchestrator.run("http://feed", limit=2, parallel=True))
+    assert [r["url"] for r in result] == ["a.mp3"]
+    assert missed == ["b.mp3"]
+
+
+def test_timeouts_are_bounded_by_run_deadline(monkeypatch):
+    from agent_client import IngestAgentClient
+
+    timeouts = []
+
+    class Resp:
+        text = '{"audio_urls": []}'
+
+        def raise_for_status(self):
+            pass
+
+    def fake_post(url, **kwargs):
+        timeouts.append(kwargs["timeout"])
+        return Resp()
+
+    monkeypatch.setattr("agent_client.requests.post", fake_post)
+    orchestrator = PipelineOrchestrator(IngestAgentClient("http://ingest"), DummyStrategy(), run_deadline=1)
+    asyncio.run(orchestrator.run("http://feed"))
+    assert 0 < timeouts[0] <= 1
+
+
+def test_run_deadline_bounds_rank_and_queue_workers(tmp_path):
+    from workqueue import WorkQueue
+
+    class Scoring(DummyStrategy):
+        def score(self, text):
+            return 1.0
+
+    bus = EventBus()
+    missed = []
+    bus.on("deadline_exceeded", lambda url: missed.append(url))
+    orchestrator = PipelineOrchestrator(SlowIngest(), Scoring(), bus=bus, run_deadline=0.1)
+    ranked = asyncio.run(orchestrator.rank(["http://feed"], k=5, limit=2, parallel=True))
+    assert [r["url"] for r in ranked] == ["a.mp3"]
+    assert missed == ["b.mp3"]
+
+    queue = WorkQueue(tmp_path / "queue.db")
+    queue.put("http://feed", ["a.mp3", "b.mp3"])
+    assert asyncio.run(orchestrator.work(queue, "w1", concurrency=2)) == 1
+
+
+class GoalStrategy:
+    def __init__(self):
+        self.calls = []
+
+    def analyze(self, text: str, goal: str | None = None):
+        self.calls.append(("analyze", text, goal))
+        return f"{goal}:{text}"
+
+    def analyze_goals(self, text: str, goals):
+        self.calls.append(("batch", text, tuple(goals)))
+        return {goal: f"{goal}:{text}" for goal in goals}
+
+
+def test_multi_goal_fan_out_transcribes_once():
+    ingest = DummyIngest()
+    strategy = GoalStrategy()
+    orchestrator = PipelineOrchestrator(ingest, strategy, goals=["growth", "risk", "growth"])
+    result = asyncio.run(orchestrator.run("http://feed", limit=2))
+    assert result[0]["summary"] == {"growth": "growth:text-a.mp3", "risk": "risk:text-a.mp3"}
+    assert ingest.calls.count(("transcribe", "a.mp3")) == 1
+    assert len(strategy.calls) == 4
+
+
+def test_multi_goal_batched_request():
+    strategy = GoalStrategy()
+    orchestrator = PipelineOrchestrator(DummyIngest(), strategy, goals=["growth", "risk"], batch_goals=True)
+    result = asyncio.run(orchestrator.run("http://feed", limit=2))
+    assert [c[0] for c in strategy.calls] == ["batch", "batch"]
+    assert result[1]["summary"]["risk"] == "risk:text-b.mp3"
+
+
+def test_cached_results_are_scoped_to_goal_set():
+    cache = {}
+    plain = PipelineOrchestrator(DummyIngest(), DummyStrategy(), cache=cache)
+    asyncio.run(plain.run("http://feed", limit=1))
+    strategy = GoalStrategy()
+    with_goals = PipelineOrchestrator(DummyIngest(), strategy, cache=cache, goals=["risk"])
+    result = asyncio.run(with_goals.run("http://feed", limit=1))
+    assert result[0]["summary"] == {"risk": "risk:text-a.mp3"}
+    assert len(strategy.calls) == 1
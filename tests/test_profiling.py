@@ -0,0 +1,52 @@
+import asyncio
+
+from orchestrator import EventBus, PipelineOrchestrator
+from profiling import RunProfiler, profile_run
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return ["a", "b"]
+
+    def transcribe(self, url):
+        return "x" * 10_000
+
+
+class Strategy:
+    def analyze(self, text):
+        return text.upper()
+
+
+def test_profile_run_writes_reports(tmp_path):
+    bus = EventBus()
+    orch = PipelineOrchestrator(Ingest(), Strategy(), bus=bus)
+    with profile_run(tmp_path, trace_malloc=5, bus=bus) as profiler:
+        asyncio.run(orch.run("feed"))
+    assert isinstance(profiler, RunProfiler)
+    assert profiler.stage == "done"
+    for name in ("profile.prof", "stacks.collapsed", "tracemalloc.txt"):
+        assert (profiler.out_dir / name).exists()
+    report = (profiler.out_dir / "tracemalloc.txt").read_text()
+    assert "Top 5 allocation sites" in report
+    assert set(profiler.stage_allocs) <= {"discover", "transcribe", "analyze"}
+
+
+def test_profile_run_sampling_can_skip(tmp_path):
+    with profile_run(tmp_path, rate=0.0) as profiler:
+        pass
+    assert profiler is None
+    assert not list(tmp_path.iterdir())
+    with profile_run(None) as profiler:
+        pass
+    assert profiler is None
+
+
+def test_collapsed_stacks_prefixed_with_stage(tmp_path):
+    bus = EventBus()
+    profiler = RunProfiler(tmp_path, cprofile=False, interval=0.001).attach(bus)
+    with profiler:
+        bus.emit("discovered", urls=[])
+        import time
+        time.sleep(0.02)
+    lines = (tmp_path / "stacks.collapsed").read_text().splitlines()
+    assert lines and all(line.split(";", 1)[0] in {"discover", "transcribe"} for line in lines)
@@ -0,0 +1,57 @@
+import asyncio
+
+from orchestrator import PipelineOrchestrator
+from ranking import TopK
+
+
+def test_topk_keeps_highest_scores():
+    top = TopK(2)
+    assert top.push(1, "a")
+    assert top.push(5, "b")
+    assert top.push(3, "c")
+    assert not top.push(2, "d")
+    assert top.items() == ["b", "c"]
+    assert len(top) == 2
+
+
+SCORES = {"f1": [5, 9, 1], "f2": [2, 7]}
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return [f"{feed_url}/{i}" for i in range(len(SCORES[feed_url]))]
+
+    def transcribe(self, url):
+        return url
+
+
+class Strategy:
+    def __init__(self):
+        self.analyzed = []
+
+    def score(self, text):
+        feed, idx = text.split("/")
+        return SCORES[feed][int(idx)]
+
+    def analyze(self, text):
+        self.analyzed.append(text)
+        return f"summary-{text}"
+
+
+def test_rank_across_feeds_skips_low_scores():
+    strategy = Strategy()
+    orch = PipelineOrchestrator(Ingest(), strategy)
+    results = asyncio.run(orch.rank(["f1", "f2"], k=2))
+    assert [(r["url"], r["score"]) for r in results] == [("f1/1", 9), ("f2/1", 7)]
+    assert results[0]["feed"] == "f1"
+    assert strategy.analyzed == ["f1/0", "f1/1", "f2/1"]
+
+
+def test_rank_reuses_cached_scored_results():
+    strategy = Strategy()
+    cache = {}
+    orch = PipelineOrchestrator(Ingest(), strategy, cache=cache)
+    first = asyncio.run(orch.rank(["f1"], k=1))
+    assert cache["f1/1"] == {"url": "f1/1", "key": "url:f1/1", "score": 9, "summary": "summary-f1/1"}
+    assert asyncio.run(orch.rank(["f1"], k=1)) == first
+    assert strategy.analyzed == ["f1/0", "f1/1"]
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import ratelimit
+from agent_client import StrategyAgentClient
+from ratelimit import TokenBucket
+
+
+class DummyResponse:
+    text = "ok"
+
+    def raise_for_status(self):
+        pass
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=100, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.005 < bucket.reserve() <= 0.011
+
+
+def test_bucket_shared_across_threads():
+    bucket = TokenBucket(rate=200, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.monotonic() - start >= 4 / 200 * 0.9
+
+
+def test_async_acquire_paces_tasks():
+    bucket = TokenBucket(rate=200, burst=1)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 4 / 200 * 0.9
+
+
+def test_priority_callers_go_first():
+    bucket = TokenBucket(rate=50, burst=1)
+    bucket.acquire()
+    order = []
+
+    def take(name, priority=False):
+        bucket.acquire(priority=priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=take, args=(f"bulk{i}",)) for i in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.005)
+    urgent = threading.Thread(target=take, args=("urgent", True))
+    urgent.start()
+    for t in threads + [urgent]:
+        t.join()
+    assert order[0] == "urgent"
+
+
+def test_clients_share_host_bucket(monkeypatch):
+    ratelimit.reset()
+    bucket = ratelimit.configure("http://strategy:8002", rate=1000, burst=3)
+    monkeypatch.setattr("agent_client.requests.post", lambda url, **kw: DummyResponse())
+    a = StrategyAgentClient("http://strategy:8002")
+    b = StrategyAgentClient("http://strategy:8002/")
+    a.analyze("x")
+    b.analyze("y")
+    assert 0.9 <= bucket._tokens <= 1.1
+    assert ratelimit.bucket_for("http://other") is None
+    ratelimit.reset()
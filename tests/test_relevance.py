@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+import relevance
+from orchestrator import EventBus, PipelineOrchestrator
+from relevance import RelevanceFilter
+
+TEXTS = [
+    "Carbon tax policy and carbon markets explained.",
+    "A cooking show about pasta and sauces.",
+    "Climate policy roundup with a short carbon segment and plenty of other news.",
+]
+
+
+def test_scores_rank_relevant_texts_higher():
+    scores = RelevanceFilter("carbon tax policy").scores(TEXTS)
+    assert scores[0] > scores[2] > scores[1] == 0
+
+
+def test_select_threshold_and_top_n():
+    keep, _ = RelevanceFilter("carbon policy").select(TEXTS)
+    assert keep == [0, 2]
+    keep, _ = RelevanceFilter("carbon policy", top_n=1).select(TEXTS)
+    assert keep == [0]
+
+
+def test_python_fallback_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    filt = RelevanceFilter("carbon tax policy")
+    vectorized = filt.scores(TEXTS)
+    monkeypatch.setattr(relevance, "np", None)
+    assert filt.scores(TEXTS) == pytest.approx(vectorized)
+
+
+def test_from_config():
+    assert relevance.from_config({}) is None
+    filt = relevance.from_config({"goal": "carbon", "min_relevance": "0.5", "top_n": "3"})
+    assert (filt.threshold, filt.top_n) == (0.5, 3)
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return ["0.mp3", "1.mp3", "2.mp3"]
+
+    def transcribe(self, url):
+        return TEXTS[int(url[0])]
+
+
+class Strategy:
+    def __init__(self):
+        self.calls = []
+
+    def analyze(self, text):
+        self.calls.append(text)
+        return "summary"
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_orchestrator_skips_irrelevant_transcripts(parallel):
+    bus = EventBus()
+    filtered = []
+    bus.on("filtered", lambda url, score: filtered.append(url))
+    strategy = Strategy()
+    orch = PipelineOrchestrator(Ingest(), strategy, bus=bus, prefilter=RelevanceFilter("carbon"))
+    results = asyncio.run(orch.run("http://feed", parallel=parallel))
+    assert sorted(r["url"] for r in results) == ["0.mp3", "2.mp3"]
+    assert filtered == ["1.mp3"]
+    assert TEXTS[1] not in strategy.calls
+
+
+def test_corpus_statistics_carry_across_batches():
+    streamed = RelevanceFilter("carbon policy")
+    streamed.select(TEXTS[:1])
+    keep, scores = streamed.select(TEXTS[1:])
+    assert scores == pytest.approx(RelevanceFilter("carbon policy").scores(TEXTS)[1:])
+    assert keep == [1]
+    assert streamed.docs == 3
+
+
+def test_prefilter_streams_in_batches():
+    seen_before_first_result = []
+
+    class CountingIngest(Ingest):
+        calls = 0
+
+        def transcribe(self, url):
+            CountingIngest.calls += 1
+            return super().transcribe(url)
+
+    async def first(orch):
+        async for _ in orch.run_iter("http://feed"):
+            seen_before_first_result.append(CountingIngest.calls)
+            return
+
+    orch = PipelineOrchestrator(CountingIngest(), Strategy(), prefilter=RelevanceFilter("carbon"), prefilter_batch=1)
+    asyncio.run(first(orch))
+    assert seen_before_first_result == [1]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_episode_deadline_spans_transcription_and_analysis(tmp_path, parallel):
+    import time
+
+    import tracing
+
+    class SlowIngest(Ingest):
+        def transcribe(self, url):
+            time.sleep(0.25)
+            return super().transcribe(url)
+
+    class SlowStrategy(Strategy):
+        def analyze(self, text):
+            time.sleep(0.25)
+            return super().analyze(text)
+
+    bus = EventBus()
+    missed = []
+    bus.on("deadline_exceeded", lambda url: missed.append(url))
+    exporter = tracing.JsonlExporter(tmp_path / "traces.jsonl")
+    tracing.configure(exporter)
+    try:
+        orch = PipelineOrchestrator(
+            SlowIngest(), SlowStrategy(), bus=bus, prefilter=RelevanceFilter("carbon"), episode_deadline=0.4
+        )
+        results = asyncio.run(orch.run("http://feed", limit=1, parallel=parallel))
+    finally:
+        tracing.reset()
+    assert results == []
+    assert missed == ["0.mp3"]
+    roots = [s for spans in tracing.load(exporter.path).values() for s in spans if s.parent_id is None]
+    assert [(s.name, s.status) for s in roots] == [("discover", "ok"), ("episode", "deadline")]
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+import time
+
+import results_store
+from results_store import DAY, ResultsStore
+
+
+def _count(path):
+    return sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def test_writes_are_batched_in_wal_mode(tmp_path):
+    path = tmp_path / "results.db"
+    store = ResultsStore(path, batch=2, flush_interval=3600)
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.write({"url": "a"})
+    assert _count(path) == 0
+    store.write({"url": "b"})
+    store._last.result()
+    assert _count(path) == 2
+    store.write({"url": "c"})
+    store.close()
+    assert _count(path) == 3
+
+
+def test_flush_interval_commits_a_partial_batch(tmp_path):
+    path = tmp_path / "results.db"
+    store = ResultsStore(path, batch=100, flush_interval=0)
+    store.write({"url": "a"})
+    store._last.result()
+    assert _count(path) == 1
+    store.close()
+
+
+def test_idle_buffer_is_committed_after_flush_interval(tmp_path):
+    path = tmp_path / "results.db"
+    store = ResultsStore(path, batch=100, flush_interval=0.05)
+    store.write({"url": "a", "score": 1.0})
+    assert _count(path) == 0
+    deadline = time.monotonic() + 5
+    while _count(path) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [r["url"] for r in store.top()] == ["a"]
+    store.close()
+
+
+def test_migrates_old_sink_table(tmp_path):
+    path = tmp_path / "results.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE results (id INTEGER PRIMARY KEY, url TEXT, created REAL, data TEXT)")
+    conn.execute(
+        "INSERT INTO results (url, created, data) VALUES (?, ?, ?)",
+        ("a", 1.0, json.dumps({"url": "a", "key": "ep-a", "score": 2.0})),
+    )
+    conn.commit()
+    conn.close()
+    with ResultsStore(path, feed="x") as store:
+        store.write({"url": "b", "score": 1.0})
+        store.flush()
+        assert [(r["url"], r["score"]) for r in store.top()] == [("a", 2.0), ("b", 1.0)]
+        assert [r["url"] for r in store.episode("ep-a")] == ["a"]
+
+
+def test_top_this_week_for_feed(tmp_path):
+    now = time.time()
+    with ResultsStore(tmp_path / "results.db") as store:
+        feed_x = store.for_feed("x")
+        feed_x.write({"url": "old", "score": 9.0, "created": now - 10 * DAY})
+        feed_x.write({"url": "good", "key": "ep-good", "score": 5.0, "created": now - DAY})
+        feed_x.write({"url": "better", "score": 7.0, "created": now - 2 * DAY})
+        feed_x.write({"url": "unscored", "created": now})
+        store.write({"url": "other", "score": 8.0, "created": now}, feed="y")
+        feed_x.close()
+
+        top = store.top("x", since=now - 7 * DAY)
+        assert [r["url"] for r in top] == ["better", "good"]
+        assert top[0]["feed"] == "x" and top[0]["score"] == 7.0
+        assert [r["url"] for r in store.top(limit=2)] == ["old", "other"]
+        assert [r["url"] for r in store.recent("x", limit=2)] == ["unscored", "good"]
+        assert [r["url"] for r in store.episode("ep-good")] == ["good"]
+
+
+def test_top_query_uses_an_index(tmp_path):
+    with ResultsStore(tmp_path / "results.db") as store:
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM results WHERE feed = ? AND created >= ? "
+            "AND score IS NOT NULL ORDER BY score DESC LIMIT 10",
+            ("x", 0.0),
+        ).fetchall()
+    assert any("USING INDEX" in row[-1] for row in plan)
+
+
+def test_cli_top(tmp_path, capsys):
+    path = tmp_path / "results.db"
+    with ResultsStore(path, feed="x") as store:
+        store.write({"url": "a", "score": 1.0})
+        store.write({"url": "b", "score": 2.0})
+    results_store.main(["top", "--db", str(path), "--feed", "x", "--days", "7", "--limit", "1"])
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["url"] for r in rows] == ["b"]
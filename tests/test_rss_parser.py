@@ -0,0 +1,55 @@
+from datetime import timezone
+
+from rss_parser import Episode, RSSParser, canonical_url
+
+FEED = """<rss><channel>
+<item>
+  <guid isPermaLink="false"> ep-2 </guid>
+  <pubDate>Tue, 02 Jan 2024 10:00:00 +0000</pubDate>
+  <enclosure url="https://dts.podtrac.com/redirect.mp3/cdn.example.com/2.mp3?utm=x" length="1234"/>
+</item>
+<item>
+  <pubDate>not a date</pubDate>
+  <enclosure url="https://cdn.example.com/1.mp3"/>
+</item>
+<item><title>no audio</title></item>
+</channel></rss>"""
+
+
+def test_extract_episodes_metadata():
+    episodes = RSSParser().extract_episodes(FEED)
+    assert len(episodes) == 2
+    first, second = episodes
+    assert first.guid == "ep-2"
+    assert first.length == 1234
+    assert first.published.tzinfo == timezone.utc and first.published.day == 2
+    assert second.guid is None and second.published is None
+
+
+def test_canonical_url_strips_tracking_redirects_and_params():
+    assert canonical_url(
+        "https://dts.podtrac.com/redirect.mp3/cdn.example.com/2.mp3?utm_source=x"
+    ) == "cdn.example.com/2.mp3"
+    assert canonical_url(
+        "https://chtbl.com/track/ABC/traffic.example.com/ep.mp3#t=1"
+    ) == canonical_url("http://WWW.traffic.example.com/ep.mp3?utm_medium=rss&fbclid=1")
+
+
+def test_canonical_url_keeps_identifying_params():
+    assert canonical_url("https://host/play?id=2&utm_campaign=x") == "host/play?id=2"
+    assert canonical_url("https://host/play?id=1") != canonical_url("https://host/play?id=2")
+    assert canonical_url("https://host/play?b=2&a=1") == canonical_url("https://host/play?a=1&b=2")
+
+
+def test_episode_key_prefers_guid():
+    assert Episode("http://a/1.mp3?x=1", guid="g").key == "guid:g"
+    assert Episode("http://a/1.mp3?utm_source=a").key == Episode("https://a/1.mp3?utm_source=b").key
+
+
+def test_guid_keys_are_scoped_by_feed():
+    a = Episode("http://a/1.mp3", guid="1", feed="https://feeds.a.com/rss")
+    b = Episode("http://b/1.mp3", guid="1", feed="https://feeds.b.com/rss")
+    assert a.key != b.key
+    assert a.key == Episode("http://a/x.mp3", guid="1", feed="http://feeds.a.com/rss").key
+    parsed = RSSParser().extract_episodes(FEED, "https://f/rss")[0]
+    assert parsed.key == "guid:f/rss|ep-2"
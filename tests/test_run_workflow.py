@@ -0,0 +1,26 @@
+import ratelimit
+from run_workflow import build_orchestrator
+
+
+def test_build_orchestrator_applies_every_config_key():
+    ratelimit.reset()
+    cfg = {
+        "ingest_urls": ["http://i1", "http://i2"],
+        "strategy_url": "http://s",
+        "balance": "ewma",
+        "compress_threshold": 1024,
+        "max_timeout": 120,
+        "rate_limits": {"http://s": {"rate": 5}},
+        "adaptive": True,
+        "goals": ["risk"],
+        "lanes": {"capacity": 4},
+    }
+    orch = build_orchestrator(cfg)
+    assert [ep.url for ep in orch.ingest.pool.endpoints] == ["http://i1", "http://i2"]
+    assert orch.ingest.pool.policy == "ewma"
+    assert orch.strategy.compress_threshold == 1024
+    assert orch.ingest.max_timeout == 120
+    assert ratelimit.bucket_for("http://s").rate == 5
+    assert set(orch.limiters) == set(orch.dispatchers) == {"ingest", "strategy"}
+    assert orch.goals == ["risk"]
+    ratelimit.reset()
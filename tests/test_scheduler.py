@@ -57,3 +57,32 @@ def test_yaml_loading(tmp_path):
     sched = Scheduler.from_yaml(conf, {"job": job})
     sched.run_pending()
     assert Path(cfg["state_file"]).exists()
+
+
+def test_future_task_recorded_when_it_completes(tmp_path):
+    import asyncio
+
+    state = tmp_path / "state.json"
+
+    async def scenario():
+        fut = asyncio.get_running_loop().create_future()
+        sched = Scheduler([Task("t", lambda: fut, 0)], state)
+        sched.run_pending()
+        assert sched.history["t"][-1]["status"] == "running"
+        sched.run_pending()  # still running: not started again
+        assert len(sched.history["t"]) == 1
+        fut.set_exception(ValueError("boom"))
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert [run["status"] for run in json.loads(state.read_text())["t"]] == ["fail:boom"]
+
+
+def test_state_file_from_other_task_set(tmp_path):
+    state = tmp_path / "state.json"
+    state.write_text(json.dumps({"old": [{"time": 0, "status": "running"}]}))
+    calls = []
+    sched = Scheduler([Task("new", lambda: calls.append(1), 0)], state)
+    sched.run_pending()
+    assert calls == [1]
+    assert sched.history["old"][-1]["status"] == "interrupted"
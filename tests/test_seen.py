@@ -0,0 +1,35 @@
+from seen import BloomFilter, SeenIndex
+
+
+def test_bloom_filter_roundtrip():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"k{i}")
+    assert all(f"k{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+    clone = BloomFilter.from_bytes(bloom.to_bytes())
+    assert "k1" in clone and clone.size == bloom.size
+
+
+def test_seen_index_persists(tmp_path):
+    path = tmp_path / "seen.db"
+    index = SeenIndex(path, capacity=100)
+    assert index.add("guid:a")
+    assert not index.add("guid:a")
+    assert index.add_many(["guid:b", "guid:c", "guid:a"]) == 2
+    assert "guid:b" in index and "guid:z" not in index
+    index.close()
+
+    reopened = SeenIndex(path, capacity=100)
+    assert len(reopened) == 3
+    assert "guid:c" in reopened
+
+
+def test_seen_index_rebuilds_stale_bloom(tmp_path):
+    path = tmp_path / "seen.db"
+    index = SeenIndex(path, capacity=100)
+    index.flush()
+    index.add("guid:late")  # added after the bloom was saved, never flushed
+    index._conn.close()
+    assert "guid:late" in SeenIndex(path, capacity=100)
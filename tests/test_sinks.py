@@ -0,0 +1,28 @@
+import json
+import sqlite3
+
+from sinks import JsonlSink, SqliteSink
+
+
+def test_jsonl_sink_appends_and_flushes(tmp_path):
+    path = tmp_path / "out.jsonl"
+    with JsonlSink(path) as sink:
+        sink.write({"url": "a", "summary": "s"})
+        assert json.loads(path.read_text()) == {"url": "a", "summary": "s"}
+    with JsonlSink(path) as sink:
+        sink.write({"url": "b"})
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_sqlite_sink_batches_commits(tmp_path):
+    path = tmp_path / "out.db"
+    sink = SqliteSink(path, batch=2, flush_interval=3600)
+    sink.write({"url": "a"})
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+    sink.write({"url": "b"})
+    sink._last.result()
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0] == 2
+    sink.write({"url": "c"})
+    sink.close()
+    rows = sqlite3.connect(path).execute("SELECT url FROM results ORDER BY id").fetchall()
+    assert rows == [("a",), ("b",), ("c",)]
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+import tracing
+from orchestrator import PipelineOrchestrator
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    exp = tracing.JsonlExporter(tmp_path / "traces.jsonl")
+    tracing.configure(exp)
+    yield exp
+    tracing.reset()
+
+
+def test_span_is_noop_without_exporter():
+    with tracing.span("x") as sp:
+        assert sp is None
+        assert tracing.traceparent() is None
+
+
+def test_nested_spans_share_trace(exporter):
+    with tracing.span("outer", root=True) as outer:
+        with tracing.span("inner") as inner:
+            assert tracing.traceparent() == f"00-{outer.trace_id}-{inner.span_id}-01"
+    spans = [json.loads(line) for line in exporter.path.read_text().splitlines()]
+    assert [s["name"] for s in spans] == ["inner", "outer"]
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return ["a.mp3", "b.mp3"]
+
+    def transcribe(self, url):
+        return tracing.traceparent()
+
+
+class Strategy:
+    def analyze(self, text):
+        return text
+
+
+def test_orchestrator_emits_episode_traces(exporter):
+    orch = PipelineOrchestrator(Ingest(), Strategy(), retries=0)
+    results = asyncio.run(orch.run("http://feed", parallel=True))
+    assert len(results) == 2
+    traces = tracing.load(exporter.path)
+    # one discover trace plus one trace per episode
+    assert len(traces) == 3
+    episode = next(spans for spans in traces.values() if any(s.name == "episode" for s in spans))
+    names = {s.name for s in episode}
+    assert {"episode", "ingest.transcribe", "strategy.analyze", "attempt"} <= names
+    # the context seen inside the agent call points into an episode trace
+    _, trace_id, span_id, _ = results[0]["summary"].split("-")
+    assert any(s.span_id == span_id and s.name == "attempt" for s in traces[trace_id])
+
+
+def test_waterfall_lists_slowest_first(exporter):
+    for name, dur in (("fast", 0.0), ("slow", 0.02)):
+        with tracing.span(name, root=True):
+            with tracing.span("child"):
+                asyncio.run(asyncio.sleep(dur))
+    slowest = tracing.slowest(tracing.load(exporter.path), 1)
+    text = tracing.waterfall(slowest[0])
+    assert "slow" in text and "  child" in text
@@ -0,0 +1,73 @@
+import pytest
+
+from transcript_index import QuerySyntaxError, TranscriptIndex, decode_positions, encode_positions
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = TranscriptIndex(tmp_path / "index.db")
+    idx.add("a.md", "The carbon tax debate: a tax on carbon emissions.")
+    idx.add("b.md", "Interview about climate policy and carbon markets.")
+    idx.add("c.md", "Sponsor read, then climate news and a carbon tax update.")
+    yield idx
+    idx.close()
+
+
+def test_positions_roundtrip():
+    positions = [0, 1, 5, 130, 20000]
+    assert decode_positions(encode_positions(positions)) == positions
+    assert len(encode_positions([0, 1, 2])) == 3
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("carbon", ["a.md", "b.md", "c.md"]),
+        ('"carbon tax"', ["a.md", "c.md"]),
+        ('"tax carbon"', []),
+        ("climate carbon", ["b.md", "c.md"]),
+        ("climate AND -sponsor", ["b.md"]),
+        ('carbon -"carbon tax"', ["b.md"]),
+        ("debate OR markets", ["a.md", "b.md"]),
+        ('NOT (climate OR debate)', []),
+        ('("carbon tax" OR markets) NOT sponsor', ["a.md", "b.md"]),
+        ("", []),
+    ],
+)
+def test_search(index, query, expected):
+    assert index.search(query) == expected
+
+
+def test_readding_replaces_document(index):
+    index.add("a.md", "Now about fisheries.")
+    assert index.search("debate") == []
+    assert index.search("fisheries") == ["a.md"]
+    assert len(index) == 3
+
+
+def test_persists(tmp_path, index):
+    index.close()
+    reopened = TranscriptIndex(tmp_path / "index.db")
+    assert reopened.search('"carbon markets"') == ["b.md"]
+    reopened.close()
+
+
+def test_syntax_errors(index):
+    with pytest.raises(QuerySyntaxError):
+        index.search("(carbon")
+    with pytest.raises(QuerySyntaxError):
+        index.search("carbon)")
+
+
+def test_rebuild_matches_live_index(tmp_path):
+    from transcript_index import format_transcript
+
+    live = TranscriptIndex(tmp_path / "live.db")
+    live.add("ep.md", "growth strategy", url="https://cdn.example.com/ep.mp3")
+    (tmp_path / "t").mkdir()
+    (tmp_path / "t" / "ep.md").write_text(format_transcript("https://cdn.example.com/ep.mp3", "growth strategy"))
+    rebuilt = TranscriptIndex(tmp_path / "rebuilt.db")
+    assert rebuilt.add_directory(tmp_path / "t") == 1
+    assert rebuilt.search("transcript OR cdn") == []
+    for term in ("growth", "strategy", "transcript", "cdn"):
+        assert rebuilt.document_frequency(term) == live.document_frequency(term)
@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+
+from rss_parser import Episode, RSSParser
+from watermark import Watermarks
+from workflow import WorkflowManager
+
+
+def _feed(n):
+    items = "".join(
+        f"<item><guid>ep{i}</guid><pubDate>Mon, {i:02d} Jan 2024 00:00:00 +0000</pubDate>"
+        f'<enclosure url="http://cdn/{i}.mp3"/></item>'
+        for i in range(n, 0, -1)
+    )
+    return f"<rss><channel>{items}</channel></rss>"
+
+
+class CountingParser(RSSParser):
+    def __init__(self):
+        self.parsed = 0
+
+    def iter_episodes(self, source):
+        for ep in super().iter_episodes(source):
+            self.parsed += 1
+            yield ep
+
+
+class Client:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, url):
+        self.calls.append(url)
+        return "t"
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def test_watermark_is_new_by_key_and_date(tmp_path):
+    marks = Watermarks(tmp_path / "marks.json")
+    old = Episode("u1", guid="a", published=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    new = Episode("u2", guid="b", published=datetime(2024, 1, 2, tzinfo=timezone.utc))
+    assert marks.is_new("f", old)
+    marks.advance("f", new)
+    marks.advance("f", old)  # never moves backwards
+    assert not marks.is_new("f", new) and not marks.is_new("f", old)
+    marks.save()
+    assert Watermarks(tmp_path / "marks.json").marks["f"]["key"] == "guid:b"
+
+
+def test_incremental_runs_stop_at_watermark(tmp_path, monkeypatch):
+    feed = {"xml": _feed(3)}
+    monkeypatch.setattr("spiceflow.workflow.requests.get", lambda url: Response(feed["xml"]))
+    parser, client = CountingParser(), Client()
+    manager = WorkflowManager(
+        "http://feed",
+        transcripts_dir=tmp_path / "t",
+        parser=parser,
+        client=client,
+        watermarks=Watermarks(tmp_path / "marks.json"),
+    )
+    manager.run()
+    assert client.calls == ["http://cdn/1.mp3", "http://cdn/2.mp3", "http://cdn/3.mp3"]
+
+    feed["xml"] = _feed(5)
+    parser.parsed = 0
+    manager.run()
+    assert client.calls[3:] == ["http://cdn/4.mp3", "http://cdn/5.mp3"]
+    # parsing stopped at the watermarked item instead of reading all five
+    assert parser.parsed == 3
+
+
+def test_first_run_takes_newest_episodes(tmp_path, monkeypatch):
+    monkeypatch.setattr("spiceflow.workflow.requests.get", lambda url: Response(_feed(5)))
+    client = Client()
+    manager = WorkflowManager(
+        "http://feed", transcripts_dir=tmp_path / "t", client=client, watermarks=Watermarks(tmp_path / "m.json")
+    )
+    assert [ep.url for ep in manager.get_new_episodes(limit=2)] == ["http://cdn/4.mp3", "http://cdn/5.mp3"]
+
+
+def test_mixed_timezones_and_undated_items(tmp_path):
+    feed = """<rss><channel>
+    <item><guid>c</guid><pubDate>Wed, 03 Jan 2024 00:00:00 -0000</pubDate><enclosure url="http://cdn/c.mp3"/></item>
+    <item><guid>u</guid><enclosure url="http://cdn/u.mp3"/></item>
+    <item><guid>a</guid><pubDate>Mon, 01 Jan 2024 00:00:00 +0100</pubDate><enclosure url="http://cdn/a.mp3"/></item>
+    </channel></rss>"""
+    c, u, a = RSSParser().extract_episodes(feed)
+    assert c.published.tzinfo == timezone.utc
+    marks = Watermarks(tmp_path / "marks.json")
+    marks.advance("f", a)
+    marks.advance("f", u)  # undated: the key moves, the date is kept
+    assert marks.marks["f"]["key"] == "guid:u" and marks.marks["f"]["published"].startswith("2023-12-31")
+    assert marks.is_new("f", c) and not marks.is_new("f", a)
+    marks.advance("f", c)
+    assert marks.marks["f"]["key"] == "guid:c"
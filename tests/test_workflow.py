@@ -46,3 +46,60 @@ def test_workflow_creates_markdown_files(tmp_path, monkeypatch):
     files = sorted(transcripts_dir.glob("*.md"))
     assert len(files) == 2
     assert all("dummy transcript" in f.read_text() for f in files)
+
+
+class EpisodeParser:
+    def extract_episodes(self, xml_content: str):
+        from rss_parser import Episode
+        return [
+            Episode("http://cdn.example.com/1.mp3?token=a", guid="g1"),
+            Episode("http://cdn.example.com/2.mp3"),
+        ]
+
+
+def test_workflow_skips_seen_episodes(tmp_path, monkeypatch):
+    from seen import SeenIndex
+
+    monkeypatch.setattr("spiceflow.workflow.requests.get", lambda url: DummyResponse("<rss/>"))
+    seen = SeenIndex(tmp_path / "seen.db")
+    seen.add("guid:feed/|g1")
+    client = DummyClient()
+    manager = WorkflowManager(
+        "http://feed", transcripts_dir=tmp_path / "t", parser=EpisodeParser(), client=client, seen=seen
+    )
+    manager.run()
+    assert client.calls == ["http://cdn.example.com/2.mp3"]
+    assert "url:cdn.example.com/2.mp3" in seen
+    assert seen.bloom_path.exists()  # flushed at the end of the run
+
+
+def test_workflow_indexes_transcripts(tmp_path, monkeypatch):
+    from transcript_index import TranscriptIndex
+
+    monkeypatch.setattr("spiceflow.workflow.requests.get", lambda url: DummyResponse("<rss/>"))
+    index = TranscriptIndex(tmp_path / "index.db")
+    manager = WorkflowManager(
+        "http://feed", transcripts_dir=tmp_path / "t", parser=EpisodeParser(), client=DummyClient(), index=index
+    )
+    manager.run()
+    assert index.search('"dummy transcript"') == ["1.md", "2.md"]
+
+
+def test_workflow_from_config_replays_feed_and_transcripts(tmp_path, monkeypatch):
+    from cassette import Cassette
+    from workflow import from_config
+
+    feed = "<rss><channel><item><guid>g1</guid><enclosure url='http://x/ep1.mp3'/></item></channel></rss>"
+    monkeypatch.setattr("spiceflow.workflow.requests.get", lambda url: DummyResponse(feed))
+    cfg = {"transcripts_dir": str(tmp_path / "rec")}
+    with Cassette(tmp_path / "tape.gz", "record") as tape:
+        from_config("http://feed", cfg, tape).run()
+
+    def offline(url):
+        raise AssertionError("feed fetched live")
+
+    monkeypatch.setattr("spiceflow.workflow.requests.get", offline)
+    cfg = {"transcripts_dir": str(tmp_path / "replay")}
+    with Cassette(tmp_path / "tape.gz", "replay", speed=0) as tape:
+        from_config("http://feed", cfg, tape).run()
+    assert (tmp_path / "replay" / "ep1.md").read_text() == (tmp_path / "rec" / "ep1.md").read_text()
@@ -0,0 +1,77 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "navigator-pipeline-coach" / "STARTER_CODE"))
+import pytest
+
+from workflow_engine import TaskStatus, WorkflowEngine
+
+
+class FakeAgent:
+    def __init__(self, delays, fail=()):
+        self.delays = delays
+        self.fail = set(fail)
+        self.inflight = 0
+        self.peak = 0
+        self.seen = {}
+
+    async def call(self, action, inputs):
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        self.seen[action] = inputs
+        await asyncio.sleep(self.delays.get(action, 0.01))
+        self.inflight -= 1
+        if action in self.fail:
+            raise RuntimeError("boom")
+        return {"action": action}
+
+
+def _engine(fail=()):
+    engine = WorkflowEngine()
+    agent = FakeAgent({"slow": 0.1, "fast": 0.02, "after_fast": 0.02, "join": 0.01}, fail)
+    engine.agents = {"ingest": agent, "strategy": agent, "ui": agent}
+    return engine, agent
+
+
+def test_dag_starts_tasks_when_inputs_ready():
+    engine, agent = _engine()
+    p = engine.create_pipeline("p")
+    slow = engine.add_dag_task(p, "slow", "ingest", {})
+    fast = engine.add_dag_task(p, "fast", "strategy", {})
+    after = engine.add_dag_task(p, "after_fast", "strategy", {}, depends_on=[fast])
+    engine.add_dag_task(p, "join", "ui", {}, depends_on=[slow, after])
+    result = asyncio.run(engine.execute_dag(p, {"goal": "g"}))
+    assert result["status"] == "success"
+    # after_fast overlaps with slow, so wall time tracks the critical path
+    assert result["wall_seconds"] < 0.1 + 0.02 + 0.01 + 0.05
+    assert result["critical_path"] == ["slow", "join"]
+    assert agent.seen["join"]["upstream"] == {"slow": {"action": "slow"}, "after_fast": {"action": "after_fast"}}
+    assert agent.seen["join"]["goal"] == "g"
+
+
+def test_dag_respects_agent_concurrency():
+    engine, agent = _engine()
+    p = engine.create_pipeline("p")
+    for i in range(4):
+        engine.add_dag_task(p, f"t{i}", "strategy", {})
+    asyncio.run(engine.execute_dag(p, {}, concurrency={"strategy": 2}))
+    assert agent.peak == 2
+
+
+def test_dag_failure_skips_dependents():
+    engine, _ = _engine(fail={"fast"})
+    p = engine.create_pipeline("p")
+    fast = engine.add_dag_task(p, "fast", "strategy", {})
+    child = engine.add_dag_task(p, "after_fast", "strategy", {}, depends_on=[fast])
+    result = asyncio.run(engine.execute_dag(p, {}))
+    assert result["failed"] == ["fast", "after_fast"]
+    assert child.status == TaskStatus.FAILED and child.started is None
+
+
+def test_unknown_dependency_rejected():
+    engine, _ = _engine()
+    p, other = engine.create_pipeline("p"), engine.create_pipeline("q")
+    foreign = engine.add_dag_task(other, "x", "ingest", {})
+    with pytest.raises(ValueError):
+        engine.add_dag_task(p, "y", "ingest", {}, depends_on=[foreign])
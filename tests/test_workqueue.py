@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from orchestrator import PipelineOrchestrator
+from workqueue import WorkQueue
+
+
+def test_claim_ack_and_idempotent_put(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+    assert q.put("feed", ["a", "b"]) == 2
+    assert q.put("feed", ["a", "c"]) == 1
+    lease = q.claim("w1")
+    assert lease.url == "a" and lease.attempts == 1
+    assert q.claim("w2").url == "b"
+    assert q.ack(lease)
+    assert q.counts() == {"done": 1, "leased": 1, "ready": 1}
+
+
+def test_failed_put_enqueues_nothing(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+
+    def urls():
+        yield "a.mp3"
+        raise OSError("feed read failed")
+
+    with pytest.raises(OSError):
+        q.put("feed", urls())
+    assert q.counts() == {}
+    assert q.put("feed", ["a.mp3", "b.mp3"]) == 2
+
+
+def test_expired_lease_is_redelivered(tmp_path):
+    path = tmp_path / "q.db"
+    q1 = WorkQueue(path, visibility=0.05)
+    q2 = WorkQueue(path, visibility=0.05)
+    q1.put("feed", ["a"])
+    lease = q1.claim("w1")
+    assert q2.claim("w2") is None
+    time.sleep(0.06)
+    again = q2.claim("w2")
+    assert again.url == "a" and again.attempts == 2
+    # the first worker lost its lease and can no longer ack or renew it
+    assert not q1.ack(lease)
+    assert not q1.heartbeat(lease)
+    assert q2.ack(again)
+
+
+def test_dead_letter_after_max_attempts(tmp_path):
+    q = WorkQueue(tmp_path / "q.db", max_attempts=1)
+    q.put("feed", ["a"])
+    assert q.nack(q.claim("w"))
+    assert q.claim("w") is None
+    assert q.counts() == {"dead": 1}
+
+
+class Ingest:
+    def discover(self, feed_url):
+        return ["a", "b", "c"]
+
+    def transcribe(self, url):
+        return f"text-{url}"
+
+
+class Strategy:
+    def analyze(self, text):
+        return text
+
+
+def test_workers_split_queue(tmp_path):
+    path = tmp_path / "q.db"
+    orch = PipelineOrchestrator(Ingest(), Strategy())
+    assert asyncio.run(orch.enqueue("feed", WorkQueue(path))) == 3
+
+    async def two_workers():
+        return await asyncio.gather(
+            orch.work(WorkQueue(path), "w1"), orch.work(WorkQueue(path), "w2", concurrency=2)
+        )
+
+    done = asyncio.run(two_workers())
+    assert sum(done) == 3
+    assert WorkQueue(path).counts() == {"done": 3}
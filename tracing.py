@@ -0,0 +1,171 @@
+"""Lightweight tracing: spans in a context variable, exported as JSON lines.
+
+Tracing is off until :func:`configure` installs an exporter; until then
+:func:`span` yields ``None`` and costs one context-variable lookup.
+Spans follow the same context rules as :mod:`deadline`, so agent calls
+running in worker threads nest under the episode that issued them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Protocol
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation within a trace."""
+
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start: float
+    end: float = 0.0
+    status: str = "ok"
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Exporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class JsonlExporter:
+    """Append finished spans to ``path``, one JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(asdict(span), default=str) + "\n"
+        with self._lock, open(self.path, "a") as fh:
+            fh.write(line)
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+_exporter: Optional[Exporter] = None
+
+
+def configure(exporter: Optional[Exporter]) -> None:
+    global _exporter
+    _exporter = exporter
+
+
+def configure_from(path: str | Path | None) -> None:
+    """Export to the JSON-lines file ``path``; ``None`` leaves tracing off."""
+    if path:
+        configure(JsonlExporter(path))
+
+
+def reset() -> None:
+    configure(None)
+
+
+def current() -> Optional[Span]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def span(name: str, root: bool = False, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the current span.
+
+    ``root=True`` starts a new trace.  Exceptions mark the span ``error``;
+    callers may also set ``status`` on the yielded span.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+    parent = None if root else _current.get()
+    trace_id = parent.trace_id if parent else os.urandom(16).hex()
+    sp = Span(trace_id, os.urandom(8).hex(), parent.span_id if parent else None, name, time.time(), attrs=attrs)
+    token = _current.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.status = "error"
+        sp.attrs["error"] = repr(e)
+        raise
+    finally:
+        _current.reset(token)
+        sp.end = time.time()
+        exporter.export(sp)
+
+
+def traceparent() -> Optional[str]:
+    """W3C ``traceparent`` header value for the current span, if any."""
+    sp = _current.get()
+    return f"00-{sp.trace_id}-{sp.span_id}-01" if sp else None
+
+
+# ----------------------------------------------------------
+def load(path: str | Path) -> dict[str, list[Span]]:
+    """Read an exported file and group its spans by trace."""
+    traces: dict[str, list[Span]] = defaultdict(list)
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                sp = Span(**json.loads(line))
+                traces[sp.trace_id].append(sp)
+    return traces
+
+
+def slowest(traces: dict[str, list[Span]], n: int = 10) -> list[list[Span]]:
+    """The ``n`` traces with the longest wall time, slowest first."""
+
+    def wall(spans: list[Span]) -> float:
+        return max(s.end for s in spans) - min(s.start for s in spans)
+
+    return sorted(traces.values(), key=wall, reverse=True)[:n]
+
+
+def waterfall(spans: list[Span], width: int = 40) -> str:
+    """Render one trace as an indented span tree with timeline bars."""
+    start = min(s.start for s in spans)
+    total = max(s.end for s in spans) - start or 1e-9
+    children: dict[Optional[str], list[Span]] = defaultdict(list)
+    ids = {s.span_id for s in spans}
+    for s in sorted(spans, key=lambda s: s.start):
+        children[s.parent_id if s.parent_id in ids else None].append(s)
+
+    lines = [f"trace {spans[0].trace_id}  {total * 1000:.1f} ms"]
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for s in children.get(parent, []):
+            left = int((s.start - start) / total * width)
+            bar = max(1, int(s.duration / total * width))
+            label = ("  " * depth + s.name)[:36]
+            status = "" if s.status == "ok" else f"  [{s.status}]"
+            lines.append(
+                f"  {label:<36} {(s.start - start) * 1000:>9.1f} {s.duration * 1000:>9.1f} ms "
+                f"|{' ' * left}{'#' * bar:<{width - left}}|{status}"
+            )
+            walk(s.span_id, depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py traces``."""
+    parser = argparse.ArgumentParser(prog="cli.py traces", description="Show the slowest recorded traces")
+    parser.add_argument("file", nargs="?", default="traces.jsonl")
+    parser.add_argument("-n", "--top", type=int, default=5)
+    args = parser.parse_args(argv)
+    for spans in slowest(load(args.file), args.top):
+        print(waterfall(spans))
+        print()
@@ -0,0 +1,284 @@
+"""Incremental inverted index over stored transcripts."""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    url TEXT,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+"""
+
+_WORD = re.compile(r"\w+")
+_QUERY_TOKEN = re.compile(r'-?"[^"]*"|[()]|[^\s()"]+')
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def format_transcript(url: str, transcript: str) -> str:
+    """Markdown file content the workflow writes for one transcript."""
+    return f"# Transcript\n\nURL: {url}\n\n{transcript}\n"
+
+
+def parse_transcript(content: str) -> tuple[Optional[str], str]:
+    """Split a file written by :func:`format_transcript` into ``(url, transcript)``.
+
+    Files without the header are returned whole, with no URL.
+    """
+    header, sep, rest = content.partition("\n\n")
+    if header != "# Transcript" or not sep:
+        return None, content
+    url_line, sep, body = rest.partition("\n\n")
+    if not url_line.startswith("URL: "):
+        return None, rest
+    return url_line[len("URL: "):], body.removesuffix("\n")
+
+
+def encode_positions(positions: Iterable[int]) -> bytes:
+    """Delta + varint encode ascending positions."""
+    out = bytearray()
+    prev = 0
+    for pos in positions:
+        delta, prev = pos - prev, pos
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_positions(data: bytes) -> list[int]:
+    positions = []
+    value = shift = prev = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        prev += value
+        positions.append(prev)
+        value = shift = 0
+    return positions
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+class TranscriptIndex:
+    """Positional inverted index stored in SQLite next to the transcripts.
+
+    Documents are keyed by file name and re-adding one replaces its
+    postings, so the index can be updated as each transcript is written.
+    Positions are delta/varint encoded, typically 1-2 bytes per word.
+
+    :meth:`search` accepts ``term``, ``"a phrase"``, ``AND`` (also
+    implicit), ``OR``, ``NOT``/``-term`` and parentheses, e.g.
+    ``climate "carbon tax" -podcast``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    # ----------------------------------------------------------
+    def add(self, name: str, text: str, url: str | None = None) -> None:
+        """Index ``text`` as document ``name``, replacing any previous version."""
+        tokens = tokenize(text)
+        positions: dict[str, list[int]] = {}
+        for pos, term in enumerate(tokens):
+            positions.setdefault(term, []).append(pos)
+        with self._conn:
+            self._remove(name)
+            doc = self._conn.execute(
+                "INSERT INTO docs (name, url, length) VALUES (?, ?, ?)", (name, url, len(tokens))
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO postings (term, doc, positions) VALUES (?, ?, ?)",
+                ((term, doc, encode_positions(pos)) for term, pos in positions.items()),
+            )
+
+    def remove(self, name: str) -> None:
+        with self._conn:
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        row = self._conn.execute("SELECT id FROM docs WHERE name = ?", (name,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM postings WHERE doc = ?", row)
+            self._conn.execute("DELETE FROM docs WHERE id = ?", row)
+
+    def add_directory(self, directory: str | Path, pattern: str = "*.md") -> int:
+        """Index every matching file in ``directory``; returns how many.
+
+        Only the transcript body is indexed, as the workflow does when it
+        writes the file, so a rebuild ranks the same as the live index.
+        """
+        count = 0
+        for path in sorted(Path(directory).glob(pattern)):
+            url, transcript = parse_transcript(path.read_text())
+            self.add(path.name, transcript, url=url)
+            count += 1
+        return count
+
+    # ----------------------------------------------------------
+    def _all_docs(self) -> set[int]:
+        return {doc for (doc,) in self._conn.execute("SELECT id FROM docs")}
+
+    def _docs_with(self, term: str) -> set[int]:
+        rows = self._conn.execute("SELECT doc FROM postings WHERE term = ?", (term,))
+        return {doc for (doc,) in rows}
+
+    def _phrase(self, terms: list[str]) -> set[int]:
+        if not terms:
+            return set()
+        if len(terms) == 1:
+            return self._docs_with(terms[0])
+        # intersect the rarest terms' documents before decoding positions
+        candidates: Optional[set[int]] = None
+        for term in sorted(set(terms), key=self.document_frequency):
+            docs = self._docs_with(term)
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return set()
+        matches = set()
+        for doc in candidates:
+            starts: Optional[set[int]] = None
+            for offset, term in enumerate(terms):
+                (blob,) = self._conn.execute(
+                    "SELECT positions FROM postings WHERE term = ? AND doc = ?", (term, doc)
+                ).fetchone()
+                shifted = {pos - offset for pos in decode_positions(blob)}
+                starts = shifted if starts is None else starts & shifted
+                if not starts:
+                    break
+            if starts:
+                matches.add(doc)
+        return matches
+
+    def document_frequency(self, term: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()[0]
+
+    # ----------------------------------------------------------
+    def search(self, query: str) -> list[str]:
+        """Names of the documents matching ``query``, sorted."""
+        docs = _QueryParser(self, query).parse()
+        if not docs:
+            return []
+        marks = ",".join("?" * len(docs))
+        rows = self._conn.execute(f"SELECT name FROM docs WHERE id IN ({marks}) ORDER BY name", tuple(docs))
+        return [name for (name,) in rows]
+
+
+class _QueryParser:
+    """Recursive-descent parser evaluating a query to a set of doc ids."""
+
+    def __init__(self, index: TranscriptIndex, query: str) -> None:
+        self.index = index
+        self.tokens: list[str] = []
+        for tok in _QUERY_TOKEN.findall(query):
+            if tok.startswith("-") and len(tok) > 1:
+                self.tokens += ["NOT", tok[1:]]
+            else:
+                self.tokens.append(tok)
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        tok = self._peek()
+        if tok is None:
+            raise QuerySyntaxError("unexpected end of query")
+        self.pos += 1
+        return tok
+
+    def parse(self) -> set[int]:
+        if not self.tokens:
+            return set()
+        result = self._or()
+        if self._peek() is not None:
+            raise QuerySyntaxError(f"unexpected {self._peek()!r}")
+        return result
+
+    def _or(self) -> set[int]:
+        result = self._and()
+        while self._peek() == "OR":
+            self.pos += 1
+            result |= self._and()
+        return result
+
+    def _and(self) -> set[int]:
+        result = self._unary()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self.pos += 1
+            result &= self._unary()
+        return result
+
+    def _unary(self) -> set[int]:
+        if self._peek() == "NOT":
+            self.pos += 1
+            return self.index._all_docs() - self._unary()
+        return self._atom()
+
+    def _atom(self) -> set[int]:
+        tok = self._next()
+        if tok == "(":
+            result = self._or()
+            if self._next() != ")":
+                raise QuerySyntaxError("expected ')'")
+            return result
+        if tok == ")":
+            raise QuerySyntaxError("unexpected ')'")
+        return self.index._phrase(tokenize(tok.strip('"')))
+
+
+def iter_matches(index: TranscriptIndex, directory: str | Path, query: str) -> Iterator[Path]:
+    """Paths under ``directory`` of the transcripts matching ``query``."""
+    for name in index.search(query):
+        yield Path(directory) / name
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py search``."""
+    parser = argparse.ArgumentParser(prog="cli.py search", description="Query the transcript index")
+    parser.add_argument("query", nargs="?", help="e.g. 'climate \"carbon tax\" -sponsor'")
+    parser.add_argument("--index", default="transcripts/index.db")
+    parser.add_argument("--dir", default="transcripts")
+    parser.add_argument("--rebuild", action="store_true", help="(re)index every transcript in --dir first")
+    args = parser.parse_args(argv)
+
+    index = TranscriptIndex(args.index)
+    try:
+        if args.rebuild:
+            print(f"Indexed {index.add_directory(args.dir)} transcripts")
+        if args.query:
+            for path in iter_matches(index, args.dir, args.query):
+                print(path)
+    finally:
+        index.close()
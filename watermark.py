@@ -0,0 +1,71 @@
+"""Per-feed high-water marks for incremental feed processing."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from rss_parser import Episode, as_utc
+
+
+def _published(mark: dict) -> datetime | None:
+    value = mark.get("published")
+    return as_utc(datetime.fromisoformat(value)) if value else None
+
+
+class Watermarks:
+    """Newest processed episode per feed, persisted as JSON.
+
+    A mark holds the key of the last processed episode and the newest
+    pubDate seen so far; episodes without a pubDate move the key but keep
+    that date, so dated episodes are still compared against it.
+    """
+
+    def __init__(self, state_file: str | Path) -> None:
+        self.state_file = Path(state_file)
+        self.marks: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if self.state_file.exists():
+            return json.loads(self.state_file.read_text())
+        return {}
+
+    def save(self) -> None:
+        tmp = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.marks))
+        tmp.replace(self.state_file)
+
+    # ----------------------------------------------------------
+    def is_new(self, feed_url: str, episode: Episode) -> bool:
+        """``False`` once ``episode`` is at or behind the feed's mark."""
+        mark = self.marks.get(feed_url)
+        if mark is None:
+            return True
+        if episode.key == mark["key"]:
+            return False
+        published = _published(mark)
+        if episode.published and published:
+            return as_utc(episode.published) > published
+        return True
+
+    def advance(self, feed_url: str, episode: Episode) -> None:
+        """Move the mark to ``episode`` unless the mark is already newer."""
+        mark = self.marks.get(feed_url) or {}
+        published = _published(mark)
+        if episode.published:
+            if published and as_utc(episode.published) <= published:
+                return
+            published = as_utc(episode.published)
+        self.marks[feed_url] = {
+            "key": episode.key,
+            "published": published.isoformat() if published else None,
+        }
+
+    def new_episodes(self, feed_url: str, episodes: Iterable[Episode]) -> Iterator[Episode]:
+        """Yield episodes of a newest-first feed until the mark is reached."""
+        for episode in episodes:
+            if not self.is_new(feed_url, episode):
+                return
+            yield episode
@@ -2,14 +2,23 @@
 # pragma: no cover
 
 import requests
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from pathlib import Path
 import sys
 
 # Add path for ingest app if running from monorepo
-sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "apps" / "navigator-ingest"))
+_INGEST_APP = Path(__file__).resolve().parents[2] / "apps" / "navigator-ingest"
+if _INGEST_APP.is_dir() and str(_INGEST_APP) not in sys.path:
+    sys.path.insert(0, str(_INGEST_APP))
 
-from rss_parser import RSSParser
+from audio_cache import AudioCache, Prefetcher
+from cassette import Cassette, CassetteProxy, CassetteSession
+from rss_parser import Episode, RSSParser
 from runpod_client import RunPodClient
+from seen import SeenIndex
+from transcript_index import TranscriptIndex, format_transcript
+from watermark import Watermarks
 
 
 class WorkflowManager:
@@ -21,16 +30,28 @@ class WorkflowManager:
         transcripts_dir: str | Path = "transcripts",
         parser: RSSParser | None = None,
         client: RunPodClient | None = None,
+        seen: SeenIndex | None = None,
+        watermarks: Watermarks | None = None,
+        audio_cache: AudioCache | None = None,
+        prefetch: int = 3,
+        index: TranscriptIndex | None = None,
+        session=None,
     ) -> None:
         self.feed_url = feed_url
         self.transcripts_dir = Path(transcripts_dir)
         self.transcripts_dir.mkdir(parents=True, exist_ok=True)
         self.parser = parser or RSSParser()
         self.client = client or RunPodClient()
+        self.seen = seen
+        self.watermarks = watermarks
+        self.audio_cache = audio_cache
+        self.prefetch = prefetch
+        self.index = index
+        self.session = session
 
     # ------------------------------------------------------------------
     def fetch_feed(self) -> str:
-        resp = requests.get(self.feed_url)
+        resp = (self.session or requests).get(self.feed_url)
         resp.raise_for_status()
         return resp.text
 
@@ -40,6 +61,42 @@ class WorkflowManager:
         urls = self.parser.extract_audio_urls(xml)
         return urls[:limit]
 
+    # ------------------------------------------------------------------
+    def _scoped(self, episodes: Iterable[Episode]) -> Iterator[Episode]:
+        """Attribute episodes to this feed so their GUID keys are feed-scoped."""
+        for episode in episodes:
+            if episode.feed is None:
+                episode.feed = self.feed_url
+            yield episode
+
+    # ------------------------------------------------------------------
+    def get_recent_episodes(self, limit: int = 10) -> list[Episode]:
+        xml = self.fetch_feed()
+        if hasattr(self.parser, "extract_episodes"):
+            episodes = self.parser.extract_episodes(xml)
+        else:
+            episodes = [Episode(url) for url in self.parser.extract_audio_urls(xml)]
+        return list(self._scoped(episodes[:limit]))
+
+    # ------------------------------------------------------------------
+    def get_new_episodes(self, limit: int = 10) -> list[Episode]:
+        """Episodes newer than the feed's watermark, oldest first.
+
+        Parsing stops at the first already-processed item.  Only the
+        ``limit`` oldest new episodes are returned so the watermark can
+        advance without skipping the rest on the next run.  A feed without
+        a watermark starts from its ``limit`` newest episodes instead of
+        the oldest ones of the archive.
+        """
+        xml = self.fetch_feed()
+        episodes = self._scoped(self.parser.iter_episodes(xml))
+        new = self.watermarks.new_episodes(self.feed_url, episodes)
+        if self.feed_url not in self.watermarks.marks:
+            new = islice(new, limit)
+        pending = list(new)
+        pending.reverse()
+        return pending[:limit]
+
     # ------------------------------------------------------------------
     def _path_for_url(self, url: str) -> Path:
         name = url.split("/")[-1]
@@ -49,16 +106,91 @@ class WorkflowManager:
 
     # ------------------------------------------------------------------
     def run(self) -> None:
-        for url in self.get_recent_audio_urls():
-            path = self._path_for_url(url)
-            if path.exists():
-                continue
-            if hasattr(self.client, "transcribe"):
-                transcript = self.client.transcribe(url)
-            else:
-                transcript = self.client.run(
-                    file_path=url,
-                    model="", task="transcribe", temperature=0.0, stream=False
-                )
-            content = f"# Transcript\n\nURL: {url}\n\n{transcript}\n"
-            path.write_text(content)
+        if self.watermarks is not None:
+            episodes = self.get_new_episodes()
+        else:
+            episodes = self.get_recent_episodes()
+        try:
+            self._process(episodes)
+        finally:
+            if self.watermarks is not None:
+                self.watermarks.save()
+            if self.seen is not None:
+                self.seen.flush()
+
+    # ------------------------------------------------------------------
+    def _is_done(self, episode: Episode) -> bool:
+        if self.seen is not None and episode.key in self.seen:
+            return True
+        return self._path_for_url(episode.url).exists()
+
+    # ------------------------------------------------------------------
+    def _process(self, episodes: list[Episode]) -> None:
+        todo = [ep for ep in episodes if not self._is_done(ep)]
+        pending = {id(ep) for ep in todo}
+        prefetcher = None
+        if self.audio_cache is not None:
+            # download upcoming audio while the current episode transcribes
+            prefetcher = Prefetcher(self.audio_cache, self.prefetch)
+            local = prefetcher.iterate(ep.url for ep in todo)
+        else:
+            local = ((ep.url, None) for ep in todo)
+        try:
+            for episode in episodes:
+                if id(episode) in pending:
+                    _, audio = next(local)
+                    self._transcribe(episode, str(audio) if audio else episode.url)
+                if self.watermarks is not None:
+                    self.watermarks.advance(self.feed_url, episode)
+        finally:
+            if prefetcher is not None:
+                local.close()
+                prefetcher.close()
+
+    # ------------------------------------------------------------------
+    def _transcribe(self, episode: Episode, source: str) -> None:
+        url = episode.url
+        if hasattr(self.client, "transcribe"):
+            transcript = self.client.transcribe(source)
+        else:
+            transcript = self.client.run(
+                file_path=source,
+                model="", task="transcribe", temperature=0.0, stream=False
+            )
+        content = format_transcript(url, transcript)
+        path = self._path_for_url(url)
+        path.write_text(content)
+        if self.index is not None:
+            self.index.add(path.name, transcript, url=url)
+        if self.seen is not None:
+            self.seen.add(episode.key)
+
+
+def from_config(feed_url: str, cfg: dict, tape: Cassette | None = None) -> WorkflowManager:
+    """Workflow for ``feed_url`` as described by ``cfg``.
+
+    Optional keys: ``watermarks_file`` (process only episodes newer than
+    the feed's watermark), ``seen_db`` (persistent seen-episode index),
+    ``audio_cache_dir``/``audio_cache_bytes``/``prefetch`` (download audio
+    ahead into a local cache) and ``transcript_index`` (keep a searchable
+    index of the written transcripts).  With ``tape`` the feed fetch and
+    the RunPod calls are recorded to (or replayed from) that cassette; the
+    caller saves it.
+    """
+    client = RunPodClient()
+    session = None
+    if tape is not None:
+        client = CassetteProxy(client, tape, "RunPodClient")
+        session = CassetteSession(tape)
+    cache_dir = cfg.get("audio_cache_dir")
+    return WorkflowManager(
+        feed_url,
+        cfg.get("transcripts_dir", "transcripts"),
+        client=client,
+        seen=SeenIndex(cfg["seen_db"]) if cfg.get("seen_db") else None,
+        watermarks=Watermarks(cfg["watermarks_file"]) if cfg.get("watermarks_file") else None,
+        audio_cache=AudioCache(cache_dir, int(cfg.get("audio_cache_bytes", 2 << 30))) if cache_dir else None,
+        prefetch=int(cfg.get("prefetch", 3)),
+        index=TranscriptIndex(cfg["transcript_index"]) if cfg.get("transcript_index") else None,
+        session=session,
+    )
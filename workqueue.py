@@ -0,0 +1,187 @@
+"""Durable lease-based work queue so several workers can split episodes."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    feed TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'ready',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_token TEXT,
+    visible_at REAL NOT NULL DEFAULT 0,
+    updated REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (state, visible_at);
+"""
+
+
+@dataclass
+class Lease:
+    """A claimed job; valid until ``expires`` unless renewed."""
+
+    id: int
+    feed: str
+    url: str
+    token: str
+    attempts: int
+    expires: float
+
+
+class WorkQueue:
+    """SQLite-backed queue with visibility timeouts and at-least-once delivery.
+
+    ``claim`` hides a job for ``visibility`` seconds; a worker that stops
+    heart-beating loses the lease and the job becomes claimable again.  Jobs
+    claimed ``max_attempts`` times without an ack are moved to ``dead``.
+
+    The database may live on a shared filesystem; it uses the default
+    rollback journal (WAL needs shared memory) and ``BEGIN IMMEDIATE`` so
+    only one worker claims a given job.
+    """
+
+    def __init__(self, path: str | Path, visibility: float = 300.0, max_attempts: int = 5) -> None:
+        self.path = str(path)
+        self.visibility = visibility
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ----------------------------------------------------------
+    def put(self, feed: str, urls: Iterable[str]) -> int:
+        """Enqueue ``urls`` in one transaction; already-known URLs are ignored.
+
+        Returns the number of new jobs.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (feed, url, updated) VALUES (?, ?, ?)",
+                    ((feed, url, now) for url in urls),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return cur.rowcount
+
+    def claim(self, owner: str) -> Optional[Lease]:
+        """Lease the oldest visible job, or return ``None`` if there is none."""
+        with self._lock:
+            return self._claim(owner)
+
+    def _claim(self, owner: str) -> Optional[Lease]:
+        now = time.time()
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                row = conn.execute(
+                    "SELECT id, feed, url, attempts FROM jobs "
+                    "WHERE state IN ('ready', 'leased') AND visible_at <= ? ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                job_id, feed, url, attempts = row
+                if attempts >= self.max_attempts:
+                    conn.execute("UPDATE jobs SET state = 'dead', updated = ? WHERE id = ?", (now, job_id))
+                    continue
+                token = uuid.uuid4().hex
+                expires = now + self.visibility
+                conn.execute(
+                    "UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_token = ?, visible_at = ?, updated = ? WHERE id = ?",
+                    (owner, token, expires, now, job_id),
+                )
+                conn.execute("COMMIT")
+                return Lease(job_id, feed, url, token, attempts + 1, expires)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _update_lease(self, lease: Lease, sql: str, *params: object) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"UPDATE jobs SET {sql}, updated = ? WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (*params, time.time(), lease.id, lease.token),
+            )
+        return cur.rowcount == 1
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """Extend the lease; ``False`` means it was lost to another worker."""
+        expires = time.time() + self.visibility
+        if self._update_lease(lease, "visible_at = ?", expires):
+            lease.expires = expires
+            return True
+        return False
+
+    def ack(self, lease: Lease) -> bool:
+        return self._update_lease(lease, "state = 'done', lease_token = NULL")
+
+    def nack(self, lease: Lease, delay: float = 0.0) -> bool:
+        """Give the job back, visible again after ``delay`` seconds."""
+        return self._update_lease(
+            lease, "state = 'ready', lease_token = NULL, visible_at = ?", time.time() + delay
+        )
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict(rows)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def main(argv=None) -> None:
+    """Entry point for ``cli.py queue``."""
+    from orchestrator import EventBus
+    from run_workflow import _load, build_orchestrator
+
+    parser = argparse.ArgumentParser(prog="cli.py queue", description="Shared episode work queue")
+    parser.add_argument("command", choices=["enqueue", "work", "stats"])
+    parser.add_argument("--db", default="queue.db")
+    parser.add_argument("--config", default="demo.yml")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--visibility", type=float, default=300.0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    queue = WorkQueue(args.db, visibility=args.visibility)
+    if args.command == "stats":
+        print(queue.counts())
+        return
+    cfg = _load(Path(args.config))
+    bus = EventBus()
+    bus.on("analyzed", lambda url, summary: print(f"Analyzed {url}"))
+    orch = build_orchestrator(cfg, bus=bus)
+    if args.command == "enqueue":
+        added = asyncio.run(orch.enqueue(cfg.get("feed_url", "https://example.com/feed"), queue, cfg.get("limit", 10)))
+        print(f"Enqueued {added} episodes")
+    else:
+        done = asyncio.run(orch.work(queue, args.worker_id or default_worker_id(), args.concurrency))
+        print(f"Completed {done} episodes")